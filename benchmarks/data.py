@@ -0,0 +1,208 @@
+"""Generate reproducible synthetic stores for benchmarks
+
+The same sizes and seed always produce the same rows, so timings taken on
+different commits compare like with like. Rows go in through Core
+``insert()`` executemany batches, and the FTS triggers and daily rollup are
+kept in step exactly as they are for real data.
+"""
+import random
+from bisect import bisect_right
+from datetime import datetime, timedelta
+from sqlalchemy import insert
+from lib.models.base import get_session
+from lib.models.customer import Customer
+from lib.models.item import Item
+from lib.models.money import Money
+from lib.models.sale import Sale
+from lib.models.sale_item import SaleItem
+from lib.services.rollup_service import RollupService
+from lib.services.customer_stats_service import CustomerStatsService
+
+CATEGORIES = {
+    'Tops': (4, 25), 'Dresses': (8, 45), 'Jeans': (6, 35), 'Coats': (15, 90),
+    'Shoes': (8, 60), 'Bags': (6, 70), 'Accessories': (2, 20), 'Books': (1, 10),
+    'Homeware': (2, 40), 'Toys': (1, 15),
+}
+NOUNS = {
+    'Tops': ('T-Shirt', 'Blouse', 'Sweater', 'Hoodie', 'Cardigan'),
+    'Dresses': ('Maxi Dress', 'Sundress', 'Wrap Dress', 'Shirt Dress'),
+    'Jeans': ('Skinny Jeans', 'Bootcut Jeans', 'Mom Jeans', 'Denim Shorts'),
+    'Coats': ('Trench Coat', 'Puffer Jacket', 'Denim Jacket', 'Wool Coat', 'Blazer'),
+    'Shoes': ('Sneakers', 'Boots', 'Loafers', 'Sandals', 'Heels'),
+    'Bags': ('Tote Bag', 'Backpack', 'Clutch', 'Crossbody Bag'),
+    'Accessories': ('Scarf', 'Belt', 'Sunglasses', 'Hat', 'Watch'),
+    'Books': ('Paperback Novel', 'Cookbook', 'Hardback', 'Comic'),
+    'Homeware': ('Vase', 'Lamp', 'Mug Set', 'Picture Frame', 'Cushion'),
+    'Toys': ('Board Game', 'Puzzle', 'Teddy Bear', 'Lego Set'),
+}
+ADJECTIVES = ('Vintage', 'Classic', 'Retro', 'Floral', 'Striped', 'Leather', 'Knitted',
+              'Oversized', 'Linen', 'Silk', 'Cotton', 'Wool', 'Faux Fur', 'Suede')
+BRANDS = ('Zara', 'H&M', "Levi's", 'Nike', 'Adidas', 'Gap', 'Uniqlo', 'Mango',
+          'Topshop', 'Next', 'Marks & Spencer', 'Primark', None, None)
+COLORS = ('Black', 'White', 'Blue', 'Red', 'Green', 'Grey', 'Beige', 'Pink', 'Brown', None)
+SIZES = ('XS', 'S', 'M', 'L', 'XL', None)
+CONDITIONS = ('New', 'Excellent', 'Good', 'Good', 'Good', 'Fair', 'Poor')
+FIRST_NAMES = ('Amina', 'Brian', 'Chloe', 'David', 'Esther', 'Faith', 'George', 'Hannah',
+               'Ian', 'Joy', 'Kevin', 'Lucy', 'Mark', 'Nadia', 'Otieno', 'Grace', 'Peter', 'Wanjiru')
+LAST_NAMES = ('Kamau', 'Smith', 'Otieno', 'Njoroge', 'Brown', 'Wanjiku', 'Mwangi', 'Jones',
+              'Achieng', 'Taylor', 'Kiptoo', 'Wilson', 'Mutua', 'Evans')
+CITIES = ('Nairobi', 'Mombasa', 'Kisumu', 'Nakuru', 'Eldoret', None)
+PAYMENT_METHODS = ('Cash', 'Cash', 'Card', 'Card', 'Card', 'Mobile Money')
+# Lines per sale: most baskets hold one or two items
+LINE_COUNTS = (1, 2, 3, 4, 5, 6)
+LINE_WEIGHTS = (45, 25, 14, 8, 5, 3)
+# Relative trade by weekday (Monday first) and by opening hour
+WEEKDAY_WEIGHTS = (0.8, 0.8, 0.9, 1.0, 1.3, 1.8, 1.4)
+HOUR_WEIGHTS = {9: 0.6, 10: 0.9, 11: 1.1, 12: 1.4, 13: 1.5, 14: 1.2, 15: 1.1, 16: 1.2, 17: 1.3, 18: 0.8}
+WALK_IN_SHARE = 0.35
+PENDING_SHARE = 0.02
+BATCH_SIZE = 5000
+
+
+def _batched(session, model, rows):
+    """Insert rows with executemany, BATCH_SIZE at a time"""
+    statement = insert(model)
+    for start in range(0, len(rows), BATCH_SIZE):
+        session.execute(statement, rows[start:start + BATCH_SIZE])
+
+
+def make_items(rng, count, start, days):
+    """Build item rows added over the ``days`` before ``start``"""
+    rows = []
+    for _ in range(count):
+        category = rng.choice(list(CATEGORIES))
+        low, high = CATEGORIES[category]
+        price = Money.of(round(rng.uniform(low, high) * 2) / 2)
+        rows.append({
+            'name': f"{rng.choice(ADJECTIVES)} {rng.choice(NOUNS[category])}",
+            'description': None,
+            'category': category,
+            'price': price,
+            'cost': price * rng.uniform(0.15, 0.6),
+            # Thrift stock is mostly one-offs
+            'quantity': 1 if rng.random() < 0.85 else rng.randint(2, 6),
+            'condition': rng.choice(CONDITIONS),
+            'size': rng.choice(SIZES) if category in ('Tops', 'Dresses', 'Jeans', 'Coats', 'Shoes') else None,
+            'brand': rng.choice(BRANDS),
+            'color': rng.choice(COLORS),
+            'is_sold': False,
+            'date_added': start - timedelta(days=days * rng.random() ** 0.7),
+            'date_sold': None
+        })
+    return rows
+
+
+def make_customers(rng, count, start, days):
+    """Build customer rows with unique emails"""
+    rows = []
+    for number in range(1, count + 1):
+        first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+        rows.append({
+            'first_name': first,
+            'last_name': last,
+            'email': f"{first}.{last}.{number}@example.com".lower(),
+            'phone': f"07{rng.randint(0, 99999999):08d}" if rng.random() < 0.8 else None,
+            'address': None,
+            'city': rng.choice(CITIES),
+            'postal_code': None,
+            'date_joined': start - timedelta(days=days * rng.random()),
+            'notes': None
+        })
+    return rows
+
+
+def _sale_times(rng, count, start, days):
+    """Sale timestamps over the ``days`` ending on ``start``, busier at weekends and lunchtime"""
+    first_day = start.date() - timedelta(days=days - 1)
+    dates = [first_day + timedelta(days=offset) for offset in range(days)]
+    day_weights = [WEEKDAY_WEIGHTS[day.weekday()] for day in dates]
+    hours, hour_weights = list(HOUR_WEIGHTS), list(HOUR_WEIGHTS.values())
+
+    times = []
+    for day in rng.choices(dates, weights=day_weights, k=count):
+        hour = rng.choices(hours, weights=hour_weights)[0]
+        times.append(datetime(day.year, day.month, day.day, hour, rng.randrange(60), rng.randrange(60)))
+    times.sort()
+    return times
+
+
+def generate_store(items=1000, customers=100, sales=500, seed=0, days=365, now=None):
+    """Fill the configured (empty) database with a synthetic store
+
+    Sales pick from items in stock at the time of sale, so stock, sold
+    flags and sale lines stay consistent; a basket that finds nothing on
+    the shelf is dropped. Returns the row counts actually written.
+    """
+    rng = random.Random(seed)
+    # Anchoring on midnight keeps every run on the same day identical while
+    # "today" and "this month" reports still find sales
+    now = now or datetime.combine(datetime.now().date(), datetime.min.time())
+
+    # IDs follow date_added, so the items on the shelf at any moment are a prefix
+    item_rows = sorted(make_items(rng, items, now, days), key=lambda row: row['date_added'])
+    added = [row['date_added'] for row in item_rows]
+    customer_rows = make_customers(rng, customers, now, days)
+    stock = [row['quantity'] for row in item_rows]
+
+    sale_rows = []
+    line_rows = []
+    for sale_id, sale_date in enumerate(_sale_times(rng, sales, now, days), 1):
+        lines = {}
+        on_shelf = bisect_right(added, sale_date)
+        for _ in range(rng.choices(LINE_COUNTS, weights=LINE_WEIGHTS)[0] if on_shelf else 0):
+            # Recently stocked items are the likeliest to sell
+            index = int(on_shelf * rng.random() ** 0.5)
+            if stock[index] > 0 and index not in lines:
+                lines[index] = 1
+                stock[index] -= 1
+                if stock[index] == 0:
+                    item_rows[index]['is_sold'] = True
+                    item_rows[index]['date_sold'] = sale_date
+        if not lines:
+            continue
+
+        total = Money(0)
+        for index, quantity in lines.items():
+            price = item_rows[index]['price']
+            total += price * quantity
+            line_rows.append({'sale_id': sale_id, 'item_id': index + 1, 'quantity': quantity,
+                              'unit_price': price, 'total_price': price * quantity,
+                              'unit_cost': item_rows[index]['cost']})
+
+        sale_rows.append({
+            'id': sale_id,
+            'customer_id': rng.randint(1, customers) if customers and rng.random() >= WALK_IN_SHARE else None,
+            'sale_date': sale_date,
+            'total_amount': total,
+            'tax_amount': total * 0.16 if rng.random() < 0.5 else Money(0),
+            'discount_amount': total * 0.1 if rng.random() < 0.1 else Money(0),
+            'payment_method': rng.choice(PAYMENT_METHODS),
+            'status': 'Pending' if rng.random() < PENDING_SHARE else 'Completed',
+            'notes': None
+        })
+
+    for index, remaining in enumerate(stock):
+        item_rows[index]['quantity'] = remaining
+
+    session = get_session()
+    try:
+        _batched(session, Item, item_rows)
+        _batched(session, Customer, customer_rows)
+        _batched(session, Sale, sale_rows)
+        _batched(session, SaleItem, line_rows)
+        session.commit()
+    except Exception as e:
+        session.rollback()
+        raise e
+    finally:
+        session.close()
+
+    rollup_days = RollupService.rebuild()
+    CustomerStatsService.rebuild()
+    return {
+        'items': len(item_rows),
+        'customers': len(customer_rows),
+        'sales': len(sale_rows),
+        'sale_lines': len(line_rows),
+        'rollup_days': rollup_days
+    }
@@ -0,0 +1,195 @@
+"""Time the service hot paths against synthetic stores of several sizes
+
+Run from the project root:
+
+    python -m benchmarks.services [--scales small,medium] [--repeat 5]
+                                  [--output report.json] [--compare baseline.json]
+
+Each scale is generated into its own scratch SQLite file (see
+``benchmarks.data``), migrated to the current schema first. Every timing
+clears the service cache, so reads measure the database work rather than a
+cache hit. ``--output`` saves the JSON report; ``--compare`` prints each
+case's median against a report saved on another commit.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+import sqlalchemy
+from lib.models import base
+from lib.models.schema import ensure_schema
+from lib.services.cache import cache
+from lib.services.item_service import ItemService
+from lib.services.customer_service import CustomerService
+from lib.services.sales_service import SalesService
+from lib.services.export_service import ExportService
+from benchmarks.data import generate_store
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCALES = {
+    'small': {'items': 1000, 'customers': 100, 'sales': 500},
+    'medium': {'items': 10000, 'customers': 1000, 'sales': 5000},
+    'large': {'items': 100000, 'customers': 5000, 'sales': 50000},
+}
+SEARCH_TERMS = ('vintage', 'jacket', 'zara', 'sne')
+# Cases slower than this ratio against the baseline are flagged
+REGRESSION_RATIO = 1.2
+
+
+def cases(directory):
+    """Name and callable for every timed operation
+
+    Checkout writes, so each call sells two different in-stock items,
+    picked up front so the lookup is not timed; the read cases leave the
+    data untouched between repeats.
+    """
+    in_stock = [row.id for row in ItemService.get_available_items() if row.quantity]
+
+    def search():
+        for term in SEARCH_TERMS:
+            ItemService.search_items(term, limit=50)
+
+    def checkout():
+        basket = [{'item_id': in_stock.pop(), 'quantity': 1} for _ in range(2)]
+        SalesService.checkout(basket, payment_method='Card')
+
+    export_path = os.path.join(directory, 'export.csv')
+    return [
+        ('search_items', search),
+        ('get_available_items', ItemService.get_available_items),
+        ('get_sales_summary', SalesService.get_sales_summary),
+        ('get_top_selling_items', SalesService.get_top_selling_items),
+        ('get_category_performance', SalesService.get_category_performance),
+        ('customer_lifetime_values', CustomerService.get_lifetime_value_table),
+        ('customer_segments', CustomerService.get_customer_segments),
+        ('checkout', checkout),
+        ('export_sales', lambda: ExportService.export_sales(export_path)),
+        ('export_inventory', lambda: ExportService.export_inventory(export_path)),
+    ]
+
+
+def time_call(func, repeat):
+    """Run ``func`` ``repeat`` times on a cold cache and summarise the wall times"""
+    timings = []
+    for _ in range(repeat):
+        cache.clear()
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    return {
+        'median': statistics.median(timings),
+        'min': min(timings),
+        'max': max(timings),
+        'runs': repeat
+    }
+
+
+def run_scale(sizes, repeat=5, seed=0):
+    """Generate one store in a scratch database and time every case against it"""
+    with tempfile.TemporaryDirectory() as directory:
+        base.configure_engine(f"sqlite:///{os.path.join(directory, 'bench.db')}")
+        cache.clear()
+        try:
+            ensure_schema()
+            started = time.perf_counter()
+            counts = generate_store(seed=seed, **sizes)
+            generate_seconds = time.perf_counter() - started
+
+            results = {}
+            for name, func in cases(directory):
+                # One untimed call warms the connection pool and statement cache
+                func()
+                results[name] = time_call(func, repeat)
+        finally:
+            base.engine.dispose()
+    return {'rows': counts, 'generate_seconds': generate_seconds, 'cases': results}
+
+
+def _git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=PROJECT_ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(scales, repeat=5, seed=0):
+    """Benchmark every named scale and build the JSON-ready report"""
+    return {
+        'commit': _git_commit(),
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'sqlalchemy': sqlalchemy.__version__,
+        'seed': seed,
+        'repeat': repeat,
+        'scales': {name: run_scale(SCALES[name], repeat, seed) for name in scales}
+    }
+
+
+def compare(report, baseline):
+    """Yield (scale, case, baseline median, current median, ratio) for shared cases"""
+    for scale, result in report['scales'].items():
+        previous = baseline.get('scales', {}).get(scale)
+        if not previous:
+            continue
+        for case, timing in result['cases'].items():
+            before = previous['cases'].get(case)
+            if before:
+                yield scale, case, before['median'], timing['median'], timing['median'] / before['median']
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark service hot paths on synthetic stores")
+    parser.add_argument('--scales', default='small,medium',
+                        help=f"comma separated scales from {', '.join(SCALES)}")
+    parser.add_argument('--repeat', type=int, default=5, help="timed runs per case")
+    parser.add_argument('--seed', type=int, default=0, help="random seed for the generated data")
+    parser.add_argument('--output', help="write the JSON report to this file")
+    parser.add_argument('--compare', help="JSON report from another commit to compare against")
+    parser.add_argument('--json', action='store_true', help="print the report as JSON")
+    args = parser.parse_args(argv)
+
+    scales = [name.strip() for name in args.scales.split(',') if name.strip()]
+    unknown = [name for name in scales if name not in SCALES]
+    if unknown:
+        parser.error(f"unknown scale(s): {', '.join(unknown)}")
+
+    report = run(scales, args.repeat, args.seed)
+    if args.output:
+        with open(args.output, 'w') as output:
+            json.dump(report, output, indent=2)
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+
+    for scale, result in report['scales'].items():
+        rows = result['rows']
+        print(f"\n{scale}: {rows['items']} items, {rows['customers']} customers, "
+              f"{rows['sales']} sales ({result['generate_seconds']:.1f}s to generate)")
+        print(f"{'Case':<28} {'Median':>10} {'Min':>10} {'Max':>10}")
+        for case, timing in result['cases'].items():
+            print(f"{case:<28} {timing['median'] * 1000:>8.2f}ms {timing['min'] * 1000:>8.2f}ms "
+                  f"{timing['max'] * 1000:>8.2f}ms")
+
+    if args.compare:
+        with open(args.compare) as source:
+            baseline = json.load(source)
+        regressions = 0
+        print(f"\nAgainst {baseline.get('commit') or args.compare}:")
+        print(f"{'Scale':<8} {'Case':<28} {'Before':>10} {'After':>10} {'Ratio':>7}")
+        for scale, case, before, after, ratio in compare(report, baseline):
+            flag = '  slower' if ratio > REGRESSION_RATIO else ''
+            regressions += bool(flag)
+            print(f"{scale:<8} {case:<28} {before * 1000:>8.2f}ms {after * 1000:>8.2f}ms {ratio:>6.2f}x{flag}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""Measure how long the CLI takes to start, using ``python -X importtime``
+
+Run from the project root:
+
+    python -m benchmarks.startup [--runs 5] [--top 15] [--json]
+
+Each run starts a fresh interpreter that imports the main menu and builds
+it (including the schema version check) without entering the input loop.
+Runs use a scratch database, migrated once by an untimed warm-up start, so
+the project's own database is never touched.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+STARTUP_CODE = "from lib.cli.main_menu import MainMenu; MainMenu()"
+
+
+def parse_importtime(stderr):
+    """Turn ``-X importtime`` output into (module, depth, self_us, cumulative_us) rows"""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|', 2)
+        # Nested imports are indented two spaces per level after the bar
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        rows.append((name.strip(), depth, int(self_us), int(cumulative_us)))
+    return rows
+
+
+def run_once(database_url, code=STARTUP_CODE):
+    """Start one interpreter and return its wall time and import timings"""
+    env = dict(os.environ, THRIFTSTORE_DATABASE_URL=database_url)
+    started = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        cwd=PROJECT_ROOT, env=env, capture_output=True, text=True
+    )
+    elapsed = time.perf_counter() - started
+    if result.returncode != 0:
+        raise RuntimeError(f"Startup failed:\n{result.stderr[-2000:]}")
+    return elapsed, parse_importtime(result.stderr)
+
+
+def measure(runs=5, top=15, code=STARTUP_CODE):
+    """Time several cold starts and report the slowest top-level imports"""
+    walls = []
+    imports = None
+    with tempfile.TemporaryDirectory() as directory:
+        database_url = f"sqlite:///{os.path.join(directory, 'startup.db')}"
+        # Warm-up creates and migrates the scratch database
+        run_once(database_url, code)
+        for _ in range(runs):
+            elapsed, rows = run_once(database_url, code)
+            walls.append(elapsed)
+            imports = rows
+
+    top_level = [row for row in imports if row[1] == 0]
+    # The first couple of levels name the packages that make startup heavy
+    slowest = sorted((row for row in imports if row[1] <= 2),
+                     key=lambda row: row[3], reverse=True)[:top]
+    return {
+        'runs': runs,
+        'wall_seconds': {
+            'median': statistics.median(walls),
+            'min': min(walls),
+            'max': max(walls)
+        },
+        'import_seconds': sum(row[3] for row in top_level) / 1e6,
+        'modules_imported': len(imports),
+        'slowest_imports': [
+            {'module': name, 'cumulative_ms': cumulative / 1000, 'self_ms': own / 1000}
+            for name, _, own, cumulative in slowest
+        ]
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark CLI startup time")
+    parser.add_argument('--runs', type=int, default=5, help="cold starts to time")
+    parser.add_argument('--top', type=int, default=15, help="slowest imports (up to two levels deep) to list")
+    parser.add_argument('--json', action='store_true', help="print the report as JSON")
+    args = parser.parse_args(argv)
+
+    report = measure(args.runs, args.top)
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+
+    wall = report['wall_seconds']
+    print(f"Startup over {report['runs']} runs: median {wall['median'] * 1000:.0f} ms "
+          f"(min {wall['min'] * 1000:.0f}, max {wall['max'] * 1000:.0f})")
+    print(f"Imports: {report['modules_imported']} modules, {report['import_seconds'] * 1000:.0f} ms")
+    print()
+    print(f"{'Module':<45} {'Cumulative':>12} {'Self':>10}")
+    for row in report['slowest_imports']:
+        print(f"{row['module']:<45} {row['cumulative_ms']:>10.1f}ms {row['self_ms']:>8.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,391 @@
+import argparse
+import json
+import re
+from datetime import date, datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs
+from lib.config import get_api_config
+from lib.models.base import unit_of_work
+from lib.models.money import json_default
+from lib.models.schema import ensure_schema
+from lib.services.item_service import ItemService
+from lib.services.customer_service import CustomerService
+from lib.services.sales_service import SalesService
+from lib.services.analytics_service import AnalyticsService
+from lib.services.pagination import DEFAULT_PAGE_SIZE
+from lib.services.tracing import tracer
+
+MAX_PAGE_SIZE = 500
+ITEM_FIELDS = ('name', 'description', 'category', 'price', 'cost', 'quantity',
+               'condition', 'size', 'brand', 'color')
+
+
+class ApiError(Exception):
+    """An error reported to the client with an HTTP status"""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def _int_param(query, name, default=None):
+    value = query.get(name)
+    if value in (None, ''):
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        raise ApiError(400, f"'{name}' must be an integer")
+
+
+def _date_param(query, name):
+    """An ISO date or datetime; a bare date stays a date so an 'end' covers the whole day"""
+    value = query.get(name)
+    if value in (None, ''):
+        return None
+    try:
+        return date.fromisoformat(value) if len(value) == 10 else datetime.fromisoformat(value)
+    except ValueError:
+        raise ApiError(400, f"'{name}' must be an ISO date")
+
+
+def _page_size(query):
+    return min(max(_int_param(query, 'page_size', DEFAULT_PAGE_SIZE), 1), MAX_PAGE_SIZE)
+
+
+def _page(page):
+    return {
+        'items': [row.to_dict() for row in page],
+        'has_next': page.has_next,
+        'has_previous': page.has_previous,
+        'next_after_id': page.last_key if page.has_next else None,
+        'previous_before_id': page.first_key if page.has_previous else None
+    }
+
+
+def _found(obj, kind, obj_id):
+    if obj is None:
+        raise ApiError(404, f"{kind} {obj_id} not found")
+    return obj
+
+
+def _sale(sale):
+    data = sale.to_dict()
+    data['lines'] = [line.to_dict() for line in sale.sale_items]
+    return data
+
+
+# Items
+
+def list_items(query, body):
+    return _page(ItemService.get_items_page(after_id=_int_param(query, 'after_id'),
+                                            before_id=_int_param(query, 'before_id'),
+                                            page_size=_page_size(query)))
+
+
+def search_items(query, body):
+    term = query.get('q', '').strip()
+    if not term:
+        raise ApiError(400, "'q' is required")
+    return [item.to_dict() for item in ItemService.search_items(term, limit=_page_size(query))]
+
+
+def get_item(query, body, item_id):
+    return _found(ItemService.get_item_by_id(int(item_id)), 'Item', item_id).to_dict()
+
+
+def create_item(query, body):
+    unknown = sorted(set(body) - set(ITEM_FIELDS))
+    if unknown:
+        raise ApiError(400, f"Unknown item fields: {', '.join(unknown)}")
+    missing = [field for field in ('name', 'category', 'price') if body.get(field) in (None, '')]
+    if missing:
+        raise ApiError(400, f"Missing required fields: {', '.join(missing)}")
+    fields = dict(body)
+    item = ItemService.create_item(fields.pop('name'), fields.pop('description', None),
+                                   fields.pop('category'), fields.pop('price'), **fields)
+    return 201, item.to_dict()
+
+
+def update_item(query, body, item_id):
+    unknown = sorted(set(body) - set(ITEM_FIELDS))
+    if unknown:
+        raise ApiError(400, f"Cannot update: {', '.join(unknown)}")
+    return _found(ItemService.update_item(int(item_id), **body), 'Item', item_id).to_dict()
+
+
+def list_categories(query, body):
+    return ItemService.get_categories()
+
+
+# Customers
+
+def list_customers(query, body):
+    return _page(CustomerService.get_customers_page(after_id=_int_param(query, 'after_id'),
+                                                    before_id=_int_param(query, 'before_id'),
+                                                    page_size=_page_size(query)))
+
+
+def search_customers(query, body):
+    term = query.get('q', '').strip()
+    if not term:
+        raise ApiError(400, "'q' is required")
+    return [customer.to_dict() for customer in CustomerService.search_customers(term, limit=_page_size(query))]
+
+
+def get_customer(query, body, customer_id):
+    return _found(CustomerService.get_customer_by_id(int(customer_id)), 'Customer', customer_id).to_dict()
+
+
+def create_customer(query, body):
+    try:
+        customer = CustomerService.create_customer(**body)
+    except TypeError as e:
+        raise ApiError(400, str(e))
+    return 201, customer.to_dict()
+
+
+# Sales
+
+def list_sales(query, body):
+    return _page(SalesService.get_sales_page(after_id=_int_param(query, 'after_id'),
+                                             before_id=_int_param(query, 'before_id'),
+                                             page_size=_page_size(query)))
+
+
+def get_sale(query, body, sale_id):
+    return _sale(_found(SalesService.get_sale_with_details(int(sale_id)), 'Sale', sale_id))
+
+
+def _is_int(value):
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def _is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _basket_line(index, line):
+    """Check one basket line so bad input is a 400 rather than a crash in the service"""
+    where = f"basket[{index}]"
+    if not isinstance(line, dict):
+        raise ApiError(400, f"{where} must be an object with item_id, quantity and custom_price")
+    if not _is_int(line.get('item_id')):
+        raise ApiError(400, f"{where}.item_id must be an integer")
+    quantity = line.get('quantity', 1)
+    if not _is_int(quantity) or quantity < 1:
+        raise ApiError(400, f"{where}.quantity must be an integer of at least 1")
+    custom_price = line.get('custom_price')
+    if custom_price is not None and not _is_number(custom_price):
+        raise ApiError(400, f"{where}.custom_price must be a number")
+    return {'item_id': line['item_id'], 'quantity': quantity, 'custom_price': custom_price}
+
+
+def _amount(body, name):
+    value = body.get(name, 0.0)
+    if value is None:
+        return 0.0
+    if not _is_number(value):
+        raise ApiError(400, f"'{name}' must be a number")
+    return value
+
+
+def checkout(query, body):
+    basket = body.get('basket')
+    if not isinstance(basket, list):
+        raise ApiError(400, "'basket' must be a list of {item_id, quantity, custom_price}")
+    customer_id = body.get('customer_id')
+    if customer_id is not None and not _is_int(customer_id):
+        raise ApiError(400, "'customer_id' must be an integer")
+    sale = SalesService.checkout(
+        [_basket_line(index, line) for index, line in enumerate(basket)],
+        customer_id=customer_id,
+        payment_method=body.get('payment_method', 'Cash'),
+        tax_amount=_amount(body, 'tax_amount'),
+        discount_amount=_amount(body, 'discount_amount'),
+        notes=body.get('notes')
+    )
+    return 201, _sale(SalesService.get_sale_with_details(sale.id))
+
+
+def cancel_sale(query, body, sale_id):
+    if not SalesService.cancel_sale(int(sale_id)):
+        raise ApiError(404, f"Sale {sale_id} not found")
+    return {'cancelled': int(sale_id)}
+
+
+# Reports
+
+def sales_summary(query, body):
+    return SalesService.get_sales_summary()
+
+
+def top_items(query, body):
+    return SalesService.get_top_selling_items(limit=_int_param(query, 'limit', 10),
+                                              start_date=_date_param(query, 'start'),
+                                              end_date=_date_param(query, 'end'))
+
+
+def category_performance(query, body):
+    return SalesService.get_category_performance(start_date=_date_param(query, 'start'),
+                                                 end_date=_date_param(query, 'end'))
+
+
+def inventory_report(query, body):
+    return AnalyticsService.inventory_report()
+
+
+def customer_lifetime_values(query, body):
+    limit = _int_param(query, 'limit', 50)
+    return list(CustomerService.iter_lifetime_values(limit=limit))
+
+
+def customer_segments(query, body):
+    return CustomerService.get_customer_segments()
+
+
+def health(query, body):
+    return {'status': 'ok'}
+
+
+ROUTES = [
+    ('GET', r'/health', health),
+    ('GET', r'/items', list_items),
+    ('POST', r'/items', create_item),
+    ('GET', r'/items/search', search_items),
+    ('GET', r'/items/categories', list_categories),
+    ('GET', r'/items/(\d+)', get_item),
+    ('PATCH', r'/items/(\d+)', update_item),
+    ('GET', r'/customers', list_customers),
+    ('POST', r'/customers', create_customer),
+    ('GET', r'/customers/search', search_customers),
+    ('GET', r'/customers/(\d+)', get_customer),
+    ('GET', r'/sales', list_sales),
+    ('POST', r'/sales/checkout', checkout),
+    ('GET', r'/sales/(\d+)', get_sale),
+    ('DELETE', r'/sales/(\d+)', cancel_sale),
+    ('GET', r'/reports/summary', sales_summary),
+    ('GET', r'/reports/top-items', top_items),
+    ('GET', r'/reports/categories', category_performance),
+    ('GET', r'/reports/inventory', inventory_report),
+    ('GET', r'/reports/customers', customer_lifetime_values),
+    ('GET', r'/reports/segments', customer_segments),
+]
+_ROUTES = [(method, re.compile(pattern + r'/?$'), handler) for method, pattern, handler in ROUTES]
+
+
+class ApiRequestHandler(BaseHTTPRequestHandler):
+    """JSON request handler; each request runs in its own unit of work"""
+
+    # HTTP/1.1 keeps connections alive between requests by default
+    protocol_version = 'HTTP/1.1'
+    server_version = 'ThriftStoreAPI/1.0'
+    # Headers and body go out as separate writes; without TCP_NODELAY a
+    # kept-alive connection stalls on delayed ACKs between them
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        self._dispatch('GET')
+
+    def do_POST(self):
+        self._dispatch('POST')
+
+    def do_PUT(self):
+        self._dispatch('PUT')
+
+    def do_PATCH(self):
+        self._dispatch('PATCH')
+
+    def do_DELETE(self):
+        self._dispatch('DELETE')
+
+    def _read_body(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        if not length:
+            return {}
+        try:
+            body = json.loads(self.rfile.read(length))
+        except ValueError:
+            raise ApiError(400, "Request body must be JSON")
+        if not isinstance(body, dict):
+            raise ApiError(400, "Request body must be a JSON object")
+        return body
+
+    def _match(self, method, path):
+        allowed = False
+        for route_method, pattern, handler in _ROUTES:
+            match = pattern.match(path)
+            if match:
+                if route_method == method:
+                    return handler, match.groups()
+                allowed = True
+        raise ApiError(405 if allowed else 404, f"No route for {method} {path}")
+
+    def _dispatch(self, method):
+        url = urlsplit(self.path)
+        query = {name: values[-1] for name, values in parse_qs(url.query).items()}
+        try:
+            # The body is read first so the connection stays usable on errors
+            body = self._read_body()
+            handler, args = self._match(method, url.path)
+            name = f"API {method} {handler.__name__}"
+            with unit_of_work(name, atomic=True):
+                result = tracer.call('action', name, handler, query, body, *args)
+            status, payload = result if isinstance(result, tuple) else (200, result)
+        except ApiError as e:
+            status, payload = e.status, {'error': str(e)}
+        except ValueError as e:
+            status, payload = 400, {'error': str(e)}
+        except Exception as e:
+            self.log_error("Unhandled error on %s %s: %r", method, self.path, e)
+            status, payload = 500, {'error': 'Internal server error'}
+        self._send_json(status, payload)
+
+    def _send_json(self, status, payload):
+        data = json.dumps(payload, default=json_default).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+class ApiServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+
+def create_server(host=None, port=None, keep_alive_timeout=None):
+    """Build the API server; every handler thread shares the pooled engine
+
+    The schema is brought up to date first, as the command line does, so
+    a database from an older release is migrated before any request.
+    """
+    ensure_schema()
+    config = get_api_config()
+    handler = type('ConfiguredApiRequestHandler', (ApiRequestHandler,), {
+        # Idle keep-alive connections are closed after this many seconds
+        'timeout': keep_alive_timeout or config['keep_alive_timeout']
+    })
+    return ApiServer((host or config['host'], port or config['port']), handler)
+
+
+def main(argv=None):
+    """Run the API server until interrupted"""
+    parser = argparse.ArgumentParser(description="Thrift store HTTP/JSON API")
+    parser.add_argument('--host', help="interface to listen on")
+    parser.add_argument('--port', type=int, help="port to listen on")
+    args = parser.parse_args(argv)
+
+    server = create_server(args.host, args.port)
+    host, port = server.server_address[:2]
+    print(f"Thrift store API listening on http://{host}:{port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,309 @@
+import csv
+import json
+import sys
+from datetime import date, datetime
+from itertools import islice
+import click
+from tabulate import tabulate
+from lib.models import base
+from lib.models.base import unit_of_work
+from lib.models.money import json_default
+from lib.models.schema import ensure_schema
+from lib.services.item_service import ItemService
+from lib.services.customer_service import CustomerService
+from lib.services.sales_service import SalesService
+
+OUTPUT_FORMATS = ('json', 'csv', 'table')
+REPORTS = ('summary', 'top-items', 'categories', 'inventory', 'aging', 'customers', 'segments')
+EXPORTS = ('sales', 'inventory', 'customers', 'package')
+
+
+class DateOrDateTime(click.ParamType):
+    """YYYY-MM-DD as a date, so an end date covers that whole day, or an ISO datetime"""
+
+    name = 'date'
+
+    def convert(self, value, param, ctx):
+        if isinstance(value, date):
+            return value
+        try:
+            return date.fromisoformat(value) if len(value) == 10 else datetime.fromisoformat(value)
+        except ValueError:
+            self.fail(f"'{value}' is not YYYY-MM-DD or an ISO datetime", param, ctx)
+
+
+DATE = DateOrDateTime()
+
+
+def _to_dict(row):
+    return row if isinstance(row, dict) else row.to_dict()
+
+
+def _flatten(data, prefix=''):
+    """Flatten nested dicts into dotted keys (lists as JSON) so they fit in one CSV row"""
+    flat = {}
+    for key, value in data.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(_flatten(value, name + '.'))
+        elif isinstance(value, list):
+            flat[name] = json.dumps(value, default=json_default)
+        else:
+            flat[name] = value
+    return flat
+
+
+def emit(ctx, rows):
+    """Write rows (dicts or read rows) to stdout in the chosen output format
+
+    Rows are written as they are produced, so listings streamed page by page
+    never build the whole table in memory. A single dict is written as one
+    object (JSON) or one row (CSV and table).
+    """
+    fmt = ctx.obj['output']
+    out = sys.stdout
+
+    if isinstance(rows, dict):
+        if fmt == 'json':
+            json.dump(rows, out, indent=2, default=json_default)
+            out.write('\n')
+            return
+        rows = [_flatten(rows)]
+
+    rows = (_to_dict(row) for row in rows)
+    if fmt == 'table':
+        rows = list(rows)
+        out.write(tabulate(rows, headers='keys', tablefmt='simple') + '\n')
+    elif fmt == 'csv':
+        writer = None
+        for row in rows:
+            if writer is None:
+                writer = csv.DictWriter(out, fieldnames=list(row), extrasaction='ignore')
+                writer.writeheader()
+            writer.writerow(row)
+    else:
+        out.write('[')
+        for index, row in enumerate(rows):
+            out.write(',\n  ' if index else '\n  ')
+            out.write(json.dumps(row, default=json_default))
+        out.write('\n]\n')
+
+
+def _limited(rows, limit):
+    return islice(rows, limit) if limit else rows
+
+
+@click.group()
+@click.option('--database', envvar='THRIFTSTORE_DATABASE_URL', help="Database URL to use instead of the configured one")
+@click.option('--output', '-o', type=click.Choice(OUTPUT_FORMATS), default='json', show_default=True,
+              help="Output format for listings and reports")
+@click.option('--profile', is_flag=True, help="Print a query profile to stderr when the command exits")
+@click.pass_context
+def cli(ctx, database, output, profile):
+    """Thrift store command line for scripts, cron jobs and batch work"""
+    ctx.obj = {'output': output}
+    if database or profile:
+        base.configure_engine(database, **({'profile': True} if profile else {}))
+    ensure_schema()
+
+
+def _open_unit_of_work(ctx):
+    """Run every service call of the invoked command in one unit of work"""
+    ctx.with_resource(unit_of_work(f"CLI {ctx.info_name} {ctx.invoked_subcommand}"))
+
+
+# Items
+
+@cli.group()
+@click.pass_context
+def items(ctx):
+    """Add, list, search and import inventory items"""
+    _open_unit_of_work(ctx)
+
+
+@items.command('add')
+@click.option('--name', required=True)
+@click.option('--category', required=True)
+@click.option('--price', type=float, required=True)
+@click.option('--cost', type=float, default=0.0, show_default=True)
+@click.option('--quantity', type=int, default=1, show_default=True)
+@click.option('--condition', default='Good', show_default=True)
+@click.option('--description')
+@click.option('--size')
+@click.option('--brand')
+@click.option('--color')
+@click.pass_context
+def add_item(ctx, name, category, price, cost, quantity, condition, description, size, brand, color):
+    """Add one item and print it"""
+    item = ItemService.create_item(name, description, category, price, cost=cost, quantity=quantity,
+                                   condition=condition, size=size, brand=brand, color=color)
+    emit(ctx, item.to_dict())
+
+
+@items.command('list')
+@click.option('--available', is_flag=True, help="Only items that have not been sold")
+@click.option('--limit', type=int, help="Stop after this many items")
+@click.option('--page-size', type=int, default=500, show_default=True)
+@click.pass_context
+def list_items(ctx, available, limit, page_size):
+    """List items by ID, fetched a page at a time"""
+    rows = ItemService.iter_items(page_size=page_size)
+    if available:
+        rows = (row for row in rows if not row.is_sold)
+    emit(ctx, _limited(rows, limit))
+
+
+@items.command('search')
+@click.argument('term')
+@click.option('--limit', type=int)
+@click.pass_context
+def search_items(ctx, term, limit):
+    """Search items by name, category or brand"""
+    emit(ctx, ItemService.search_items(term, limit=limit))
+
+
+@items.command('stale')
+@click.option('--days', type=int, default=90, show_default=True, help="Minimum age in days")
+@click.option('--limit', type=int)
+@click.pass_context
+def stale_items(ctx, days, limit):
+    """List unsold items older than --days, oldest first"""
+    emit(ctx, ItemService.find_stale(days=days, limit=limit))
+
+
+@items.command('import')
+@click.argument('path', type=click.Path(exists=True, dir_okay=False))
+@click.option('--batch-size', type=click.IntRange(min=1), default=500, show_default=True)
+@click.pass_context
+def import_items(ctx, path, batch_size):
+    """Bulk import items from a UTF-8 CSV file; exits 1 if any row was rejected"""
+    try:
+        result = ItemService.bulk_import(path, batch_size=batch_size)
+    except UnicodeDecodeError:
+        raise click.ClickException(f"{path} is not UTF-8 text; re-save it as \"CSV UTF-8\"")
+    for line, reason in result['rejected']:
+        click.echo(f"line {line}: {reason}", err=True)
+    emit(ctx, {'imported': result['imported'], 'rejected': len(result['rejected'])})
+    if result['rejected']:
+        ctx.exit(1)
+
+
+# Sales
+
+def _parse_basket_line(value):
+    """Parse ITEM_ID[:QUANTITY[:PRICE]] into a basket line"""
+    parts = value.split(':')
+    try:
+        line = {'item_id': int(parts[0]), 'quantity': int(parts[1]) if len(parts) > 1 and parts[1] else 1}
+        if len(parts) > 2 and parts[2]:
+            line['custom_price'] = float(parts[2])
+    except (ValueError, IndexError):
+        raise click.BadParameter(f"'{value}' is not ITEM_ID[:QUANTITY[:PRICE]]")
+    return line
+
+
+@cli.group()
+@click.pass_context
+def sales(ctx):
+    """Check out baskets and list sales"""
+    _open_unit_of_work(ctx)
+
+
+@sales.command('checkout')
+@click.option('--item', 'lines', multiple=True, required=True, metavar='ITEM_ID[:QTY[:PRICE]]',
+              help="Basket line; repeat for each item")
+@click.option('--customer-id', type=int)
+@click.option('--payment-method', default='Cash', show_default=True)
+@click.option('--tax', type=float, default=0.0, show_default=True)
+@click.option('--discount', type=float, default=0.0, show_default=True)
+@click.option('--notes')
+@click.pass_context
+def checkout(ctx, lines, customer_id, payment_method, tax, discount, notes):
+    """Record a completed sale for a basket of items"""
+    basket = [_parse_basket_line(line) for line in lines]
+    try:
+        sale = SalesService.checkout(basket, customer_id=customer_id, payment_method=payment_method,
+                                     tax_amount=tax, discount_amount=discount, notes=notes)
+    except ValueError as e:
+        raise click.ClickException(str(e))
+    emit(ctx, sale.to_dict())
+
+
+@sales.command('list')
+@click.option('--start', type=DATE, help="Only sales on or after this date")
+@click.option('--end', type=DATE, help="Only sales on or before this date")
+@click.option('--limit', type=int, help="Stop after this many sales")
+@click.option('--page-size', type=int, default=500, show_default=True)
+@click.pass_context
+def list_sales(ctx, start, end, limit, page_size):
+    """List sales, newest first"""
+    rows = SalesService.iter_sales(page_size=page_size, start_date=start, end_date=end)
+    emit(ctx, _limited(rows, limit))
+
+
+# Reports
+
+@cli.group()
+@click.pass_context
+def reports(ctx):
+    """Run reports and export data files"""
+    _open_unit_of_work(ctx)
+
+
+@reports.command('run')
+@click.argument('name', type=click.Choice(REPORTS))
+@click.option('--start', type=DATE, help="Period start for sales reports")
+@click.option('--end', type=DATE, help="Period end for sales reports, inclusive")
+@click.option('--limit', type=int, default=10, show_default=True, help="Rows for ranked reports")
+@click.pass_context
+def run_report(ctx, name, start, end, limit):
+    """Print a report"""
+    if name == 'summary':
+        emit(ctx, SalesService.get_sales_summary())
+    elif name == 'top-items':
+        emit(ctx, SalesService.get_top_selling_items(limit=limit, start_date=start, end_date=end))
+    elif name == 'categories':
+        emit(ctx, SalesService.get_category_performance(start_date=start, end_date=end))
+    elif name == 'inventory':
+        # NumPy is only imported by the one report that needs it
+        from lib.services.analytics_service import AnalyticsService
+        emit(ctx, AnalyticsService.inventory_report())
+    elif name == 'aging':
+        emit(ctx, ItemService.get_aging_buckets())
+    elif name == 'customers':
+        emit(ctx, CustomerService.iter_lifetime_values(limit=limit))
+    elif name == 'segments':
+        emit(ctx, [{'segment': segment, **data} for segment, data in CustomerService.get_customer_segments().items()])
+
+
+@reports.command('export')
+@click.argument('name', type=click.Choice(EXPORTS))
+@click.option('--format', 'fmt', type=click.Choice(('csv', 'jsonl')), default='csv', show_default=True)
+@click.option('--gzip', 'compress', is_flag=True, help="Compress the output files")
+@click.option('--path', help="Output file (or directory for 'package'); timestamped under exports/ by default")
+@click.pass_context
+def export_report(ctx, name, fmt, compress, path):
+    """Stream a table to a CSV or JSONL file"""
+    from lib.services.export_service import ExportService
+
+    if name == 'package':
+        directory, counts = ExportService.export_complete_package(path or 'exports', fmt, compress)
+        emit(ctx, {'path': directory, 'rows': counts})
+        return
+
+    path = path or ExportService.export_filename(name, fmt, compress)
+    export = getattr(ExportService, f"export_{name}")
+    emit(ctx, {'path': path, 'rows': export(path, fmt, compress)})
+
+
+@reports.command('rebuild-rollup')
+@click.pass_context
+def rebuild_rollup(ctx):
+    """Recompute the daily sales rollup and customer stats from the sales tables"""
+    from lib.services.rollup_service import RollupService
+    from lib.services.customer_stats_service import CustomerStatsService
+    emit(ctx, {'days': RollupService.rebuild(), 'customers': CustomerStatsService.rebuild()})
+
+
+if __name__ == "__main__":
+    cli(prog_name='thriftstore')
@@ -1,6 +1,8 @@
 import os
 from tabulate import tabulate
 from lib.services.customer_service import CustomerService
+from lib.cli.pager import browse_pages
+from lib.cli.workflow import run_workflow, prompt
 
 class CustomerMenu:
     def __init__(self):
@@ -37,7 +39,7 @@ class CustomerMenu:
         """Get user's menu choice"""
         while True:
             try:
-                choice = input("Enter your choice (1-7): ").strip()
+                choice = prompt("Enter your choice (1-7): ").strip()
                 if choice in ['1', '2', '3', '4', '5', '6', '7']:
                     return choice
                 else:
@@ -53,24 +55,24 @@ class CustomerMenu:
         print("=" * 40)
 
         try:
-            first_name = input("First name: ").strip()
+            first_name = prompt("First name: ").strip()
             if not first_name:
                 print("❌ First name is required!")
-                input("Press Enter to continue...")
+                prompt("Press Enter to continue...")
                 return
 
-            last_name = input("Last name: ").strip()
+            last_name = prompt("Last name: ").strip()
             if not last_name:
                 print("❌ Last name is required!")
-                input("Press Enter to continue...")
+                prompt("Press Enter to continue...")
                 return
 
-            email = input("Email (optional): ").strip() or None
-            phone = input("Phone (optional): ").strip() or None
-            address = input("Address (optional): ").strip() or None
-            city = input("City (optional): ").strip() or None
-            postal_code = input("Postal code (optional): ").strip() or None
-            notes = input("Notes (optional): ").strip() or None
+            email = prompt("Email (optional): ").strip() or None
+            phone = prompt("Phone (optional): ").strip() or None
+            address = prompt("Address (optional): ").strip() or None
+            city = prompt("City (optional): ").strip() or None
+            postal_code = prompt("Postal code (optional): ").strip() or None
+            notes = prompt("Notes (optional): ").strip() or None
 
             customer = self.service.create_customer(
                 first_name=first_name,
@@ -87,39 +89,41 @@ class CustomerMenu:
         except Exception as e:
             print(f"❌ Error adding customer: {e}")
 
-        input("\nPress Enter to continue...")
+        prompt("\nPress Enter to continue...")
 
     def view_all_customers(self):
-        """Display all customers"""
+        """Display all customers, one page at a time"""
+        try:
+            browse_pages(self.service.get_customers_page, self._show_customers_page)
+        except Exception as e:
+            print(f"❌ Error retrieving customers: {e}")
+            prompt("\nPress Enter to continue...")
+
+    def _show_customers_page(self, page, number):
+        """Render one page of customers"""
         self.clear_screen()
         self.display_header()
         print("📋 ALL CUSTOMERS")
         print("=" * 40)
 
-        try:
-            customers = self.service.get_all_customers()
-
-            if not customers:
-                print("No customers found.")
-            else:
-                table_data = []
-                for customer in customers:
-                    table_data.append([
-                        customer.id,
-                        customer.full_name,
-                        customer.email or "N/A",
-                        customer.phone or "N/A",
-                        customer.city or "N/A",
-                        customer.date_joined.strftime('%Y-%m-%d') if customer.date_joined else "N/A"
-                    ])
-
-                headers = ["ID", "Name", "Email", "Phone", "City", "Joined"]
-                print(tabulate(table_data, headers=headers, tablefmt="grid"))
-                print(f"\nTotal customers: {len(customers)}")
-        except Exception as e:
-            print(f"❌ Error retrieving customers: {e}")
+        if not page.items:
+            print("No customers found.")
+            return
 
-        input("\nPress Enter to continue...")
+        table_data = []
+        for customer in page:
+            table_data.append([
+                customer.id,
+                customer.full_name,
+                customer.email or "N/A",
+                customer.phone or "N/A",
+                customer.city or "N/A",
+                customer.date_joined.strftime('%Y-%m-%d') if customer.date_joined else "N/A"
+            ])
+
+        headers = ["ID", "Name", "Email", "Phone", "City", "Joined"]
+        print(tabulate(table_data, headers=headers, tablefmt="grid"))
+        print(f"\nPage {number} ({len(page)} customers)")
 
     def search_customers(self):
         """Search for customers"""
@@ -128,11 +132,11 @@ class CustomerMenu:
         print("🔍 SEARCH CUSTOMERS")
         print("=" * 40)
 
-        search_term = input("Enter search term (name, email, or phone): ").strip()
+        search_term = prompt("Enter search term (name, email, or phone): ").strip()
 
         if not search_term:
             print("❌ Search term cannot be empty!")
-            input("Press Enter to continue...")
+            prompt("Press Enter to continue...")
             return
 
         try:
@@ -157,7 +161,7 @@ class CustomerMenu:
         except Exception as e:
             print(f"❌ Error searching customers: {e}")
 
-        input("\nPress Enter to continue...")
+        prompt("\nPress Enter to continue...")
 
     def view_customer_details(self):
         """View detailed customer information"""
@@ -167,12 +171,12 @@ class CustomerMenu:
         print("=" * 40)
 
         try:
-            customer_id = int(input("Enter customer ID: "))
+            customer_id = int(prompt("Enter customer ID: "))
             customer, sales = self.service.get_customer_with_sales(customer_id)
 
             if not customer:
                 print(f"❌ Customer with ID {customer_id} not found!")
-                input("Press Enter to continue...")
+                prompt("Press Enter to continue...")
                 return
 
             # Display customer details
@@ -216,7 +220,7 @@ class CustomerMenu:
         except Exception as e:
             print(f"❌ Error retrieving customer details: {e}")
 
-        input("\nPress Enter to continue...")
+        prompt("\nPress Enter to continue...")
 
     def edit_customer(self):
         """Edit an existing customer"""
@@ -226,26 +230,26 @@ class CustomerMenu:
         print("=" * 40)
 
         try:
-            customer_id = int(input("Enter customer ID to edit: "))
+            customer_id = int(prompt("Enter customer ID to edit: "))
             customer = self.service.get_customer_by_id(customer_id)
 
             if not customer:
                 print(f"❌ Customer with ID {customer_id} not found!")
-                input("Press Enter to continue...")
+                prompt("Press Enter to continue...")
                 return
 
             print(f"\nEditing: {customer.full_name}")
             print("(Press Enter to keep current value)\n")
 
             # Get new values
-            first_name = input(f"First name [{customer.first_name}]: ").strip() or customer.first_name
-            last_name = input(f"Last name [{customer.last_name}]: ").strip() or customer.last_name
-            email = input(f"Email [{customer.email or 'None'}]: ").strip() or customer.email
-            phone = input(f"Phone [{customer.phone or 'None'}]: ").strip() or customer.phone
-            address = input(f"Address [{customer.address or 'None'}]: ").strip() or customer.address
-            city = input(f"City [{customer.city or 'None'}]: ").strip() or customer.city
-            postal_code = input(f"Postal code [{customer.postal_code or 'None'}]: ").strip() or customer.postal_code
-            notes = input(f"Notes [{customer.notes or 'None'}]: ").strip() or customer.notes
+            first_name = prompt(f"First name [{customer.first_name}]: ").strip() or customer.first_name
+            last_name = prompt(f"Last name [{customer.last_name}]: ").strip() or customer.last_name
+            email = prompt(f"Email [{customer.email or 'None'}]: ").strip() or customer.email
+            phone = prompt(f"Phone [{customer.phone or 'None'}]: ").strip() or customer.phone
+            address = prompt(f"Address [{customer.address or 'None'}]: ").strip() or customer.address
+            city = prompt(f"City [{customer.city or 'None'}]: ").strip() or customer.city
+            postal_code = prompt(f"Postal code [{customer.postal_code or 'None'}]: ").strip() or customer.postal_code
+            notes = prompt(f"Notes [{customer.notes or 'None'}]: ").strip() or customer.notes
 
             # Update customer
             updated_customer = self.service.update_customer(
@@ -269,7 +273,7 @@ class CustomerMenu:
         except Exception as e:
             print(f"❌ Error updating customer: {e}")
 
-        input("\nPress Enter to continue...")
+        prompt("\nPress Enter to continue...")
 
     def delete_customer(self):
         """Delete a customer"""
@@ -279,12 +283,12 @@ class CustomerMenu:
         print("=" * 40)
 
         try:
-            customer_id = int(input("Enter customer ID to delete: "))
+            customer_id = int(prompt("Enter customer ID to delete: "))
             customer = self.service.get_customer_by_id(customer_id)
 
             if not customer:
                 print(f"❌ Customer with ID {customer_id} not found!")
-                input("Press Enter to continue...")
+                prompt("Press Enter to continue...")
                 return
 
             print(f"\nCustomer to delete:")
@@ -292,7 +296,7 @@ class CustomerMenu:
             print(f"Email: {customer.email or 'N/A'}")
             print(f"Phone: {customer.phone or 'N/A'}")
 
-            confirm = input("\n⚠️  Are you sure you want to delete this customer? (y/N): ").strip().lower()
+            confirm = prompt("\n⚠️  Are you sure you want to delete this customer? (y/N): ").strip().lower()
 
             if confirm == 'y':
                 if self.service.delete_customer(customer_id):
@@ -306,7 +310,7 @@ class CustomerMenu:
         except Exception as e:
             print(f"❌ Error deleting customer: {e}")
 
-        input("\nPress Enter to continue...")
+        prompt("\nPress Enter to continue...")
 
     def run(self):
         """Run the customer menu"""
@@ -319,19 +323,19 @@ class CustomerMenu:
                 choice = self.get_user_choice()
 
                 if choice == '1':
-                    self.add_customer()
+                    run_workflow(self.add_customer)
                 elif choice == '2':
-                    self.view_all_customers()
+                    run_workflow(self.view_all_customers)
                 elif choice == '3':
-                    self.search_customers()
+                    run_workflow(self.search_customers)
                 elif choice == '4':
-                    self.view_customer_details()
+                    run_workflow(self.view_customer_details)
                 elif choice == '5':
-                    self.edit_customer()
+                    run_workflow(self.edit_customer)
                 elif choice == '6':
-                    self.delete_customer()
+                    run_workflow(self.delete_customer)
                 elif choice == '7':
                     break
             except Exception as e:
                 print(f"❌ An error occurred: {e}")
-                input("Press Enter to continue...")
\ No newline at end of file
+                prompt("Press Enter to continue...")
\ No newline at end of file
@@ -0,0 +1,132 @@
+import os
+from datetime import datetime
+from tabulate import tabulate
+from lib.models.profiler import get_profiler
+from lib.services.cache import cache
+from lib.services.tracing import tracer
+from lib.cli.workflow import prompt
+
+STATEMENT_WIDTH = 70
+
+
+def _ms(seconds):
+    return f"{seconds * 1000:.2f}"
+
+
+class DiagnosticsMenu:
+    """Latency percentiles for this process, reached from System Settings"""
+
+    def clear_screen(self):
+        """Clear the terminal screen"""
+        os.system('cls' if os.name == 'nt' else 'clear')
+
+    def display_header(self):
+        """Display the menu header"""
+        print("=" * 60)
+        print("            DIAGNOSTICS")
+        print("=" * 60)
+        print()
+
+    def display_status(self):
+        """Show whether tracing and profiling are collecting"""
+        since = datetime.fromtimestamp(tracer.since).strftime('%Y-%m-%d %H:%M:%S')
+        print(f"Tracing: {'ON' if tracer.enabled else 'OFF'} (collecting since {since})")
+        print(f"Query profiler: {'ON' if get_profiler() else 'OFF (start with THRIFTSTORE_PROFILE=1)'}")
+        stats = cache.stats()
+        print(f"Cache hit rate: {stats['hit_rate']:.0%} ({stats['hits']} hits / {stats['misses']} misses)")
+        print()
+
+    def display_menu(self):
+        """Display diagnostics options"""
+        menu_options = [
+            ["1", "⏱️  Menu Actions", "Latency per menu action"],
+            ["2", "🧩 Service Calls", "Latency per service method"],
+            ["3", "🗄️  SQL Statements", "Latency per SQL statement"],
+            ["4", "🔀 Toggle Tracing", "Turn latency collection on or off"],
+            ["5", "♻️  Reset", "Clear the collected timings"],
+            ["6", "🔙 Back", "Return to settings"]
+        ]
+
+        print("🩺 DIAGNOSTICS MENU")
+        print(tabulate(menu_options, headers=["Option", "Action", "Description"], tablefmt="grid"))
+        print()
+
+    def get_user_choice(self):
+        """Get user's menu choice"""
+        while True:
+            try:
+                choice = prompt("Enter your choice (1-6): ").strip()
+                if choice in ['1', '2', '3', '4', '5', '6']:
+                    return choice
+                else:
+                    print("❌ Invalid choice. Please enter a number between 1-6.")
+            except KeyboardInterrupt:
+                return '6'
+
+    def show_latencies(self, kind, title, limit=25):
+        """Show count, p50/p95/p99, max and total milliseconds per traced name"""
+        self.clear_screen()
+        self.display_header()
+        print(f"⏱️  {title}")
+        print("=" * 40)
+
+        rows = tracer.report(kind)
+        if not rows:
+            print("No timings recorded yet." if tracer.enabled else "Tracing is off; turn it on with option 4.")
+        else:
+            table = []
+            for row in rows[:limit]:
+                name = row['name']
+                if kind == 'sql' and len(name) > STATEMENT_WIDTH:
+                    name = name[:STATEMENT_WIDTH - 3] + '...'
+                table.append([name, row['count'], _ms(row['p50']), _ms(row['p95']), _ms(row['p99']),
+                              _ms(row['max']), _ms(row['total'])])
+            print(tabulate(table, headers=["Name", "Calls", "p50 ms", "p95 ms", "p99 ms", "Max ms", "Total ms"],
+                           tablefmt="grid"))
+            if len(rows) > limit:
+                print(f"... and {len(rows) - limit} more")
+
+        prompt("\nPress Enter to continue...")
+
+    def toggle_tracing(self):
+        """Turn tracing on or off for the rest of this process"""
+        if tracer.enabled:
+            tracer.disable()
+            print("✅ Tracing turned off; collected timings are kept.")
+        else:
+            tracer.enable()
+            print("✅ Tracing turned on.")
+        prompt("Press Enter to continue...")
+
+    def reset(self):
+        """Clear every collected timing"""
+        tracer.reset()
+        print("✅ Timings cleared.")
+        prompt("Press Enter to continue...")
+
+    def run(self):
+        """Run the diagnostics menu"""
+        while True:
+            try:
+                self.clear_screen()
+                self.display_header()
+                self.display_status()
+                self.display_menu()
+
+                choice = self.get_user_choice()
+
+                if choice == '1':
+                    self.show_latencies('action', "MENU ACTIONS")
+                elif choice == '2':
+                    self.show_latencies('service', "SERVICE CALLS")
+                elif choice == '3':
+                    self.show_latencies('sql', "SQL STATEMENTS")
+                elif choice == '4':
+                    self.toggle_tracing()
+                elif choice == '5':
+                    self.reset()
+                elif choice == '6':
+                    break
+            except Exception as e:
+                print(f"❌ An error occurred: {e}")
+                prompt("Press Enter to continue...")
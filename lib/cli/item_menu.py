@@ -1,6 +1,8 @@
 import os
 from tabulate import tabulate
 from lib.services.item_service import ItemService
+from lib.cli.pager import browse_pages
+from lib.cli.workflow import run_workflow, prompt
 
 class ItemMenu:
     def __init__(self):
@@ -26,7 +28,8 @@ class ItemMenu:
             ["4", "✏️  Edit Item", "Modify item information"],
             ["5", "🗑️  Delete Item", "Remove item from inventory"],
             ["6", "📦 View Categories", "Show all item categories"],
-            ["7", "🔙 Back to Main Menu", "Return to main menu"]
+            ["7", "📥 Import Items (CSV)", "Bulk import items from a CSV file"],
+            ["8", "🔙 Back to Main Menu", "Return to main menu"]
         ]
 
         print("🛍️  ITEM MENU")
@@ -37,13 +40,13 @@ class ItemMenu:
         """Get user's menu choice"""
         while True:
             try:
-                choice = input("Enter your choice (1-7): ").strip()
-                if choice in ['1', '2', '3', '4', '5', '6', '7']:
+                choice = prompt("Enter your choice (1-8): ").strip()
+                if choice in ['1', '2', '3', '4', '5', '6', '7', '8']:
                     return choice
                 else:
-                    print("❌ Invalid choice. Please enter a number between 1-7.")
+                    print("❌ Invalid choice. Please enter a number between 1-8.")
             except KeyboardInterrupt:
-                return '7'
+                return '8'
 
     def add_item(self):
         """Add a new item"""
@@ -53,39 +56,39 @@ class ItemMenu:
         print("=" * 40)
 
         try:
-            name = input("Item name: ").strip()
+            name = prompt("Item name: ").strip()
             if not name:
                 print("❌ Item name is required!")
                 return
 
-            description = input("Description (optional): ").strip() or None
-            category = input("Category: ").strip()
+            description = prompt("Description (optional): ").strip() or None
+            category = prompt("Category: ").strip()
 
             while True:
                 try:
-                    price = float(input("Price (KES): "))
+                    price = float(prompt("Price (KES): "))
                     break
                 except ValueError:
                     print("❌ Please enter a valid price!")
 
             while True:
                 try:
-                    cost = float(input("Cost (KES, optional, default 0): ") or "0")
+                    cost = float(prompt("Cost (KES, optional, default 0): ") or "0")
                     break
                 except ValueError:
                     print("❌ Please enter a valid cost!")
 
             while True:
                 try:
-                    quantity = int(input("Quantity (default 1): ") or "1")
+                    quantity = int(prompt("Quantity (default 1): ") or "1")
                     break
                 except ValueError:
                     print("❌ Please enter a valid quantity!")
 
-            condition = input("Condition (New/Excellent/Good/Fair/Poor, default Good): ").strip() or "Good"
-            size = input("Size (optional): ").strip() or None
-            brand = input("Brand (optional): ").strip() or None
-            color = input("Color (optional): ").strip() or None
+            condition = prompt("Condition (New/Excellent/Good/Fair/Poor, default Good): ").strip() or "Good"
+            size = prompt("Size (optional): ").strip() or None
+            brand = prompt("Brand (optional): ").strip() or None
+            color = prompt("Color (optional): ").strip() or None
 
             item = self.service.create_item(
                 name=name,
@@ -104,42 +107,44 @@ class ItemMenu:
         except Exception as e:
             print(f"❌ Error adding item: {e}")
 
-        input("\nPress Enter to continue...")
+        prompt("\nPress Enter to continue...")
 
     def view_all_items(self):
-        """Display all items"""
+        """Display all items, one page at a time"""
+        try:
+            browse_pages(self.service.get_items_page, self._show_items_page)
+        except Exception as e:
+            print(f"❌ Error retrieving items: {e}")
+            prompt("\nPress Enter to continue...")
+
+    def _show_items_page(self, page, number):
+        """Render one page of items"""
         self.clear_screen()
         self.display_header()
         print("📋 ALL ITEMS")
         print("=" * 40)
 
-        try:
-            items = self.service.get_all_items()
-
-            if not items:
-                print("No items found.")
-            else:
-                # Prepare data for table
-                table_data = []
-                for item in items:
-                    status = "❌ Sold" if item.is_sold else "✅ Available"
-                    table_data.append([
-                        item.id,
-                        item.name[:30] + "..." if len(item.name) > 30 else item.name,
-                        item.category,
-                        f"KES{item.price:.2f}",
-                        item.quantity,
-                        item.condition,
-                        status
-                    ])
-
-                headers = ["ID", "Name", "Category", "Price", "Qty", "Condition", "Status"]
-                print(tabulate(table_data, headers=headers, tablefmt="grid"))
-                print(f"\nTotal items: {len(items)}")
-        except Exception as e:
-            print(f"❌ Error retrieving items: {e}")
+        if not page.items:
+            print("No items found.")
+            return
 
-        input("\nPress Enter to continue...")
+        # Prepare data for table
+        table_data = []
+        for item in page:
+            status = "❌ Sold" if item.is_sold else "✅ Available"
+            table_data.append([
+                item.id,
+                item.name[:30] + "..." if len(item.name) > 30 else item.name,
+                item.category,
+                f"KES{item.price:.2f}",
+                item.quantity,
+                item.condition,
+                status
+            ])
+
+        headers = ["ID", "Name", "Category", "Price", "Qty", "Condition", "Status"]
+        print(tabulate(table_data, headers=headers, tablefmt="grid"))
+        print(f"\nPage {number} ({len(page)} items)")
 
     def search_items(self):
         """Search for items"""
@@ -148,11 +153,11 @@ class ItemMenu:
         print("🔍 SEARCH ITEMS")
         print("=" * 40)
 
-        search_term = input("Enter search term (name, category, or brand): ").strip()
+        search_term = prompt("Enter search term (name, category, or brand): ").strip()
 
         if not search_term:
             print("❌ Search term cannot be empty!")
-            input("Press Enter to continue...")
+            prompt("Press Enter to continue...")
             return
 
         try:
@@ -179,7 +184,7 @@ class ItemMenu:
         except Exception as e:
             print(f"❌ Error searching items: {e}")
 
-        input("\nPress Enter to continue...")
+        prompt("\nPress Enter to continue...")
 
     def edit_item(self):
         """Edit an existing item"""
@@ -189,35 +194,35 @@ class ItemMenu:
         print("=" * 40)
 
         try:
-            item_id = int(input("Enter item ID to edit: "))
+            item_id = int(prompt("Enter item ID to edit: "))
             item = self.service.get_item_by_id(item_id)
 
             if not item:
                 print(f"❌ Item with ID {item_id} not found!")
-                input("Press Enter to continue...")
+                prompt("Press Enter to continue...")
                 return
 
             print(f"\nEditing: {item.name}")
             print("(Press Enter to keep current value)\n")
 
             # Get new values
-            name = input(f"Name [{item.name}]: ").strip() or item.name
-            description = input(f"Description [{item.description or 'None'}]: ").strip() or item.description
-            category = input(f"Category [{item.category}]: ").strip() or item.category
+            name = prompt(f"Name [{item.name}]: ").strip() or item.name
+            description = prompt(f"Description [{item.description or 'None'}]: ").strip() or item.description
+            category = prompt(f"Category [{item.category}]: ").strip() or item.category
 
-            price_input = input(f"Price [{item.price}]: ").strip()
+            price_input = prompt(f"Price [{item.price}]: ").strip()
             price = float(price_input) if price_input else item.price
 
-            cost_input = input(f"Cost [{item.cost}]: ").strip()
+            cost_input = prompt(f"Cost [{item.cost}]: ").strip()
             cost = float(cost_input) if cost_input else item.cost
 
-            qty_input = input(f"Quantity [{item.quantity}]: ").strip()
+            qty_input = prompt(f"Quantity [{item.quantity}]: ").strip()
             quantity = int(qty_input) if qty_input else item.quantity
 
-            condition = input(f"Condition [{item.condition}]: ").strip() or item.condition
-            size = input(f"Size [{item.size or 'None'}]: ").strip() or item.size
-            brand = input(f"Brand [{item.brand or 'None'}]: ").strip() or item.brand
-            color = input(f"Color [{item.color or 'None'}]: ").strip() or item.color
+            condition = prompt(f"Condition [{item.condition}]: ").strip() or item.condition
+            size = prompt(f"Size [{item.size or 'None'}]: ").strip() or item.size
+            brand = prompt(f"Brand [{item.brand or 'None'}]: ").strip() or item.brand
+            color = prompt(f"Color [{item.color or 'None'}]: ").strip() or item.color
 
             # Update item
             updated_item = self.service.update_item(
@@ -243,7 +248,7 @@ class ItemMenu:
         except Exception as e:
             print(f"❌ Error updating item: {e}")
 
-        input("\nPress Enter to continue...")
+        prompt("\nPress Enter to continue...")
 
     def delete_item(self):
         """Delete an item"""
@@ -253,12 +258,12 @@ class ItemMenu:
         print("=" * 40)
 
         try:
-            item_id = int(input("Enter item ID to delete: "))
+            item_id = int(prompt("Enter item ID to delete: "))
             item = self.service.get_item_by_id(item_id)
 
             if not item:
                 print(f"❌ Item with ID {item_id} not found!")
-                input("Press Enter to continue...")
+                prompt("Press Enter to continue...")
                 return
 
             print(f"\nItem to delete:")
@@ -266,7 +271,7 @@ class ItemMenu:
             print(f"Category: {item.category}")
             print(f"Price: KES{item.price:.2f}")
 
-            confirm = input("\n⚠️  Are you sure you want to delete this item? (y/N): ").strip().lower()
+            confirm = prompt("\n⚠️  Are you sure you want to delete this item? (y/N): ").strip().lower()
 
             if confirm == 'y':
                 if self.service.delete_item(item_id):
@@ -280,7 +285,7 @@ class ItemMenu:
         except Exception as e:
             print(f"❌ Error deleting item: {e}")
 
-        input("\nPress Enter to continue...")
+        prompt("\nPress Enter to continue...")
 
     def view_categories(self):
         """View all categories"""
@@ -301,7 +306,51 @@ class ItemMenu:
         except Exception as e:
             print(f"❌ Error retrieving categories: {e}")
 
-        input("\nPress Enter to continue...")
+        prompt("\nPress Enter to continue...")
+
+    def import_items(self):
+        """Bulk import items from a CSV file"""
+        self.clear_screen()
+        self.display_header()
+        print("📥 IMPORT ITEMS (CSV)")
+        print("=" * 40)
+        print("Required columns: name, category, price")
+        print("Optional columns: description, cost, quantity, condition, size, brand, color\n")
+
+        path = prompt("CSV file path: ").strip()
+        if not path:
+            print("❌ File path is required!")
+            prompt("Press Enter to continue...")
+            return
+
+        batch_input = prompt("Batch size (default 500): ").strip()
+        try:
+            batch_size = int(batch_input) if batch_input else 500
+            if batch_size < 1:
+                raise ValueError(batch_input)
+        except ValueError:
+            print("❌ Invalid batch size!")
+            prompt("Press Enter to continue...")
+            return
+
+        try:
+            result = self.service.bulk_import(path, batch_size=batch_size)
+
+            print(f"\n✅ Imported {result['imported']} item(s)")
+            if result['rejected']:
+                print(f"⚠️  Rejected {len(result['rejected'])} row(s):")
+                rejected_data = [[line, reason] for line, reason in result['rejected'][:20]]
+                print(tabulate(rejected_data, headers=["Line", "Reason"], tablefmt="grid"))
+                if len(result['rejected']) > 20:
+                    print(f"... and {len(result['rejected']) - 20} more")
+        except UnicodeDecodeError:
+            print("❌ The file is not UTF-8 text; re-save it as \"CSV UTF-8\" and try again")
+        except FileNotFoundError:
+            print(f"❌ File not found: {path}")
+        except Exception as e:
+            print(f"❌ Error importing items: {e}")
+
+        prompt("\nPress Enter to continue...")
 
     def run(self):
         """Run the item menu"""
@@ -314,19 +363,21 @@ class ItemMenu:
                 choice = self.get_user_choice()
 
                 if choice == '1':
-                    self.add_item()
+                    run_workflow(self.add_item)
                 elif choice == '2':
-                    self.view_all_items()
+                    run_workflow(self.view_all_items)
                 elif choice == '3':
-                    self.search_items()
+                    run_workflow(self.search_items)
                 elif choice == '4':
-                    self.edit_item()
+                    run_workflow(self.edit_item)
                 elif choice == '5':
-                    self.delete_item()
+                    run_workflow(self.delete_item)
                 elif choice == '6':
-                    self.view_categories()
+                    run_workflow(self.view_categories)
                 elif choice == '7':
+                    run_workflow(self.import_items)
+                elif choice == '8':
                     break
             except Exception as e:
                 print(f"❌ An error occurred: {e}")
-                input("Press Enter to continue...")
\ No newline at end of file
+                prompt("Press Enter to continue...")
\ No newline at end of file
@@ -1,21 +1,41 @@
 import os
+from functools import cached_property
 from tabulate import tabulate
-from lib.models.base import create_tables
-from lib.cli.item_menu import ItemMenu
-from lib.cli.customer_menu import CustomerMenu
-from lib.cli.sales_menu import SalesMenu
-from lib.cli.reports_menu import ReportsMenu
-from lib.services.sales_service import SalesService
+from lib.models import base
+from lib.models.schema import ensure_schema
+from lib.cli.workflow import run_workflow, prompt
 
 class MainMenu:
     def __init__(self):
-        self.item_menu = ItemMenu()
-        self.customer_menu = CustomerMenu()
-        self.sales_menu = SalesMenu()
-        self.reports_menu = ReportsMenu()
-
-        # Create tables if they don't exist
-        create_tables()
+        # Compare the schema with the Alembic head; migrations run only if behind
+        ensure_schema()
+
+    # Sub-menus (and the services, NumPy, exporters they pull in) are
+    # imported and built the first time they are opened
+    @cached_property
+    def item_menu(self):
+        from lib.cli.item_menu import ItemMenu
+        return ItemMenu()
+
+    @cached_property
+    def customer_menu(self):
+        from lib.cli.customer_menu import CustomerMenu
+        return CustomerMenu()
+
+    @cached_property
+    def sales_menu(self):
+        from lib.cli.sales_menu import SalesMenu
+        return SalesMenu()
+
+    @cached_property
+    def reports_menu(self):
+        from lib.cli.reports_menu import ReportsMenu
+        return ReportsMenu()
+
+    @cached_property
+    def diagnostics_menu(self):
+        from lib.cli.diagnostics_menu import DiagnosticsMenu
+        return DiagnosticsMenu()
 
     def clear_screen(self):
         """Clear the terminal screen"""
@@ -31,6 +51,7 @@ class MainMenu:
     def display_dashboard(self):
         """Display dashboard with key statistics"""
         try:
+            from lib.services.sales_service import SalesService
             summary = SalesService.get_sales_summary()
 
             dashboard_data = [
@@ -66,7 +87,7 @@ class MainMenu:
         """Get user's menu choice"""
         while True:
             try:
-                choice = input("Enter your choice (1-6): ").strip()
+                choice = prompt("Enter your choice (1-6): ").strip()
                 if choice in ['1', '2', '3', '4', '5', '6']:
                     return choice
                 else:
@@ -86,25 +107,36 @@ class MainMenu:
         elif choice == '4':
             self.reports_menu.run()
         elif choice == '5':
-            self.show_settings()
+            # Diagnostics runs outside the settings workflow so it is not timed as part of it
+            if run_workflow(self.show_settings):
+                self.diagnostics_menu.run()
         elif choice == '6':
             return False
         return True
 
     def show_settings(self):
-        """Show system settings"""
+        """Show system settings; returns True when diagnostics were asked for"""
+        from lib.services.cache import cache
         self.clear_screen()
         self.display_header()
 
         print("⚙️  SYSTEM SETTINGS")
         print("=" * 40)
-        print("1. Database: SQLite (thrift_store.db)")
+        print(f"1. Database: {base.engine.url.render_as_string(hide_password=True)}")
         print("2. Version: 1.0.0")
         print("3. Environment: Development")
+        if base.engine.dialect.name == 'sqlite':
+            with base.engine.connect() as connection:
+                journal_mode = connection.exec_driver_sql("PRAGMA journal_mode").scalar()
+            print(f"4. Journal mode: {journal_mode.upper()}")
+        stats = cache.stats()
+        print(f"5. Cache: {stats['entries']}/{stats['max_entries']} entries, "
+              f"{stats['hits']} hits / {stats['misses']} misses ({stats['hit_rate']:.0%} hit rate)")
         print()
         print("Settings menu coming soon...")
         print()
-        input("Press Enter to continue...")
+        # Entering 'd' here opens the diagnostics screen
+        return prompt("Press Enter to continue...").strip().lower() == 'd'
 
     def run(self):
         """Main application loop"""
@@ -112,7 +144,7 @@ class MainMenu:
             try:
                 self.clear_screen()
                 self.display_header()
-                self.display_dashboard()
+                run_workflow(self.display_dashboard)
                 self.display_menu()
 
                 choice = self.get_user_choice()
@@ -122,6 +154,6 @@ class MainMenu:
 
             except Exception as e:
                 print(f"❌ An error occurred: {e}")
-                input("Press Enter to continue...")
+                prompt("Press Enter to continue...")
 
         print("\n👋 Thank you for using Thrift Store Management System!")
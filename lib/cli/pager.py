@@ -0,0 +1,32 @@
+from lib.cli.workflow import prompt
+
+
+def browse_pages(fetch_page, show_page):
+    """Display keyset pages with next/previous navigation
+
+    ``fetch_page`` accepts ``after_id``/``before_id`` and returns a Page;
+    ``show_page`` renders a page along with its 1-based page number.
+    """
+    page = fetch_page()
+    number = 1
+
+    while True:
+        show_page(page, number)
+
+        options = []
+        if page.has_next:
+            options.append("[n]ext")
+        if page.has_previous:
+            options.append("[p]revious")
+        options.append("[q]uit")
+
+        choice = prompt(f"\n{', '.join(options)}: ").strip().lower()
+
+        if choice == 'n' and page.has_next:
+            page = fetch_page(after_id=page.last_key)
+            number += 1
+        elif choice == 'p' and page.has_previous:
+            page = fetch_page(before_id=page.first_key)
+            number -= 1
+        elif choice in ('q', ''):
+            break
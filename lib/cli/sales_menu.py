@@ -5,6 +5,8 @@ from tabulate import tabulate
 from lib.services.sales_service import SalesService
 from lib.services.item_service import ItemService
 from lib.services.customer_service import CustomerService
+from lib.cli.pager import browse_pages
+from lib.cli.workflow import run_workflow, prompt
 
 class SalesMenu:
     def __init__(self):
@@ -42,7 +44,7 @@ class SalesMenu:
         """Get user's menu choice"""
         while True:
             try:
-                choice = input("Enter your choice (1-6): ").strip()
+                choice = prompt("Enter your choice (1-6): ").strip()
                 if choice in ['1', '2', '3', '4', '5', '6']:
                     return choice
                 else:
@@ -60,14 +62,14 @@ class SalesMenu:
         try:
             # Optional customer selection
             customer_id = None
-            use_customer = input("Add customer to sale? (y/N): ").strip().lower()
+            use_customer = prompt("Add customer to sale? (y/N): ").strip().lower()
 
             if use_customer == 'y':
-                customer_search = input("Enter customer name or ID: ").strip()
+                customer_search = prompt("Enter customer name or ID: ").strip()
                 if customer_search.isdigit():
                     customer = self.customer_service.get_customer_by_id(int(customer_search))
                 else:
-                    customers = self.customer_service.search_customers(customer_search)
+                    customers = self.customer_service.search_customers(customer_search, limit=1)
                     if customers:
                         customer = customers[0]  # Take first match
                     else:
@@ -79,16 +81,15 @@ class SalesMenu:
                 else:
                     print("❌ Customer not found. Proceeding without customer.")
 
-            # Create sale
-            sale = self.sales_service.create_sale(customer_id=customer_id)
-            print(f"\n📝 Sale created (ID: {sale.id})")
+            # Build the basket in memory; nothing is written until checkout
+            basket = []
+            in_basket = {}
 
-            # Add items to sale
             print("\nAdding items to sale...")
             print("Enter item IDs (one per line, blank line to finish):")
 
             while True:
-                item_input = input("Item ID: ").strip()
+                item_input = prompt("Item ID: ").strip()
                 if not item_input:
                     break
 
@@ -100,15 +101,15 @@ class SalesMenu:
                         print(f"❌ Item {item_id} not found!")
                         continue
 
-                    if item.is_sold or item.quantity <= 0:
+                    max_qty = item.quantity - in_basket.get(item_id, 0)
+                    if item.is_sold or max_qty <= 0:
                         print(f"❌ Item '{item.name}' is not available!")
                         continue
 
                     # Get quantity
-                    max_qty = item.quantity
                     while True:
                         try:
-                            qty_input = input(f"Quantity (max {max_qty}, default 1): ").strip()
+                            qty_input = prompt(f"Quantity (max {max_qty}, default 1): ").strip()
                             quantity = int(qty_input) if qty_input else 1
                             if 1 <= quantity <= max_qty:
                                 break
@@ -117,8 +118,8 @@ class SalesMenu:
                         except ValueError:
                             print("❌ Please enter a valid quantity!")
 
-                    # Add item to sale
-                    sale_item = self.sales_service.add_item_to_sale(sale.id, item_id, quantity)
+                    basket.append({'item_id': item_id, 'quantity': quantity})
+                    in_basket[item_id] = in_basket.get(item_id, 0) + quantity
                     print(f"✅ Added {quantity}x {item.name} - ${item.price * quantity:.2f}")
 
                 except ValueError:
@@ -126,65 +127,73 @@ class SalesMenu:
                 except Exception as e:
                     print(f"❌ Error adding item: {e}")
 
+            if not basket:
+                print("\n❌ No items added. Sale cancelled.")
+                prompt("\nPress Enter to continue...")
+                return
+
             # Apply discount if needed
-            discount_input = input("\nDiscount amount ($, optional): ").strip()
+            discount_input = prompt("\nDiscount amount ($, optional): ").strip()
             discount = float(discount_input) if discount_input else 0
 
             # Apply tax if needed
-            tax_input = input("Tax amount ($, optional): ").strip()
+            tax_input = prompt("Tax amount ($, optional): ").strip()
             tax = float(tax_input) if tax_input else 0
 
-            # Complete sale
-            completed_sale = self.sales_service.complete_sale(sale.id, discount=discount, tax=tax)
+            # Record the whole sale in one transaction
+            completed_sale = self.sales_service.checkout(
+                basket,
+                customer_id=customer_id,
+                tax_amount=tax,
+                discount_amount=discount
+            )
 
-            if completed_sale:
-                print(f"\n✅ Sale completed successfully!")
-                print(f"Total: KES{completed_sale.final_total:.2f}")
+            print(f"\n✅ Sale completed successfully! (ID: {completed_sale.id})")
+            print(f"Total: KES{completed_sale.final_total:.2f}")
 
-                # Print receipt option
-                print_receipt = input("\nPrint receipt? (y/N): ").strip().lower()
-                if print_receipt == 'y':
-                    self.print_receipt(completed_sale.id)
-            else:
-                print("❌ Failed to complete sale!")
+            # Print receipt option
+            print_receipt = prompt("\nPrint receipt? (y/N): ").strip().lower()
+            if print_receipt == 'y':
+                self.print_receipt(completed_sale.id)
 
         except Exception as e:
             print(f"❌ Error creating sale: {e}")
 
-        input("\nPress Enter to continue...")
+        prompt("\nPress Enter to continue...")
 
     def view_all_sales(self):
-        """Display all sales"""
+        """Display all sales, one page at a time"""
+        try:
+            browse_pages(self.sales_service.get_sales_page, self._show_sales_page)
+        except Exception as e:
+            print(f"❌ Error retrieving sales: {e}")
+            prompt("\nPress Enter to continue...")
+
+    def _show_sales_page(self, page, number):
+        """Render one page of sales"""
         self.clear_screen()
         self.display_header()
         print("📋 ALL SALES")
         print("=" * 40)
 
-        try:
-            sales = self.sales_service.get_all_sales()
-
-            if not sales:
-                print("No sales found.")
-            else:
-                table_data = []
-                for sale in sales:
-                    customer_name = sale.customer.full_name if sale.customer else "Walk-in"
-                    table_data.append([
-                        sale.id,
-                        sale.sale_date.strftime('%Y-%m-%d %H:%M') if sale.sale_date else "N/A",
-                        customer_name,
-                        f"KES{sale.final_total:.2f}",
-                        sale.status,
-                        len(sale.items) if sale.items else 0
-                    ])
-
-                headers = ["ID", "Date", "Customer", "Total", "Status", "Items"]
-                print(tabulate(table_data, headers=headers, tablefmt="grid"))
-                print(f"\nTotal sales: {len(sales)}")
-        except Exception as e:
-            print(f"❌ Error retrieving sales: {e}")
-
-        input("\nPress Enter to continue...")
+        if not page.items:
+            print("No sales found.")
+            return
+
+        table_data = []
+        for sale in page:
+            table_data.append([
+                sale.id,
+                sale.sale_date.strftime('%Y-%m-%d %H:%M') if sale.sale_date else "N/A",
+                sale.customer_name or "Walk-in",
+                f"KES{sale.final_total:.2f}",
+                sale.status,
+                sale.items_count
+            ])
+
+        headers = ["ID", "Date", "Customer", "Total", "Status", "Items"]
+        print(tabulate(table_data, headers=headers, tablefmt="grid"))
+        print(f"\nPage {number} ({len(page)} sales)")
 
     def view_sale_details(self):
         """View detailed sale information"""
@@ -194,12 +203,12 @@ class SalesMenu:
         print("=" * 40)
 
         try:
-            sale_id = int(input("Enter sale ID: "))
+            sale_id = int(prompt("Enter sale ID: "))
             sale = self.sales_service.get_sale_with_details(sale_id)
 
             if not sale:
                 print(f"❌ Sale with ID {sale_id} not found!")
-                input("Press Enter to continue...")
+                prompt("Press Enter to continue...")
                 return
 
             # Display sale details
@@ -210,21 +219,21 @@ class SalesMenu:
                 ["Date", sale.sale_date.strftime('%Y-%m-%d %H:%M:%S') if sale.sale_date else "N/A"],
                 ["Customer", customer_name],
                 ["Status", sale.status],
-                ["Subtotal", f"KES{sale.subtotal:.2f}"],
-                ["Discount", f"KES{sale.discount:.2f}"],
-                ["Tax", f"KES{sale.tax:.2f}"],
+                ["Subtotal", f"KES{sale.total_amount:.2f}"],
+                ["Discount", f"KES{sale.discount_amount or 0:.2f}"],
+                ["Tax", f"KES{sale.tax_amount or 0:.2f}"],
                 ["Final Total", f"KES{sale.final_total:.2f}"]
             ]
 
             print(tabulate(details, headers=["Field", "Value"], tablefmt="grid"))
 
             # Display items
-            if sale.items:
-                print(f"\n📦 ITEMS ({len(sale.items)} items)")
+            if sale.sale_items:
+                print(f"\n📦 ITEMS ({sale.items_count} items)")
                 print("-" * 50)
 
                 items_data = []
-                for sale_item in sale.items:
+                for sale_item in sale.sale_items:
                     item = sale_item.item
                     items_data.append([
                         item.name,
@@ -240,7 +249,7 @@ class SalesMenu:
         except Exception as e:
             print(f"❌ Error retrieving sale details: {e}")
 
-        input("\nPress Enter to continue...")
+        prompt("\nPress Enter to continue...")
 
     def cancel_sale(self):
         """Cancel a sale"""
@@ -250,17 +259,17 @@ class SalesMenu:
         print("=" * 40)
 
         try:
-            sale_id = int(input("Enter sale ID to cancel: "))
+            sale_id = int(prompt("Enter sale ID to cancel: "))
             sale = self.sales_service.get_sale_by_id(sale_id)
 
             if not sale:
                 print(f"❌ Sale with ID {sale_id} not found!")
-                input("Press Enter to continue...")
+                prompt("Press Enter to continue...")
                 return
 
             if sale.status == 'cancelled':
                 print("❌ Sale is already cancelled!")
-                input("Press Enter to continue...")
+                prompt("Press Enter to continue...")
                 return
 
             customer_name = sale.customer.full_name if sale.customer else "Walk-in"
@@ -271,7 +280,7 @@ class SalesMenu:
             print(f"Customer: {customer_name}")
             print(f"Total: KES{sale.final_total:.2f}")
 
-            confirm = input("\n⚠️  Are you sure you want to cancel this sale? (y/N): ").strip().lower()
+            confirm = prompt("\n⚠️  Are you sure you want to cancel this sale? (y/N): ").strip().lower()
 
             if confirm == 'y':
                 if self.sales_service.cancel_sale(sale_id):
@@ -285,7 +294,7 @@ class SalesMenu:
         except Exception as e:
             print(f"❌ Error cancelling sale: {e}")
 
-        input("\nPress Enter to continue...")
+        prompt("\nPress Enter to continue...")
 
     def sales_summary(self):
         """View sales summary"""
@@ -333,7 +342,7 @@ class SalesMenu:
         except Exception as e:
             print(f"❌ Error retrieving sales summary: {e}")
 
-        input("\nPress Enter to continue...")
+        prompt("\nPress Enter to continue...")
 
     def print_receipt(self, sale_id):
         """Print a receipt for a sale"""
@@ -352,17 +361,17 @@ class SalesMenu:
                 print(f"Customer: {sale.customer.full_name}")
             print("-" * 50)
 
-            if sale.items:
-                for sale_item in sale.items:
+            if sale.sale_items:
+                for sale_item in sale.sale_items:
                     item = sale_item.item
                     print(f"{item.name[:30]:<30} {sale_item.quantity:>3} x ${sale_item.unit_price:>6.2f} = ${sale_item.total_price:>8.2f}")
 
             print("-" * 50)
-            print(f"{'Subtotal:':<40} KES{sale.subtotal:>8.2f}")
-            if sale.discount > 0:
-                print(f"{'Discount:':<40} -KES{sale.discount:>7.2f}")
-            if sale.tax > 0:
-                print(f"{'Tax:':<40} KES{sale.tax:>8.2f}")
+            print(f"{'Subtotal:':<40} KES{sale.total_amount:>8.2f}")
+            if sale.discount_amount:
+                print(f"{'Discount:':<40} -KES{sale.discount_amount:>7.2f}")
+            if sale.tax_amount:
+                print(f"{'Tax:':<40} KES{sale.tax_amount:>8.2f}")
             print(f"{'TOTAL:':<40} KES{sale.final_total:>8.2f}")
             print("=" * 50)
             print("         Thank you for your purchase!")
@@ -381,17 +390,17 @@ class SalesMenu:
                 choice = self.get_user_choice()
 
                 if choice == '1':
-                    self.new_sale()
+                    run_workflow(self.new_sale)
                 elif choice == '2':
-                    self.view_all_sales()
+                    run_workflow(self.view_all_sales)
                 elif choice == '3':
-                    self.view_sale_details()
+                    run_workflow(self.view_sale_details)
                 elif choice == '4':
-                    self.cancel_sale()
+                    run_workflow(self.cancel_sale)
                 elif choice == '5':
-                    self.sales_summary()
+                    run_workflow(self.sales_summary)
                 elif choice == '6':
                     break
             except Exception as e:
                 print(f"❌ An error occurred: {e}")
-                input("Press Enter to continue...")
\ No newline at end of file
+                prompt("Press Enter to continue...")
\ No newline at end of file
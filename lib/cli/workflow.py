@@ -0,0 +1,21 @@
+from lib.models.base import unit_of_work
+from lib.services.tracing import tracer
+
+
+def run_workflow(action, *args):
+    """Run a menu action inside one unit of work named after it
+
+    Every service call the action makes shares a single session, so
+    repeated lookups come from the identity map and returned objects stay
+    attached until the action finishes. With tracing on, the action's
+    latency is recorded under the same name.
+    """
+    with unit_of_work(action.__qualname__):
+        return tracer.call('action', action.__qualname__, action, *args)
+
+
+def prompt(message=''):
+    """Read a line from the user; with tracing on, the wait is not counted
+    against the menu action that asked"""
+    with tracer.waiting():
+        return input(message)
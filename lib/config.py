@@ -0,0 +1,79 @@
+import os
+
+DEFAULT_DATABASE_URL = 'sqlite:///thrift_store.db'
+
+
+def _env_int(name, default):
+    """Read an integer setting from the environment"""
+    value = os.environ.get(name)
+    return int(value) if value not in (None, '') else default
+
+
+def _env_flag(name, default=False):
+    """Read a true/false setting from the environment"""
+    value = os.environ.get(name)
+    if value in (None, ''):
+        return default
+    return value.strip().lower() in ('1', 'true', 'yes', 'on')
+
+
+def get_database_config():
+    """Get database engine settings, overridable with THRIFTSTORE_* variables"""
+    return {
+        'url': os.environ.get('THRIFTSTORE_DATABASE_URL', DEFAULT_DATABASE_URL),
+        # Defaults to 'url' with its asyncio driver, e.g. sqlite+aiosqlite
+        'async_url': os.environ.get('THRIFTSTORE_ASYNC_DATABASE_URL'),
+        'echo': _env_flag('THRIFTSTORE_SQL_ECHO'),
+        'pool_size': _env_int('THRIFTSTORE_POOL_SIZE', 5),
+        'max_overflow': _env_int('THRIFTSTORE_MAX_OVERFLOW', 10),
+        'pool_timeout': _env_int('THRIFTSTORE_POOL_TIMEOUT', 30),
+        'pool_recycle': _env_int('THRIFTSTORE_POOL_RECYCLE', 3600),
+        # Attach the query profiler (lib/models/profiler.py) to the engine
+        'profile': _env_flag('THRIFTSTORE_PROFILE'),
+        # Applied to every new SQLite connection
+        'sqlite_pragmas': {
+            'journal_mode': os.environ.get('THRIFTSTORE_SQLITE_JOURNAL_MODE', 'WAL'),
+            'synchronous': os.environ.get('THRIFTSTORE_SQLITE_SYNCHRONOUS', 'NORMAL'),
+            'busy_timeout': _env_int('THRIFTSTORE_SQLITE_BUSY_TIMEOUT', 5000),
+            'cache_size': _env_int('THRIFTSTORE_SQLITE_CACHE_SIZE', -64000),
+            'mmap_size': _env_int('THRIFTSTORE_SQLITE_MMAP_SIZE', 268435456),
+            'temp_store': os.environ.get('THRIFTSTORE_SQLITE_TEMP_STORE', 'MEMORY'),
+        },
+    }
+
+
+def get_cache_config():
+    """Get service read cache settings; THRIFTSTORE_CACHE_SIZE=0 disables it"""
+    return {
+        'max_entries': _env_int('THRIFTSTORE_CACHE_SIZE', 256),
+        'default_ttl': _env_int('THRIFTSTORE_CACHE_TTL', 30),
+    }
+
+
+def get_profiling_config():
+    """Get query profiler settings; profiling itself is enabled with THRIFTSTORE_PROFILE"""
+    return {
+        # Every statement is appended to this JSONL file when set
+        'log_path': os.environ.get('THRIFTSTORE_PROFILE_LOG'),
+        'slow_query_ms': _env_int('THRIFTSTORE_SLOW_QUERY_MS', 100),
+        # The same statement run more often than this in one workflow is an N+1
+        'n_plus_one_threshold': _env_int('THRIFTSTORE_N_PLUS_ONE_THRESHOLD', 10),
+        'summary_on_exit': _env_flag('THRIFTSTORE_PROFILE_SUMMARY', True),
+    }
+
+
+def get_tracing_config():
+    """Get latency tracing settings; tracing can also be toggled from Diagnostics"""
+    return {
+        'enabled': _env_flag('THRIFTSTORE_TRACE'),
+    }
+
+
+def get_api_config():
+    """Get HTTP API server settings"""
+    return {
+        'host': os.environ.get('THRIFTSTORE_API_HOST', '127.0.0.1'),
+        'port': _env_int('THRIFTSTORE_API_PORT', 8080),
+        # Seconds an idle keep-alive connection is held open
+        'keep_alive_timeout': _env_int('THRIFTSTORE_API_KEEP_ALIVE', 30),
+    }
@@ -3,5 +3,8 @@ from .item import Item
 from .customer import Customer
 from .sale import Sale
 from .sale_item import SaleItem
+from .daily_sales_rollup import DailySalesRollup
+from .customer_stats import CustomerStats
+from . import search
 
-__all__ = ['Base', 'Item', 'Customer', 'Sale', 'SaleItem']
+__all__ = ['Base', 'Item', 'Customer', 'Sale', 'SaleItem', 'DailySalesRollup', 'CustomerStats']
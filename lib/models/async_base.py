@@ -0,0 +1,69 @@
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from lib.config import get_database_config
+from .base import _apply_sqlite_pragmas
+
+# asyncio drivers for the synchronous URLs the application is configured with
+ASYNC_DRIVERS = {
+    'sqlite': 'aiosqlite',
+    'postgresql': 'asyncpg',
+    'mysql': 'aiomysql',
+}
+
+
+def get_async_url(url):
+    """Swap a database URL's driver for its asyncio counterpart"""
+    url = make_url(url)
+    backend = url.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No asyncio driver known for '{backend}' databases")
+    return url.set(drivername=f"{backend}+{ASYNC_DRIVERS[backend]}")
+
+
+def build_async_engine(config=None):
+    """Create an asyncio engine for the configured database"""
+    config = config or get_database_config()
+    url = make_url(config.get('async_url') or get_async_url(config['url']))
+    options = {'echo': config['echo']}
+
+    if not (url.get_backend_name() == 'sqlite' and url.database in (None, '', ':memory:')):
+        options.update(
+            pool_size=config['pool_size'],
+            max_overflow=config['max_overflow'],
+            pool_timeout=config['pool_timeout'],
+            pool_recycle=config['pool_recycle'],
+            pool_pre_ping=True
+        )
+
+    engine = create_async_engine(url, **options)
+    if url.get_backend_name() == 'sqlite':
+        _apply_sqlite_pragmas(engine.sync_engine, config['sqlite_pragmas'])
+    if config.get('profile'):
+        from lib.models.profiler import enable_profiling
+        enable_profiling(engine.sync_engine)
+    return engine
+
+
+# Create asyncio engine; no connection is made until first use
+async_engine = build_async_engine()
+
+# Objects stay loaded after commit, since lazy loads cannot run outside await
+AsyncSession = async_sessionmaker(bind=async_engine, expire_on_commit=False)
+
+def get_async_session():
+    """Get a new asyncio database session"""
+    return AsyncSession()
+
+async def configure_async_engine(url=None, **overrides):
+    """Replace the asyncio engine, e.g. to point it at another database"""
+    global async_engine
+    config = get_database_config()
+    if url is not None:
+        config['url'] = url
+        config['async_url'] = None
+    config.update(overrides)
+
+    await async_engine.dispose()
+    async_engine = build_async_engine(config)
+    AsyncSession.configure(bind=async_engine)
+    return async_engine
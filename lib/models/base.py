@@ -1,9 +1,53 @@
-from sqlalchemy import create_engine
+from contextlib import contextmanager
+from contextvars import ContextVar
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from lib.config import get_database_config
+
+
+def _apply_sqlite_pragmas(engine, pragmas):
+    """Run the configured PRAGMAs on every new SQLite connection"""
+    @event.listens_for(engine, "connect")
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                if value is not None:
+                    cursor.execute(f"PRAGMA {name}={value}")
+        finally:
+            cursor.close()
+
+
+def build_engine(config=None):
+    """Create a database engine from configuration"""
+    config = config or get_database_config()
+    url = make_url(config['url'])
+    options = {'echo': config['echo']}
+
+    # In-memory SQLite uses a single shared connection, so pool sizing
+    # only applies to file-backed and server databases
+    if not (url.get_backend_name() == 'sqlite' and url.database in (None, '', ':memory:')):
+        options.update(
+            pool_size=config['pool_size'],
+            max_overflow=config['max_overflow'],
+            pool_timeout=config['pool_timeout'],
+            pool_recycle=config['pool_recycle'],
+            pool_pre_ping=True
+        )
+
+    engine = create_engine(url, **options)
+    if url.get_backend_name() == 'sqlite':
+        _apply_sqlite_pragmas(engine, config['sqlite_pragmas'])
+    if config.get('profile'):
+        from lib.models.profiler import enable_profiling
+        enable_profiling(engine)
+    return engine
+
 
 # Create database engine
-engine = create_engine('sqlite:///thrift_store.db', echo=False)
+engine = build_engine()
 
 # Create base class for all models
 Base = declarative_base()
@@ -11,10 +55,139 @@ Base = declarative_base()
 # Create session factory
 Session = sessionmaker(bind=engine)
 
+_current_unit = ContextVar('unit_of_work', default=None)
+
+
+class _UnitSession:
+    """Session handle handed to services inside a unit of work
+
+    Services keep their usual commit/rollback/close calls. In an atomic unit
+    commit only flushes so the unit commits once at the end; otherwise each
+    commit is real. Close never ends the session, it only releases the
+    connection between steps, so the identity map lasts the whole workflow.
+    """
+
+    def __init__(self, unit):
+        self._unit = unit
+        self._session = unit.session
+
+    def commit(self):
+        if self._unit.atomic:
+            self._session.flush()
+        else:
+            self._session.commit()
+
+    def rollback(self):
+        self._session.rollback()
+
+    def close(self):
+        if self._unit.atomic:
+            return
+        # End the transaction without expiring loaded objects, so a read
+        # snapshot is never held open while the workflow waits for input
+        try:
+            self._session.commit()
+        except Exception:
+            self._session.rollback()
+            raise
+
+    def __getattr__(self, name):
+        return getattr(self._session, name)
+
+
+class UnitOfWork:
+    """One session shared by every service call made during a workflow"""
+
+    def __init__(self, name=None, atomic=False, session=None):
+        self.name = name
+        self.atomic = atomic
+        self.owns_session = session is None
+        self.session = Session(expire_on_commit=False) if session is None else session
+        self.handle = _UnitSession(self)
+        self._callbacks = []
+
+    def commit(self):
+        self.session.commit()
+
+    def rollback(self):
+        self.session.rollback()
+
+    def after_end(self, callback):
+        """Run ``callback`` once the unit of work has committed or rolled back"""
+        self._callbacks.append(callback)
+
+
+@contextmanager
+def unit_of_work(name=None, atomic=False, session=None):
+    """Share one session across the service calls made inside the block
+
+    ``name`` labels the workflow (e.g. "ItemMenu.edit_item"). With
+    ``atomic=True`` service commits become flushes and everything commits
+    together when the block exits, or rolls back if it raises. Nested
+    blocks join the unit that is already open; a nested block asking for
+    ``atomic=True`` inside a non-atomic unit raises RuntimeError instead,
+    as joining would silently commit its steps one by one. A unit built on
+    an existing ``session`` leaves the final commit and close to that
+    session's owner.
+    """
+    unit = _current_unit.get()
+    if unit is not None:
+        if atomic and not unit.atomic:
+            raise RuntimeError(
+                f"{name or 'This block'} needs an atomic unit of work but is nested in "
+                f"non-atomic {unit.name or 'unit of work'}; open the outer unit with atomic=True"
+            )
+        yield unit
+        return
+
+    unit = UnitOfWork(name, atomic, session)
+    token = _current_unit.set(unit)
+    try:
+        yield unit
+        if unit.owns_session:
+            unit.commit()
+    except BaseException:
+        unit.rollback()
+        raise
+    finally:
+        _current_unit.reset(token)
+        if unit.owns_session:
+            unit.session.close()
+        for callback in unit._callbacks:
+            callback()
+
+def current_unit_of_work():
+    """Get the unit of work open in this context, if any"""
+    return _current_unit.get()
+
+def after_unit_of_work(callback):
+    """Defer ``callback`` until the current unit of work ends; False if none is open"""
+    unit = _current_unit.get()
+    if unit is None:
+        return False
+    unit.after_end(callback)
+    return True
+
 def get_session():
-    """Get a new database session"""
+    """Get the current unit of work's session, or a new database session"""
+    unit = _current_unit.get()
+    if unit is not None:
+        return unit.handle
     return Session()
 
+def configure_engine(url=None, **overrides):
+    """Replace the engine, e.g. to point the application at another database"""
+    global engine
+    config = get_database_config()
+    if url is not None:
+        config['url'] = url
+    config.update(overrides)
+
+    engine.dispose()
+    engine = build_engine(config)
+    Session.configure(bind=engine)
+    return engine
+
 def create_tables():
     """Create all tables in the database"""
-    Base.metadata.create_all(engine)
\ No newline at end of file
+    Base.metadata.create_all(engine)
@@ -0,0 +1,28 @@
+from sqlalchemy import Column, Integer, DateTime, ForeignKey, Index
+from .base import Base
+from .money import Money, MoneyType
+
+class CustomerStats(Base):
+    __tablename__ = 'customer_stats'
+
+    customer_id = Column(Integer, ForeignKey('customers.id'), primary_key=True)
+    order_count = Column(Integer, nullable=False, default=0)
+    total_spent = Column(MoneyType, nullable=False, default=Money(0))
+    first_purchase = Column(DateTime)
+    last_purchase = Column(DateTime)
+
+    __table_args__ = (
+        Index('ix_customer_stats_total_spent', 'total_spent', 'customer_id'),
+    )
+
+    def __repr__(self):
+        return f"<CustomerStats(customer_id={self.customer_id}, orders={self.order_count}, spent=KES{self.total_spent})>"
+
+    def to_dict(self):
+        return {
+            'customer_id': self.customer_id,
+            'order_count': self.order_count,
+            'total_spent': self.total_spent,
+            'first_purchase': self.first_purchase.strftime('%Y-%m-%d %H:%M') if self.first_purchase else None,
+            'last_purchase': self.last_purchase.strftime('%Y-%m-%d %H:%M') if self.last_purchase else None
+        }
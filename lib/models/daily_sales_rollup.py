@@ -0,0 +1,30 @@
+from sqlalchemy import Column, Integer, Date
+from .base import Base
+from .money import Money, MoneyType
+
+class DailySalesRollup(Base):
+    __tablename__ = 'daily_sales_rollup'
+
+    sale_date = Column(Date, primary_key=True)
+    sale_count = Column(Integer, nullable=False, default=0)
+    gross_amount = Column(MoneyType, nullable=False, default=Money(0))
+    tax_amount = Column(MoneyType, nullable=False, default=Money(0))
+    discount_amount = Column(MoneyType, nullable=False, default=Money(0))
+    net_amount = Column(MoneyType, nullable=False, default=Money(0))
+    item_units = Column(Integer, nullable=False, default=0)
+    cost_of_goods = Column(MoneyType, nullable=False, default=Money(0))
+
+    def __repr__(self):
+        return f"<DailySalesRollup(date='{self.sale_date}', sales={self.sale_count}, net=KES{self.net_amount})>"
+
+    def to_dict(self):
+        return {
+            'sale_date': self.sale_date.strftime('%Y-%m-%d') if self.sale_date else None,
+            'sale_count': self.sale_count,
+            'gross_amount': self.gross_amount,
+            'tax_amount': self.tax_amount,
+            'discount_amount': self.discount_amount,
+            'net_amount': self.net_amount,
+            'item_units': self.item_units,
+            'cost_of_goods': self.cost_of_goods
+        }
@@ -1,7 +1,8 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, Text, Boolean
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, DateTime, Text, Boolean, Index
+from sqlalchemy.orm import relationship, validates
 from datetime import datetime
 from .base import Base
+from .money import Money, MoneyType
 
 class Item(Base):
     __tablename__ = 'items'
@@ -10,8 +11,8 @@ class Item(Base):
     name = Column(String(200), nullable=False)
     description = Column(Text)
     category = Column(String(100), nullable=False)
-    price = Column(Float, nullable=False)
-    cost = Column(Float, default=0.0)
+    price = Column(MoneyType, nullable=False)
+    cost = Column(MoneyType, default=Money(0))
     quantity = Column(Integer, default=1)
     condition = Column(String(50), default='Good')  # New, Excellent, Good, Fair, Poor
     size = Column(String(20))  # For clothing items
@@ -21,9 +22,19 @@ class Item(Base):
     date_added = Column(DateTime, default=datetime.utcnow)
     date_sold = Column(DateTime)
 
+    __table_args__ = (
+        Index('ix_items_is_sold_date_added', 'is_sold', 'date_added'),
+        Index('ix_items_category', 'category'),
+        Index('ix_items_unsold_quantity', 'quantity', sqlite_where=is_sold == False),
+    )
+
     # Relationships
     sale_items = relationship("SaleItem", back_populates="item")
 
+    @validates('price', 'cost')
+    def _validate_money(self, key, value):
+        return None if value is None else Money.of(value)
+
     def __repr__(self):
         return f"<Item(id={self.id}, name='{self.name}', price=KES{self.price})>"
 
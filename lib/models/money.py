@@ -0,0 +1,197 @@
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+from numbers import Number
+from sqlalchemy import BigInteger, type_coerce
+from sqlalchemy.types import TypeDecorator
+
+CURRENCY = 'KES'
+MINOR_UNITS = 100
+_CENT = Decimal('0.01')
+
+
+def _to_decimal(value):
+    """Exact decimal for a major-unit amount; floats go through their shortest repr"""
+    if isinstance(value, Money):
+        return value.amount
+    if isinstance(value, float):
+        return Decimal(repr(value))
+    return Decimal(value)
+
+
+class Money:
+    """An exact amount in integer minor units (KES cents)
+
+    Build one from cents with ``Money(1250)`` or from a shilling amount with
+    ``Money.of(12.5)`` / ``Money.of('12.50')``; other amounts are rounded
+    half up to the cent. Adding, subtracting, summing and comparing is
+    integer arithmetic on the cents; plain numbers mixed in are taken as
+    shillings. Formatting works like a number, so ``f"{price:,.2f}"`` keeps
+    working. Values are immutable; arithmetic returns a new Money.
+    """
+
+    __slots__ = ('cents',)
+
+    def __init__(self, cents=0):
+        if not isinstance(cents, int):
+            raise TypeError(f"Money takes integer cents, got {cents!r}; use Money.of() for amounts")
+        object.__setattr__(self, 'cents', cents)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Money is immutable")
+
+    def __reduce__(self):
+        return Money, (self.cents,)
+
+    @classmethod
+    def of(cls, amount):
+        """Money for a shilling amount (number, string or Money), rounded to the cent"""
+        if isinstance(amount, Money):
+            return amount
+        if amount is None or amount == '':
+            raise ValueError("Money amount is required")
+        try:
+            value = _to_decimal(amount)
+        except InvalidOperation:
+            raise ValueError(f"invalid amount {amount!r}")
+        if not value.is_finite():
+            raise ValueError(f"invalid amount {amount!r}")
+        return cls(int((value * MINOR_UNITS).to_integral_value(ROUND_HALF_UP)))
+
+    @property
+    def amount(self):
+        """The amount in shillings as an exact Decimal"""
+        return Decimal(self.cents) / MINOR_UNITS
+
+    # Arithmetic
+
+    def __add__(self, other):
+        if isinstance(other, Money):
+            return Money(self.cents + other.cents)
+        if isinstance(other, (Number, str)):
+            return Money(self.cents + Money.of(other).cents)
+        return NotImplemented
+
+    __radd__ = __add__
+
+    def __sub__(self, other):
+        if isinstance(other, Money):
+            return Money(self.cents - other.cents)
+        if isinstance(other, (Number, str)):
+            return Money(self.cents - Money.of(other).cents)
+        return NotImplemented
+
+    def __rsub__(self, other):
+        if isinstance(other, (Number, str)):
+            return Money(Money.of(other).cents - self.cents)
+        return NotImplemented
+
+    def __mul__(self, factor):
+        if isinstance(factor, int) and not isinstance(factor, bool):
+            return Money(self.cents * factor)
+        if isinstance(factor, Number) and not isinstance(factor, Money):
+            return Money(int((Decimal(self.cents) * _to_decimal(factor)).to_integral_value(ROUND_HALF_UP)))
+        return NotImplemented
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, other):
+        """Money / Money is a plain ratio; Money / number is Money, rounded to the cent"""
+        if isinstance(other, Money):
+            return self.cents / other.cents
+        if isinstance(other, Number):
+            return Money(int((Decimal(self.cents) / _to_decimal(other)).to_integral_value(ROUND_HALF_UP)))
+        return NotImplemented
+
+    def __neg__(self):
+        return Money(-self.cents)
+
+    def __pos__(self):
+        return self
+
+    def __abs__(self):
+        return Money(abs(self.cents))
+
+    # Comparison
+
+    def _compare_cents(self, other):
+        if isinstance(other, Money):
+            return other.cents
+        if isinstance(other, Number):
+            return _to_decimal(other) * MINOR_UNITS
+        return None
+
+    def __eq__(self, other):
+        cents = self._compare_cents(other)
+        return NotImplemented if cents is None else self.cents == cents
+
+    def __lt__(self, other):
+        cents = self._compare_cents(other)
+        return NotImplemented if cents is None else self.cents < cents
+
+    def __le__(self, other):
+        cents = self._compare_cents(other)
+        return NotImplemented if cents is None else self.cents <= cents
+
+    def __gt__(self, other):
+        cents = self._compare_cents(other)
+        return NotImplemented if cents is None else self.cents > cents
+
+    def __ge__(self, other):
+        cents = self._compare_cents(other)
+        return NotImplemented if cents is None else self.cents >= cents
+
+    def __hash__(self):
+        # Equal to the number it compares equal to, e.g. hash(Money(1250)) == hash(12.5)
+        return hash(self.amount)
+
+    def __bool__(self):
+        return self.cents != 0
+
+    # Conversion
+
+    def __float__(self):
+        return self.cents / MINOR_UNITS
+
+    def __format__(self, spec):
+        return format(self.amount, spec) if spec else str(self)
+
+    def __str__(self):
+        return f"{self.amount:.2f}"
+
+    def __repr__(self):
+        return f"Money('{self}')"
+
+
+def json_default(value):
+    """``json.dumps`` fallback: Money as a number of shillings, anything else as text"""
+    if isinstance(value, Money):
+        return float(value)
+    return str(value)
+
+
+class MoneyType(TypeDecorator):
+    """Column type storing Money as integer minor units
+
+    Plain numbers bound to it are taken as shillings, so filters such as
+    ``Item.price >= 100`` and literals like ``coalesce(Item.cost, 0)`` are
+    converted to cents too. SUM/MIN/MAX over these columns keep the type and
+    come back as Money.
+    """
+
+    impl = BigInteger
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        return Money.of(value).cents
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        # SUM may come back as a Decimal or, on REAL columns, a float
+        return Money(int(round(value)))
+
+
+def as_money(expression):
+    """Type an arithmetic SQL expression over money columns as Money"""
+    return type_coerce(expression, MoneyType())
@@ -0,0 +1,322 @@
+import atexit
+import heapq
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from contextvars import ContextVar
+from datetime import datetime
+from weakref import WeakKeyDictionary
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from lib.config import get_profiling_config
+from lib.models import base
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+SERVICES_DIR = os.path.join(PROJECT_ROOT, 'lib', 'services') + os.sep
+MODELS_DIR = os.path.join(PROJECT_ROOT, 'lib', 'models') + os.sep
+MAX_SLOW_QUERIES = 50
+NO_SERVICE = '(no service)'
+
+# Statements executed inside an ORM select whose rows are still being counted
+_pending = ContextVar('profiler_pending', default=None)
+_names = {}
+
+
+def _qualified_name(frame):
+    """Name a frame's function as Class.method where the class can be found"""
+    code = frame.f_code
+    name = _names.get(code)
+    if name is not None:
+        return name
+
+    name = getattr(code, 'co_qualname', None)
+    if name is None:
+        # Before Python 3.11 the class has to be found among the module's globals
+        name = code.co_name
+        module = frame.f_globals.get('__name__')
+        for value in list(frame.f_globals.values()):
+            if isinstance(value, type) and value.__module__ == module:
+                func = value.__dict__.get(code.co_name)
+                func = getattr(func, '__func__', func)
+                while func is not None and getattr(func, '__code__', None) is not code:
+                    func = getattr(func, '__wrapped__', None)
+                if func is not None:
+                    name = f"{value.__name__}.{code.co_name}"
+                    break
+    _names[code] = name
+    return name
+
+
+def _call_origin():
+    """Find the service method that issued the current statement and its caller
+
+    Returns the service's qualified name (or NO_SERVICE) and the
+    ``path:line`` of the first application frame outside the service and
+    model layers, e.g. the menu action or API handler.
+    """
+    service = helper = None
+    call_site = None
+    frame = sys._getframe(2)
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if filename.startswith(SERVICES_DIR):
+            name = _qualified_name(frame)
+            # Prefer Class.method over helpers such as keyset_page or cache wrappers
+            if service is None and '.' in name and '<' not in name:
+                service = name
+            helper = helper or name
+        elif filename.startswith(MODELS_DIR):
+            # Schema checks and unit-of-work commits run without a service
+            if filename != __file__:
+                helper = helper or _qualified_name(frame)
+        elif filename.startswith(PROJECT_ROOT) and not filename.startswith(MODELS_DIR):
+            call_site = f"{os.path.relpath(filename, PROJECT_ROOT)}:{frame.f_lineno}"
+            break
+        frame = frame.f_back
+    return service or helper or NO_SERVICE, call_site
+
+
+class QueryProfiler:
+    """Per-statement timings, row counts and call sites for an engine
+
+    Statements are aggregated per service method, the slowest ones are kept
+    with their call sites, and a statement repeated more than the N+1
+    threshold within one unit of work is reported against that workflow.
+    Row counts for ORM selects come from buffering the result, which the
+    profiler skips for streamed (yield_per) queries.
+    """
+
+    def __init__(self, slow_query_ms=100, n_plus_one_threshold=10, log_path=None):
+        self.slow_query_seconds = slow_query_ms / 1000
+        self.n_plus_one_threshold = n_plus_one_threshold
+        self.log_path = log_path
+        self._lock = threading.Lock()
+        self._log = None
+        self._workflows = WeakKeyDictionary()
+        self.reset()
+
+    def reset(self):
+        """Forget everything recorded so far"""
+        with self._lock:
+            self.statements = {}
+            self.slow_queries = []
+            self.n_plus_one = []
+            self.started = time.time()
+
+    # Event handlers
+
+    def attach(self, engine):
+        """Listen to an engine's cursor events"""
+        event.listen(engine, 'before_cursor_execute', self._before_cursor_execute)
+        event.listen(engine, 'after_cursor_execute', self._after_cursor_execute)
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault('profiler_started', []).append(time.perf_counter())
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        seconds = time.perf_counter() - conn.info['profiler_started'].pop()
+        service, call_site = _call_origin()
+        unit = base.current_unit_of_work()
+        entry = {
+            'statement': statement,
+            'seconds': seconds,
+            'rows': cursor.rowcount if cursor.rowcount >= 0 else None,
+            'executemany': executemany,
+            'service': service,
+            'call_site': call_site,
+            'workflow': unit.name if unit is not None else None,
+            '_unit': unit
+        }
+        pending = _pending.get()
+        if pending is not None:
+            pending.append(entry)
+        else:
+            self.record(entry)
+
+    def _do_orm_execute(self, state):
+        """Buffer ORM select results so their rows can be counted"""
+        options = state.execution_options
+        if not state.is_select or options.get('yield_per') or options.get('stream_results'):
+            return None
+
+        pending = []
+        token = _pending.set(pending)
+        started = time.perf_counter()
+        try:
+            frozen = state.invoke_statement().freeze()
+        except Exception:
+            for entry in pending:
+                self.record(entry)
+            raise
+        finally:
+            _pending.reset(token)
+
+        if pending:
+            # Time spent fetching and loading the rows counts towards the select
+            pending[0]['seconds'] = time.perf_counter() - started
+            pending[0]['rows'] = len(frozen.data)
+        for entry in pending:
+            self.record(entry)
+        return frozen()
+
+    # Recording
+
+    def record(self, entry):
+        """Aggregate one executed statement"""
+        unit = entry.pop('_unit', None)
+        key = (entry['service'], entry['statement'])
+        with self._lock:
+            stats = self.statements.get(key)
+            if stats is None:
+                stats = self.statements[key] = {'calls': 0, 'seconds': 0.0, 'max_seconds': 0.0,
+                                                'rows': 0, 'call_sites': Counter()}
+            stats['calls'] += 1
+            stats['seconds'] += entry['seconds']
+            stats['max_seconds'] = max(stats['max_seconds'], entry['seconds'])
+            stats['rows'] += entry['rows'] or 0
+            if entry['call_site']:
+                stats['call_sites'][entry['call_site']] += 1
+
+            if entry['seconds'] >= self.slow_query_seconds:
+                slow = (entry['seconds'], id(entry), entry)
+                if len(self.slow_queries) < MAX_SLOW_QUERIES:
+                    heapq.heappush(self.slow_queries, slow)
+                else:
+                    heapq.heappushpop(self.slow_queries, slow)
+
+            if unit is not None:
+                counts = self._workflows.get(unit)
+                if counts is None:
+                    counts = self._workflows[unit] = Counter()
+                    unit.after_end(lambda unit=unit: self._end_workflow(unit))
+                counts[key] += 1
+
+        self._write({'type': 'query', **entry})
+
+    def _end_workflow(self, unit):
+        """Report statements the finished workflow repeated past the N+1 threshold"""
+        with self._lock:
+            counts = self._workflows.pop(unit, None) or {}
+            found = [
+                {'workflow': unit.name, 'service': service, 'statement': statement, 'count': count}
+                for (service, statement), count in counts.items() if count > self.n_plus_one_threshold
+            ]
+            self.n_plus_one.extend(found)
+        for pattern in found:
+            self._write({'type': 'n_plus_one', **pattern})
+
+    def _write(self, entry):
+        if not self.log_path:
+            return
+        with self._lock:
+            if self._log is None:
+                self._log = open(self.log_path, 'a', encoding='utf-8')
+            entry['time'] = datetime.now().isoformat(timespec='milliseconds')
+            self._log.write(json.dumps(entry, default=str) + '\n')
+            self._log.flush()
+
+    # Reporting
+
+    def summary(self, top=20):
+        """Totals per service method, the slowest statements and N+1 patterns"""
+        with self._lock:
+            services = {}
+            for (service, _), stats in self.statements.items():
+                totals = services.setdefault(service, {'service': service, 'queries': 0, 'seconds': 0.0, 'rows': 0})
+                totals['queries'] += stats['calls']
+                totals['seconds'] += stats['seconds']
+                totals['rows'] += stats['rows']
+
+            statements = sorted(self.statements.items(), key=lambda pair: pair[1]['seconds'], reverse=True)
+            return {
+                'since': datetime.fromtimestamp(self.started).isoformat(timespec='seconds'),
+                'queries': sum(stats['calls'] for stats in self.statements.values()),
+                'seconds': sum(stats['seconds'] for stats in self.statements.values()),
+                'services': sorted(services.values(), key=lambda row: row['seconds'], reverse=True),
+                'statements': [
+                    {
+                        'service': service,
+                        'statement': statement,
+                        'calls': stats['calls'],
+                        'seconds': stats['seconds'],
+                        'max_seconds': stats['max_seconds'],
+                        'rows': stats['rows'],
+                        'call_sites': [site for site, _ in stats['call_sites'].most_common(3)]
+                    }
+                    for (service, statement), stats in statements[:top]
+                ],
+                'slow_queries': [entry for _, _, entry in sorted(self.slow_queries, reverse=True)],
+                'n_plus_one': list(self.n_plus_one)
+            }
+
+    def format_summary(self, top=10):
+        """Render the summary as plain-text tables"""
+        from tabulate import tabulate
+
+        summary = self.summary(top)
+        lines = [f"Query profile: {summary['queries']} statements, "
+                 f"{summary['seconds'] * 1000:.1f} ms since {summary['since']}"]
+        if summary['services']:
+            lines.append(tabulate(
+                [[row['service'], row['queries'], f"{row['seconds'] * 1000:.1f}", row['rows']]
+                 for row in summary['services']],
+                headers=['Service', 'Queries', 'Total ms', 'Rows'], tablefmt='simple'
+            ))
+        if summary['slow_queries']:
+            lines.append(f"\nSlow statements (>= {self.slow_query_seconds * 1000:.0f} ms):")
+            lines.append(tabulate(
+                [[f"{entry['seconds'] * 1000:.1f}", entry['service'], entry['call_site'] or '',
+                  _shorten(entry['statement'])] for entry in summary['slow_queries'][:top]],
+                headers=['ms', 'Service', 'Called from', 'Statement'], tablefmt='simple'
+            ))
+        if summary['n_plus_one']:
+            lines.append(f"\nPossible N+1 patterns (> {self.n_plus_one_threshold} runs per workflow):")
+            lines.append(tabulate(
+                [[row['workflow'], row['service'], row['count'], _shorten(row['statement'])]
+                 for row in summary['n_plus_one'][:top]],
+                headers=['Workflow', 'Service', 'Runs', 'Statement'], tablefmt='simple'
+            ))
+        return '\n'.join(lines)
+
+    def close(self):
+        with self._lock:
+            if self._log is not None:
+                self._log.close()
+                self._log = None
+
+
+def _shorten(statement, width=80):
+    statement = ' '.join(statement.split())
+    return statement if len(statement) <= width else statement[:width - 3] + '...'
+
+
+_profiler = None
+
+
+def get_profiler():
+    """Get the process-wide profiler, or None when profiling was never enabled"""
+    return _profiler
+
+
+def enable_profiling(engine):
+    """Attach the process-wide profiler (created on first use) to an engine"""
+    global _profiler
+    if _profiler is None:
+        config = get_profiling_config()
+        _profiler = QueryProfiler(config['slow_query_ms'], config['n_plus_one_threshold'],
+                                  config['log_path'])
+        # Row counting hooks every session, so it is only installed with the profiler
+        event.listen(Session, 'do_orm_execute', _profiler._do_orm_execute)
+        if config['summary_on_exit']:
+            atexit.register(_print_summary, _profiler)
+        atexit.register(_profiler.close)
+    _profiler.attach(engine)
+    return _profiler
+
+
+def _print_summary(profiler):
+    if profiler.statements:
+        print(profiler.format_summary(), file=sys.stderr)
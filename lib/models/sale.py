@@ -1,7 +1,8 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, Text, ForeignKey
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey, Index
+from sqlalchemy.orm import relationship, query_expression, validates
 from datetime import datetime
 from .base import Base
+from .money import Money, MoneyType
 
 class Sale(Base):
     __tablename__ = 'sales'
@@ -9,20 +10,32 @@ class Sale(Base):
     id = Column(Integer, primary_key=True)
     customer_id = Column(Integer, ForeignKey('customers.id'))
     sale_date = Column(DateTime, default=datetime.utcnow)
-    total_amount = Column(Float, nullable=False, default=0.0)
-    tax_amount = Column(Float, default=0.0)
-    discount_amount = Column(Float, default=0.0)
+    total_amount = Column(MoneyType, nullable=False, default=Money(0))
+    tax_amount = Column(MoneyType, default=Money(0))
+    discount_amount = Column(MoneyType, default=Money(0))
     payment_method = Column(String(50), default='Cash')  # Cash, Card, Check
     status = Column(String(20), default='Completed')  # Pending, Completed, Refunded
     notes = Column(Text)
 
+    __table_args__ = (
+        Index('ix_sales_sale_date', 'sale_date'),
+        Index('ix_sales_customer_id_sale_date', 'customer_id', 'sale_date'),
+    )
+
     # Relationships
     customer = relationship("Customer", back_populates="sales")
     sale_items = relationship("SaleItem", back_populates="sale", cascade="all, delete-orphan")
 
+    # Line count filled in by queries using with_expression(); None otherwise
+    items_count = query_expression()
+
+    @validates('total_amount', 'tax_amount', 'discount_amount')
+    def _validate_money(self, key, value):
+        return None if value is None else Money.of(value)
+
     @property
     def final_total(self):
-        return self.total_amount + self.tax_amount - self.discount_amount
+        return (self.total_amount or Money(0)) + (self.tax_amount or 0) - (self.discount_amount or 0)
 
     def __repr__(self):
         return f"<Sale(id={self.id}, total=KES{self.final_total}, date='{self.sale_date}')>"
@@ -40,5 +53,5 @@ class Sale(Base):
             'payment_method': self.payment_method,
             'status': self.status,
             'notes': self.notes,
-            'items_count': len(self.sale_items)
+            'items_count': self.items_count if self.items_count is not None else len(self.sale_items)
         }
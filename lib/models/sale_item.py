@@ -1,6 +1,7 @@
-from sqlalchemy import Column, Integer, Float, ForeignKey
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, ForeignKey, Index
+from sqlalchemy.orm import relationship, validates
 from .base import Base
+from .money import Money, MoneyType
 
 class SaleItem(Base):
     __tablename__ = 'sale_items'
@@ -9,13 +10,24 @@ class SaleItem(Base):
     sale_id = Column(Integer, ForeignKey('sales.id'), nullable=False)
     item_id = Column(Integer, ForeignKey('items.id'), nullable=False)
     quantity = Column(Integer, nullable=False, default=1)
-    unit_price = Column(Float, nullable=False)
-    total_price = Column(Float, nullable=False)
+    unit_price = Column(MoneyType, nullable=False)
+    total_price = Column(MoneyType, nullable=False)
+    # The item's cost when it was sold, so later cost edits leave old sales alone
+    unit_cost = Column(MoneyType, nullable=True)
+
+    __table_args__ = (
+        Index('ix_sale_items_sale_id_item_id', 'sale_id', 'item_id'),
+        Index('ix_sale_items_item_id', 'item_id'),
+    )
 
     # Relationships
     sale = relationship("Sale", back_populates="sale_items")
     item = relationship("Item", back_populates="sale_items")
 
+    @validates('unit_price', 'total_price', 'unit_cost')
+    def _validate_money(self, key, value):
+        return None if value is None else Money.of(value)
+
     def __repr__(self):
         return f"<SaleItem(sale_id={self.sale_id}, item_id={self.item_id}, qty={self.quantity})>"
 
@@ -27,5 +39,6 @@ class SaleItem(Base):
             'item_name': self.item.name if self.item else 'Unknown',
             'quantity': self.quantity,
             'unit_price': self.unit_price,
-            'total_price': self.total_price
+            'total_price': self.total_price,
+            'unit_cost': self.unit_cost
         }
\ No newline at end of file
@@ -0,0 +1,72 @@
+import os
+from sqlalchemy import inspect
+from . import base
+
+# Latest Alembic revision, checked first so a current database needs no
+# Alembic import; the migration scripts are consulted when it differs
+HEAD_REVISION = 'b7a1c04e9d52'
+# Revision matching the schema create_tables() made before migrations were tracked
+BASELINE_REVISION = '03a5bfa5151f'
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def get_schema_revision():
+    """Get the database's Alembic revision and whether it has any tables"""
+    with base.engine.connect() as connection:
+        inspector = inspect(connection)
+        if not inspector.has_table('alembic_version'):
+            return None, inspector.has_table('items')
+        revision = connection.exec_driver_sql("SELECT version_num FROM alembic_version").scalar()
+        return revision, True
+
+
+def get_alembic_config():
+    """Alembic configuration for the project's migrations"""
+    # Alembic is only imported when the schema actually needs work
+    from alembic.config import Config
+
+    config = Config(os.path.join(PROJECT_ROOT, 'alembic.ini'))
+    config.set_main_option('script_location', os.path.join(PROJECT_ROOT, 'migrations'))
+    config.attributes['configure_logger'] = False
+    return config
+
+
+def get_head_revision():
+    """The newest revision among the migration scripts"""
+    from alembic.script import ScriptDirectory
+
+    return ScriptDirectory.from_config(get_alembic_config()).get_current_head()
+
+
+def upgrade_schema(revision='head', stamp=None):
+    """Run the Alembic migrations against the application's engine
+
+    ``stamp`` first records an unversioned database as being at that
+    revision, so only the migrations after it run.
+    """
+    from alembic import command
+
+    config = get_alembic_config()
+    with base.engine.begin() as connection:
+        config.attributes['connection'] = connection
+        if stamp:
+            command.stamp(config, stamp)
+        command.upgrade(config, revision)
+
+
+def ensure_schema():
+    """Check the schema version and migrate only when it is behind
+
+    Returns 'current', 'upgraded' or 'created'. A database made by
+    create_tables() before migrations were tracked is stamped at the
+    baseline revision and taken through every migration after it.
+    """
+    revision, has_tables = get_schema_revision()
+    if revision == HEAD_REVISION or (revision is not None and revision == get_head_revision()):
+        return 'current'
+    if revision is None and has_tables:
+        upgrade_schema(stamp=BASELINE_REVISION)
+        return 'upgraded'
+    upgrade_schema()
+    return 'upgraded' if revision else 'created'
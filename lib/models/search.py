@@ -0,0 +1,83 @@
+import re
+from sqlalchemy import event, select, table, column, text
+from .item import Item
+from .customer import Customer
+
+# External-content FTS5 indexes kept in sync with their source tables by
+# triggers. Mirrors the statements in the add_fts5_search_indexes migration.
+ITEM_SEARCH_DDL = [
+    """CREATE VIRTUAL TABLE IF NOT EXISTS items_fts USING fts5(
+        name, category, brand,
+        content='items', content_rowid='id', prefix='2 3'
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS items_fts_ai AFTER INSERT ON items BEGIN
+        INSERT INTO items_fts(rowid, name, category, brand)
+        VALUES (new.id, new.name, new.category, new.brand);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS items_fts_ad AFTER DELETE ON items BEGIN
+        INSERT INTO items_fts(items_fts, rowid, name, category, brand)
+        VALUES ('delete', old.id, old.name, old.category, old.brand);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS items_fts_au AFTER UPDATE OF name, category, brand ON items BEGIN
+        INSERT INTO items_fts(items_fts, rowid, name, category, brand)
+        VALUES ('delete', old.id, old.name, old.category, old.brand);
+        INSERT INTO items_fts(rowid, name, category, brand)
+        VALUES (new.id, new.name, new.category, new.brand);
+    END""",
+    "INSERT INTO items_fts(items_fts, rank) VALUES ('rank', 'bm25(10.0, 2.0, 5.0)')",
+    "INSERT INTO items_fts(items_fts) VALUES ('rebuild')",
+]
+
+CUSTOMER_SEARCH_DDL = [
+    """CREATE VIRTUAL TABLE IF NOT EXISTS customers_fts USING fts5(
+        first_name, last_name, email, phone,
+        content='customers', content_rowid='id', prefix='2 3'
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS customers_fts_ai AFTER INSERT ON customers BEGIN
+        INSERT INTO customers_fts(rowid, first_name, last_name, email, phone)
+        VALUES (new.id, new.first_name, new.last_name, new.email, new.phone);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS customers_fts_ad AFTER DELETE ON customers BEGIN
+        INSERT INTO customers_fts(customers_fts, rowid, first_name, last_name, email, phone)
+        VALUES ('delete', old.id, old.first_name, old.last_name, old.email, old.phone);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS customers_fts_au AFTER UPDATE OF first_name, last_name, email, phone ON customers BEGIN
+        INSERT INTO customers_fts(customers_fts, rowid, first_name, last_name, email, phone)
+        VALUES ('delete', old.id, old.first_name, old.last_name, old.email, old.phone);
+        INSERT INTO customers_fts(rowid, first_name, last_name, email, phone)
+        VALUES (new.id, new.first_name, new.last_name, new.email, new.phone);
+    END""",
+    "INSERT INTO customers_fts(customers_fts, rank) VALUES ('rank', 'bm25(5.0, 5.0, 3.0, 3.0)')",
+    "INSERT INTO customers_fts(customers_fts) VALUES ('rebuild')",
+]
+
+items_fts = table('items_fts', column('rowid'), column('rank'))
+customers_fts = table('customers_fts', column('rowid'), column('rank'))
+
+
+def build_match_query(search_term):
+    """Turn free text into an FTS5 query matching every word as a prefix"""
+    words = re.findall(r'\w+', search_term or '')
+    return ' '.join(f'"{word}"*' for word in words)
+
+
+def match_subquery(fts_table, search_term):
+    """Select matching rowids and their rank, or None if nothing is searchable"""
+    query = build_match_query(search_term)
+    if not query:
+        return None
+    return select(fts_table.c.rowid, fts_table.c.rank).where(
+        text(f"{fts_table.name} MATCH :query").bindparams(query=query)
+    ).subquery()
+
+
+def _install(statements):
+    def create_search_index(target, connection, **kw):
+        if connection.dialect.name == 'sqlite':
+            for statement in statements:
+                connection.exec_driver_sql(statement)
+    return create_search_index
+
+
+event.listen(Item.__table__, 'after_create', _install(ITEM_SEARCH_DDL))
+event.listen(Customer.__table__, 'after_create', _install(CUSTOMER_SEARCH_DDL))
@@ -0,0 +1,215 @@
+from datetime import datetime
+import numpy as np
+from sqlalchemy import Integer, select, func, type_coerce
+from lib.models.base import get_session
+from lib.models.item import Item
+from lib.models.money import Money
+from lib.models.sale import Sale
+from lib.models.sale_item import SaleItem
+from lib.services.item_service import (AGING_BOUNDARIES, LOW_MARGIN_PERCENT, LOW_STOCK_THRESHOLD,
+                                       STALE_AFTER_DAYS, aging_labels)
+from lib.services.cache import cached
+from lib.services.tracing import traced_methods
+
+# Cumulative revenue share closing the A and B classes
+ABC_THRESHOLDS = (0.80, 0.95)
+
+
+def _money(cents):
+    """Money for a cent total coming out of NumPy"""
+    return Money(int(round(cents)))
+
+
+class InventoryArrays:
+    """Columnar snapshot of the inventory, one NumPy array per column
+
+    Prices, costs and revenue are int64 cents, so sums over them are exact.
+    """
+
+    __slots__ = ('price', 'cost', 'quantity', 'is_sold', 'age_days', 'revenue',
+                 'category_codes', 'categories')
+
+    def __init__(self, price, cost, quantity, is_sold, age_days, revenue,
+                 category_codes, categories):
+        self.price = price
+        self.cost = cost
+        self.quantity = quantity
+        self.is_sold = is_sold
+        self.age_days = age_days
+        self.revenue = revenue
+        self.category_codes = category_codes
+        self.categories = categories
+
+    def __len__(self):
+        return len(self.price)
+
+    @property
+    def in_stock(self):
+        """Mask of items that have not been sold"""
+        return ~self.is_sold
+
+    @property
+    def stock_value(self):
+        """Retail value of the units held for each item"""
+        return self.price * self.quantity
+
+
+@traced_methods()
+class AnalyticsService:
+
+    @staticmethod
+    def inventory_query():
+        """Select only the columns the analytics need, with sold revenue per item"""
+        revenue = select(
+            SaleItem.item_id,
+            func.sum(SaleItem.total_price).label('revenue')
+        ).join(Sale, Sale.id == SaleItem.sale_id).where(
+            Sale.status == 'Completed'
+        ).group_by(SaleItem.item_id).subquery()
+
+        # Money columns are read as raw cents for the int64 arrays
+        return select(
+            type_coerce(Item.price, Integer),
+            func.coalesce(type_coerce(Item.cost, Integer), 0),
+            func.coalesce(Item.quantity, 0),
+            Item.is_sold,
+            Item.date_added,
+            Item.category,
+            func.coalesce(type_coerce(revenue.c.revenue, Integer), 0)
+        ).outerjoin(revenue, revenue.c.item_id == Item.id)
+
+    @staticmethod
+    def load_inventory(today=None):
+        """Load the inventory columns into NumPy arrays"""
+        session = get_session()
+        try:
+            rows = session.execute(AnalyticsService.inventory_query()).all()
+        finally:
+            session.close()
+
+        now = today or datetime.now()
+        columns = list(zip(*rows)) if rows else [()] * 7
+        price, cost, quantity, is_sold, date_added, category, revenue = columns
+
+        added = np.array([d or now for d in date_added], dtype='datetime64[D]')
+        age_days = (np.datetime64(now, 'D') - added).astype(np.int64)
+        categories, category_codes = np.unique(
+            np.array([c or 'Uncategorized' for c in category], dtype=str),
+            return_inverse=True
+        )
+
+        return InventoryArrays(
+            price=np.array(price, dtype=np.int64),
+            cost=np.array(cost, dtype=np.int64),
+            quantity=np.array(quantity, dtype=np.int64),
+            is_sold=np.array(is_sold, dtype=bool),
+            age_days=age_days,
+            revenue=np.array(revenue, dtype=np.int64),
+            category_codes=category_codes.ravel(),
+            categories=[str(c) for c in categories]
+        )
+
+    @staticmethod
+    def health_metrics(data, stale_days=STALE_AFTER_DAYS):
+        """Stock counts, value and cost of the unsold inventory"""
+        in_stock = data.in_stock
+        total_value = _money(np.sum(data.stock_value, where=in_stock))
+        total_cost = _money(np.sum(data.cost * data.quantity, where=in_stock))
+        return {
+            'total_items': len(data),
+            'available': int(np.count_nonzero(in_stock & (data.quantity > 0))),
+            'sold': int(np.count_nonzero(data.is_sold)),
+            'low_stock': int(np.count_nonzero(in_stock & (data.quantity <= LOW_STOCK_THRESHOLD))),
+            'out_of_stock': int(np.count_nonzero(in_stock & (data.quantity == 0))),
+            'stale': int(np.count_nonzero(in_stock & (data.age_days > stale_days))),
+            'total_value': total_value,
+            'total_cost': total_cost,
+            'potential_profit': total_value - total_cost
+        }
+
+    @staticmethod
+    def category_breakdown(data):
+        """Unsold item count, stock value and average price per category"""
+        in_stock = data.in_stock
+        codes = data.category_codes[in_stock]
+        size = len(data.categories)
+        counts = np.bincount(codes, minlength=size)
+        values = np.bincount(codes, weights=data.stock_value[in_stock], minlength=size)
+        prices = np.bincount(codes, weights=data.price[in_stock], minlength=size)
+
+        return {
+            name: {
+                'count': int(counts[code]),
+                'value': _money(values[code]),
+                'avg_price': _money(prices[code] / counts[code])
+            }
+            for code, name in enumerate(data.categories) if counts[code]
+        }
+
+    @staticmethod
+    def abc_classes(data, thresholds=ABC_THRESHOLDS):
+        """Pareto classes by sold revenue: A up to 80%, B up to 95%, C the rest"""
+        revenue = np.sort(data.revenue)[::-1]
+        total = revenue.sum()
+
+        # An item's class depends on the share earned by the items ranked above it
+        share_before = (np.cumsum(revenue) - revenue) / total if total > 0 else np.ones_like(revenue)
+        classes = np.digitize(share_before, thresholds)
+        classes[revenue <= 0] = len(thresholds)
+
+        counts = np.bincount(classes, minlength=3)
+        totals = np.bincount(classes, weights=revenue, minlength=3)
+        return [
+            {
+                'class': label,
+                'items': int(counts[index]),
+                'item_share': counts[index] / len(revenue) * 100 if len(revenue) else 0.0,
+                'revenue': _money(totals[index]),
+                'revenue_share': totals[index] / total * 100 if total > 0 else 0.0
+            }
+            for index, label in enumerate('ABC')
+        ]
+
+    @staticmethod
+    def aging_buckets(data, boundaries=AGING_BOUNDARIES):
+        """Unsold item count and stock value per age range"""
+        in_stock = data.in_stock
+        buckets = np.searchsorted(boundaries, data.age_days[in_stock], side='left')
+        size = len(boundaries) + 1
+        counts = np.bincount(buckets, minlength=size)
+        values = np.bincount(buckets, weights=data.stock_value[in_stock], minlength=size)
+
+        return [
+            {'range': label, 'items': int(counts[index]), 'value': _money(values[index])}
+            for index, label in enumerate(aging_labels(boundaries))
+        ]
+
+    @staticmethod
+    def pricing_flags(data, low_margin=LOW_MARGIN_PERCENT):
+        """Count unsold items priced below cost or on a thin margin"""
+        in_stock = data.in_stock & (data.price > 0)
+        below_cost = in_stock & (data.price < data.cost)
+        margin = np.divide(data.price - data.cost, data.price,
+                           out=np.zeros(len(data)), where=data.price > 0) * 100
+        return {
+            'below_cost': int(np.count_nonzero(below_cost)),
+            'low_margin': int(np.count_nonzero(in_stock & ~below_cost & (margin < low_margin)))
+        }
+
+    @staticmethod
+    def inventory_report(today=None):
+        """Health, categories, ABC classes, aging and pricing from one load"""
+        # Resolved here so the date is part of the cache key
+        return AnalyticsService._inventory_report(today or datetime.now().date())
+
+    @staticmethod
+    @cached('items')
+    def _inventory_report(today):
+        data = AnalyticsService.load_inventory(today)
+        return {
+            'health': AnalyticsService.health_metrics(data),
+            'categories': AnalyticsService.category_breakdown(data),
+            'abc': AnalyticsService.abc_classes(data),
+            'aging': AnalyticsService.aging_buckets(data),
+            'pricing': AnalyticsService.pricing_flags(data)
+        }
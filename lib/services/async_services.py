@@ -0,0 +1,282 @@
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from sqlalchemy import inspect
+from lib.models.async_base import get_async_session
+from lib.models.base import Base, unit_of_work
+from lib.models.sale import Sale
+from lib.services.item_service import ItemService
+from lib.services.customer_service import CustomerService
+from lib.services.sales_service import SalesService
+from lib.services.pagination import DEFAULT_PAGE_SIZE
+
+_current_session = ContextVar('async_unit_of_work', default=None)
+
+
+@asynccontextmanager
+async def async_unit_of_work():
+    """Run every async service call made inside the block in one transaction
+
+    Commits when the block exits and rolls back if it raises. Without an
+    open block each call gets its own session and transaction.
+    """
+    session = _current_session.get()
+    if session is not None:
+        yield session
+        return
+
+    async with get_async_session() as session:
+        token = _current_session.set(session)
+        try:
+            yield session
+            await session.commit()
+        except BaseException:
+            await session.rollback()
+            raise
+        finally:
+            _current_session.reset(token)
+
+
+def _plain(value):
+    """Turn ORM instances in a service result into their to_dict()
+
+    Runs inside ``run_sync`` where lazy relationships can still load; once
+    the AsyncSession is done with them the instances are detached, and
+    touching an unloaded relationship would raise. A sale whose lines were
+    loaded also gets them as 'lines', like the API's sale endpoints. Read
+    rows, dicts and scalars are returned as they are.
+    """
+    if isinstance(value, Sale) and 'sale_items' not in inspect(value).unloaded:
+        data = value.to_dict()
+        data['lines'] = [line.to_dict() for line in value.sale_items]
+        return data
+    if isinstance(value, Base):
+        return value.to_dict()
+    if isinstance(value, list):
+        return [_plain(item) for item in value]
+    if type(value) is tuple:
+        return tuple(_plain(item) for item in value)
+    return value
+
+
+async def run_service(method, *args, **kwargs):
+    """Await a synchronous service method on an AsyncSession's connection
+
+    The method runs through ``run_sync`` with its ``get_session()`` calls
+    bound to the AsyncSession, so the SQL and business rules are the
+    synchronous service's own while the driver I/O never blocks the loop.
+    Methods that return model instances give their ``to_dict()`` instead
+    (see _plain), so results are safe to use after the await.
+    """
+    def call(sync_session):
+        with unit_of_work(method.__qualname__, atomic=True, session=sync_session):
+            return _plain(method(*args, **kwargs))
+
+    async with async_unit_of_work() as session:
+        return await session.run_sync(call)
+
+
+class AsyncItemService:
+
+    @staticmethod
+    async def create_item(name, description, category, price, cost=0.0, quantity=1,
+                          condition='Good', size=None, brand=None, color=None):
+        """Create a new item"""
+        return await run_service(ItemService.create_item, name, description, category, price,
+                                 cost=cost, quantity=quantity, condition=condition,
+                                 size=size, brand=brand, color=color)
+
+    @staticmethod
+    async def get_all_items():
+        """Get all items"""
+        return await run_service(ItemService.get_all_items)
+
+    @staticmethod
+    async def get_items_page(after_id=None, before_id=None, page_size=DEFAULT_PAGE_SIZE):
+        """Get one page of items ordered by ID"""
+        return await run_service(ItemService.get_items_page, after_id=after_id,
+                                 before_id=before_id, page_size=page_size)
+
+    @staticmethod
+    async def get_available_items():
+        """Get all available (not sold) items"""
+        return await run_service(ItemService.get_available_items)
+
+    @staticmethod
+    async def get_item_by_id(item_id):
+        """Get item by ID"""
+        return await run_service(ItemService.get_item_by_id, item_id)
+
+    @staticmethod
+    async def search_items(search_term, limit=None):
+        """Search items by name, category, or brand"""
+        return await run_service(ItemService.search_items, search_term, limit=limit)
+
+    @staticmethod
+    async def update_item(item_id, **kwargs):
+        """Update an item"""
+        return await run_service(ItemService.update_item, item_id, **kwargs)
+
+    @staticmethod
+    async def delete_item(item_id):
+        """Delete an item"""
+        return await run_service(ItemService.delete_item, item_id)
+
+    @staticmethod
+    async def mark_as_sold(item_id):
+        """Mark an item as sold"""
+        return await run_service(ItemService.mark_as_sold, item_id)
+
+    @staticmethod
+    async def get_categories():
+        """Get all unique categories"""
+        return await run_service(ItemService.get_categories)
+
+
+class AsyncCustomerService:
+
+    @staticmethod
+    async def create_customer(first_name, last_name, email=None, phone=None,
+                              address=None, city=None, postal_code=None, notes=None):
+        """Create a new customer"""
+        return await run_service(CustomerService.create_customer, first_name, last_name,
+                                 email=email, phone=phone, address=address, city=city,
+                                 postal_code=postal_code, notes=notes)
+
+    @staticmethod
+    async def get_all_customers():
+        """Get all customers"""
+        return await run_service(CustomerService.get_all_customers)
+
+    @staticmethod
+    async def get_customers_page(after_id=None, before_id=None, page_size=DEFAULT_PAGE_SIZE):
+        """Get one page of customers ordered by ID"""
+        return await run_service(CustomerService.get_customers_page, after_id=after_id,
+                                 before_id=before_id, page_size=page_size)
+
+    @staticmethod
+    async def get_customer_by_id(customer_id):
+        """Get customer by ID"""
+        return await run_service(CustomerService.get_customer_by_id, customer_id)
+
+    @staticmethod
+    async def search_customers(search_term, limit=None):
+        """Search customers by name, email, or phone"""
+        return await run_service(CustomerService.search_customers, search_term, limit=limit)
+
+    @staticmethod
+    async def update_customer(customer_id, **kwargs):
+        """Update a customer"""
+        return await run_service(CustomerService.update_customer, customer_id, **kwargs)
+
+    @staticmethod
+    async def delete_customer(customer_id):
+        """Delete a customer"""
+        return await run_service(CustomerService.delete_customer, customer_id)
+
+    @staticmethod
+    async def get_customer_with_sales(customer_id):
+        """Get customer with their sales history"""
+        return await run_service(CustomerService.get_customer_with_sales, customer_id)
+
+    @staticmethod
+    async def get_lifetime_value_table():
+        """Get every buying customer's lifetime value, highest first"""
+        return await run_service(CustomerService.get_lifetime_value_table)
+
+    @staticmethod
+    async def get_customer_segments():
+        """Get count, spend, orders and recent buyers per customer segment"""
+        return await run_service(CustomerService.get_customer_segments)
+
+    @staticmethod
+    async def count_customers():
+        """Count all customers"""
+        return await run_service(CustomerService.count_customers)
+
+
+class AsyncSalesService:
+
+    @staticmethod
+    async def checkout(basket, customer_id=None, payment_method='Cash', tax_amount=0.0,
+                       discount_amount=0.0, notes=None):
+        """Record a completed sale for a whole basket in one transaction"""
+        return await run_service(SalesService.checkout, basket, customer_id=customer_id,
+                                 payment_method=payment_method, tax_amount=tax_amount,
+                                 discount_amount=discount_amount, notes=notes)
+
+    @staticmethod
+    async def create_sale(customer_id=None, payment_method='Cash', tax_rate=0.0,
+                          discount_amount=0.0, notes=None):
+        """Create a new pending sale"""
+        return await run_service(SalesService.create_sale, customer_id=customer_id,
+                                 payment_method=payment_method, tax_rate=tax_rate,
+                                 discount_amount=discount_amount, notes=notes)
+
+    @staticmethod
+    async def add_item_to_sale(sale_id, item_id, quantity=1, custom_price=None):
+        """Add an item to a sale"""
+        return await run_service(SalesService.add_item_to_sale, sale_id, item_id,
+                                 quantity=quantity, custom_price=custom_price)
+
+    @staticmethod
+    async def remove_item_from_sale(sale_id, item_id):
+        """Remove an item from a sale"""
+        return await run_service(SalesService.remove_item_from_sale, sale_id, item_id)
+
+    @staticmethod
+    async def complete_sale(sale_id, tax_rate=0.0):
+        """Complete a sale"""
+        return await run_service(SalesService.complete_sale, sale_id, tax_rate=tax_rate)
+
+    @staticmethod
+    async def cancel_sale(sale_id):
+        """Cancel a sale"""
+        return await run_service(SalesService.cancel_sale, sale_id)
+
+    @staticmethod
+    async def get_all_sales():
+        """Get all sales"""
+        return await run_service(SalesService.get_all_sales)
+
+    @staticmethod
+    async def get_sales_page(after_id=None, before_id=None, page_size=DEFAULT_PAGE_SIZE):
+        """Get one page of sales, newest first"""
+        return await run_service(SalesService.get_sales_page, after_id=after_id,
+                                 before_id=before_id, page_size=page_size)
+
+    @staticmethod
+    async def get_sale_by_id(sale_id):
+        """Get sale by ID with its customer"""
+        return await run_service(SalesService.get_sale_by_id, sale_id)
+
+    @staticmethod
+    async def get_sale_with_details(sale_id):
+        """Get sale by ID with its customer, lines and line items loaded"""
+        return await run_service(SalesService.get_sale_with_details, sale_id)
+
+    @staticmethod
+    async def get_sales_with_details(sale_ids):
+        """Get several sales with customers, lines and line items loaded"""
+        return await run_service(SalesService.get_sales_with_details, sale_ids)
+
+    @staticmethod
+    async def get_sales_by_date_range(start_date, end_date):
+        """Get sales within a date range with customers and lines loaded"""
+        return await run_service(SalesService.get_sales_by_date_range, start_date, end_date)
+
+    @staticmethod
+    async def get_sales_summary():
+        """Get sales summary statistics"""
+        return await run_service(SalesService.get_sales_summary)
+
+    @staticmethod
+    async def get_top_selling_items(limit=10, start_date=None, end_date=None):
+        """Get the best selling items by units sold"""
+        return await run_service(SalesService.get_top_selling_items, limit=limit,
+                                 start_date=start_date, end_date=end_date)
+
+    @staticmethod
+    async def get_category_performance(start_date=None, end_date=None):
+        """Get orders, units, revenue, cost and margin per category"""
+        return await run_service(SalesService.get_category_performance,
+                                 start_date=start_date, end_date=end_date)
@@ -0,0 +1,137 @@
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+from lib.config import get_cache_config
+from lib.models.base import after_unit_of_work
+
+_MISSING = object()
+
+
+class TTLCache:
+    """Size-bounded LRU cache whose entries expire after a per-key TTL
+
+    Keys are tuples whose first element is a namespace ('items', 'sales',
+    ...), so a write can drop every entry that depends on a table at once.
+    """
+
+    def __init__(self, max_entries=256, default_ttl=30.0):
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self._entries = OrderedDict()
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, default=None):
+        """Return a live entry and mark it most recently used"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+            self.misses += 1
+            return default
+
+    def set(self, key, value, ttl=None):
+        """Store a value, evicting the least recently used entries if full"""
+        if self.max_entries <= 0:
+            return
+        ttl = self.default_ttl if ttl is None else ttl
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, *namespaces):
+        """Drop every entry in the given namespaces"""
+        with self._lock:
+            for key in [k for k in self._entries if k[0] in namespaces]:
+                del self._entries[key]
+
+    def clear(self):
+        """Drop every entry and reset the counters"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self):
+        """Get hit/miss counters and the current size"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / lookups if lookups else 0.0
+            }
+
+
+_config = get_cache_config()
+cache = TTLCache(max_entries=_config['max_entries'], default_ttl=_config['default_ttl'])
+
+
+def _fresh(value):
+    """Copy the lists, dicts and sets of a cached result for one caller
+
+    Read rows, Money and plain scalars are immutable, so they are shared;
+    only the containers holding them are rebuilt, so a caller sorting or
+    appending to its result cannot change what the next caller gets.
+    """
+    if isinstance(value, list):
+        return [_fresh(item) for item in value]
+    if isinstance(value, dict):
+        return {key: _fresh(item) for key, item in value.items()}
+    if type(value) is tuple:
+        return tuple(_fresh(item) for item in value)
+    if isinstance(value, set):
+        return set(value)
+    return value
+
+
+def cached(namespace, ttl=None):
+    """Cache a read-only service method's result under ``namespace``
+
+    Every caller gets its own copy of the result's containers (see _fresh).
+    """
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            key = (namespace, func.__qualname__, args, tuple(sorted(kwargs.items())))
+            try:
+                value = cache.get(key, _MISSING)
+            except TypeError:
+                # Unhashable arguments are simply not cached
+                return func(*args, **kwargs)
+            if value is _MISSING:
+                value = func(*args, **kwargs)
+                cache.set(key, _fresh(value), ttl)
+                return value
+            return _fresh(value)
+        return wrapper
+    return decorator
+
+
+def invalidates(*namespaces):
+    """Drop cached reads in ``namespaces`` after a mutating service method runs"""
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            try:
+                return func(*args, **kwargs)
+            finally:
+                cache.invalidate(*namespaces)
+                # Reads later in the same unit of work can cache state that is
+                # not committed yet, so drop the namespaces again when it ends
+                after_unit_of_work(lambda: cache.invalidate(*namespaces))
+        return wrapper
+    return decorator
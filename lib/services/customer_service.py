@@ -1,9 +1,22 @@
+from sqlalchemy import func
+from sqlalchemy.exc import OperationalError
 from lib.models.base import get_session
 from lib.models.customer import Customer
+from lib.models.sale import Sale
+from lib.models.customer_stats import CustomerStats
+from lib.models.money import Money
+from lib.models.search import customers_fts, match_subquery
+from lib.services.read_models import CustomerRow
+from lib.services.pagination import DEFAULT_PAGE_SIZE, keyset_page, iter_keyset
+from lib.services.customer_stats_service import CustomerStatsService
+from lib.services.cache import cached, invalidates
+from lib.services.tracing import traced_methods
 
+@traced_methods()
 class CustomerService:
 
     @staticmethod
+    @invalidates('customers')
     def create_customer(first_name, last_name, email=None, phone=None,
                        address=None, city=None, postal_code=None, notes=None):
         """Create a new customer"""
@@ -30,38 +43,67 @@ class CustomerService:
             session.close()
 
     @staticmethod
+    @cached('customers')
     def get_all_customers():
         """Get all customers"""
         session = get_session()
         try:
-            return session.query(Customer).all()
+            return [CustomerRow.from_row(row) for row in session.query(*CustomerRow.columns())]
         finally:
             session.close()
 
+    @staticmethod
+    def get_customers_page(after_id=None, before_id=None, page_size=DEFAULT_PAGE_SIZE):
+        """Get one page of customers ordered by ID"""
+        session = get_session()
+        try:
+            return keyset_page(session.query(*CustomerRow.columns()), Customer.id, after=after_id,
+                               before=before_id, page_size=page_size, row_factory=CustomerRow.from_row)
+        finally:
+            session.close()
+
+    @staticmethod
+    def iter_customers(after_id=None, page_size=DEFAULT_PAGE_SIZE):
+        """Iterate over all customers one page at a time"""
+        return iter_keyset(CustomerService.get_customers_page, after_id=after_id, page_size=page_size)
+
     @staticmethod
     def get_customer_by_id(customer_id):
-        """Get customer by ID"""
+        """Get customer by ID, from the identity map when already loaded"""
         session = get_session()
         try:
-            return session.query(Customer).filter(Customer.id == customer_id).first()
+            return session.get(Customer, customer_id)
         finally:
             session.close()
 
     @staticmethod
-    def search_customers(search_term):
-        """Search customers by name, email, or phone"""
+    def search_customers(search_term, limit=None):
+        """Search customers by name, email, or phone, best matches first"""
         session = get_session()
         try:
-            return session.query(Customer).filter(
+            matches = match_subquery(customers_fts, search_term)
+            if matches is not None:
+                try:
+                    query = session.query(*CustomerRow.columns()).join(
+                        matches, matches.c.rowid == Customer.id
+                    ).order_by(matches.c.rank)
+                    return [CustomerRow.from_row(row) for row in (query.limit(limit) if limit else query)]
+                except OperationalError:
+                    # Database predates the full-text index
+                    session.rollback()
+
+            query = session.query(*CustomerRow.columns()).filter(
                 (Customer.first_name.contains(search_term)) |
                 (Customer.last_name.contains(search_term)) |
                 (Customer.email.contains(search_term)) |
                 (Customer.phone.contains(search_term))
-            ).all()
+            )
+            return [CustomerRow.from_row(row) for row in (query.limit(limit) if limit else query)]
         finally:
             session.close()
 
     @staticmethod
+    @invalidates('customers')
     def update_customer(customer_id, **kwargs):
         """Update a customer"""
         session = get_session()
@@ -82,12 +124,14 @@ class CustomerService:
             session.close()
 
     @staticmethod
+    @invalidates('customers')
     def delete_customer(customer_id):
         """Delete a customer"""
         session = get_session()
         try:
             customer = session.query(Customer).filter(Customer.id == customer_id).first()
             if customer:
+                session.query(CustomerStats).filter(CustomerStats.customer_id == customer_id).delete()
                 session.delete(customer)
                 session.commit()
                 return True
@@ -103,11 +147,85 @@ class CustomerService:
         """Get customer with their sales history"""
         session = get_session()
         try:
-            from lib.models.sale import Sale
             customer = session.query(Customer).filter(Customer.id == customer_id).first()
             if customer:
                 sales = session.query(Sale).filter(Sale.customer_id == customer_id).all()
                 return customer, sales
             return None, []
         finally:
-            session.close()
\ No newline at end of file
+            session.close()
+
+    @staticmethod
+    def _lifetime_value_query(session):
+        """Build the per-customer lifetime value query, highest spenders first
+
+        Reads the customer_stats table kept up to date by SalesService, so
+        only completed sales count and the top customers come off an index.
+        """
+        return session.query(
+            Customer.id,
+            Customer.first_name,
+            Customer.last_name,
+            CustomerStats.total_spent,
+            CustomerStats.order_count.label('orders'),
+            CustomerStats.last_purchase,
+            CustomerStatsService.segment_expression().label('segment')
+        ).join(CustomerStats, CustomerStats.customer_id == Customer.id).filter(
+            CustomerStats.order_count > 0
+        ).order_by(
+            CustomerStats.total_spent.desc(), CustomerStats.customer_id
+        )
+
+    @staticmethod
+    def _lifetime_value_row(row):
+        """Convert a lifetime value result row to a dictionary"""
+        total_spent = row.total_spent or Money(0)
+        return {
+            'customer_id': row.id,
+            'name': f"{row.first_name} {row.last_name}",
+            'total_spent': total_spent,
+            'orders': row.orders,
+            'avg_order': total_spent / row.orders if row.orders else Money(0),
+            'last_purchase': row.last_purchase,
+            'segment': row.segment
+        }
+
+    @staticmethod
+    @cached('customers')
+    def get_lifetime_value_table():
+        """Get total spent, order count, average order and last purchase for every customer"""
+        session = get_session()
+        try:
+            query = CustomerService._lifetime_value_query(session)
+            return [CustomerService._lifetime_value_row(row) for row in query]
+        finally:
+            session.close()
+
+    @staticmethod
+    def iter_lifetime_values(limit=None, batch_size=500):
+        """Stream lifetime value rows, highest spenders first, without loading them all"""
+        session = get_session()
+        try:
+            query = CustomerService._lifetime_value_query(session)
+            if limit is not None:
+                query = query.limit(limit)
+            for row in query.yield_per(batch_size):
+                yield CustomerService._lifetime_value_row(row)
+        finally:
+            session.close()
+
+    @staticmethod
+    @cached('customers')
+    def get_customer_segments():
+        """Get count, spend, orders and recent buyers per customer segment"""
+        return CustomerStatsService.get_segment_totals()
+
+    @staticmethod
+    @cached('customers')
+    def count_customers():
+        """Get the number of registered customers"""
+        session = get_session()
+        try:
+            return session.query(func.count(Customer.id)).scalar() or 0
+        finally:
+            session.close()
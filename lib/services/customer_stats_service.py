@@ -0,0 +1,159 @@
+from datetime import datetime, timedelta
+from sqlalchemy import and_, case, func
+from lib.models.base import get_session
+from lib.models.customer import Customer
+from lib.models.customer_stats import CustomerStats
+from lib.models.money import Money, as_money
+from lib.models.sale import Sale
+from lib.services.cache import invalidates
+from lib.services.tracing import traced_methods
+
+# Segments in priority order as (name, minimum KES spent, minimum orders);
+# a customer matching none of them is inactive
+SEGMENT_RULES = (
+    ('VIP', 10000, 5),
+    ('Loyal', 0, 3),
+    ('Big Spender', 5000, 0),
+    ('Occasional', 0, 1),
+)
+INACTIVE_SEGMENT = 'Inactive'
+# Customers whose last purchase is this recent count as active buyers
+RECENT_DAYS = 90
+
+
+@traced_methods()
+class CustomerStatsService:
+
+    @staticmethod
+    def segment_expression():
+        """SQL CASE naming a customer's segment from their stats row"""
+        return case(
+            *[(and_(CustomerStats.total_spent >= spent, CustomerStats.order_count >= orders), name)
+              for name, spent, orders in SEGMENT_RULES],
+            else_=INACTIVE_SEGMENT
+        )
+
+    @staticmethod
+    def _customer_totals(session, sale_ids=None):
+        """Aggregate completed sales (optionally only ``sale_ids``) by customer
+
+        Sales whose customer no longer exists are left out, as in the
+        customer_stats backfill migration.
+        """
+        final_total = as_money(Sale.total_amount + func.coalesce(Sale.tax_amount, 0)
+                               - func.coalesce(Sale.discount_amount, 0))
+        query = session.query(
+            Sale.customer_id,
+            func.count(Sale.id),
+            func.sum(final_total),
+            func.min(Sale.sale_date),
+            func.max(Sale.sale_date)
+        ).filter(
+            Sale.status == 'Completed',
+            Sale.customer_id.in_(session.query(Customer.id))
+        )
+        if sale_ids is not None:
+            query = query.filter(Sale.id.in_(sale_ids))
+
+        return {
+            customer_id: {
+                'order_count': orders,
+                'total_spent': spent or Money(0),
+                'first_purchase': first,
+                'last_purchase': last
+            }
+            for customer_id, orders, spent, first, last in query.group_by(Sale.customer_id)
+        }
+
+    @staticmethod
+    def apply_sales(session, sale_ids, sign=1):
+        """Add (sign=1) or remove (sign=-1) completed sales from their customers' stats
+
+        Runs inside the caller's session so the stats commit or roll back
+        together with the sale itself.
+        """
+        totals = CustomerStatsService._customer_totals(session, sale_ids)
+        if not totals:
+            return
+
+        rows = {
+            row.customer_id: row for row in session.query(CustomerStats).filter(
+                CustomerStats.customer_id.in_(list(totals))
+            )
+        }
+        if sign < 0:
+            # Purchase dates cannot be subtracted; take them from the sales that remain
+            remaining = {
+                customer_id: (first, last) for customer_id, first, last in session.query(
+                    Sale.customer_id, func.min(Sale.sale_date), func.max(Sale.sale_date)
+                ).filter(
+                    Sale.status == 'Completed',
+                    Sale.customer_id.in_(list(totals)),
+                    Sale.id.notin_(sale_ids)
+                ).group_by(Sale.customer_id)
+            }
+
+        for customer_id, delta in totals.items():
+            row = rows.get(customer_id)
+            if row is None:
+                if sign < 0:
+                    continue
+                row = CustomerStats(customer_id=customer_id, order_count=0, total_spent=Money(0))
+                session.add(row)
+            row.order_count += sign * delta['order_count']
+            row.total_spent += sign * delta['total_spent']
+            if sign > 0:
+                row.first_purchase = min(filter(None, (row.first_purchase, delta['first_purchase'])), default=None)
+                row.last_purchase = max(filter(None, (row.last_purchase, delta['last_purchase'])), default=None)
+            else:
+                row.first_purchase, row.last_purchase = remaining.get(customer_id, (None, None))
+
+    @staticmethod
+    @invalidates('customers')
+    def rebuild():
+        """Recompute every customer's stats from the sales table"""
+        session = get_session()
+        try:
+            session.query(CustomerStats).delete()
+            totals = CustomerStatsService._customer_totals(session)
+            session.add_all(
+                CustomerStats(customer_id=customer_id, **values) for customer_id, values in totals.items()
+            )
+            session.commit()
+            return len(totals)
+        except Exception as e:
+            session.rollback()
+            raise e
+        finally:
+            session.close()
+
+    @staticmethod
+    def get_segment_totals(now=None, recent_days=RECENT_DAYS):
+        """Count, spend, orders and recent buyers per segment, every customer included, in one query"""
+        now = now or datetime.utcnow()
+        segment = CustomerStatsService.segment_expression().label('segment')
+        recent = CustomerStats.last_purchase >= now - timedelta(days=recent_days)
+
+        session = get_session()
+        try:
+            rows = session.query(
+                segment,
+                func.count(Customer.id),
+                func.coalesce(func.sum(CustomerStats.total_spent), 0),
+                func.coalesce(func.sum(CustomerStats.order_count), 0),
+                func.coalesce(func.sum(case((recent, 1), else_=0)), 0)
+            ).select_from(Customer).outerjoin(
+                CustomerStats, CustomerStats.customer_id == Customer.id
+            ).group_by(segment).all()
+        finally:
+            session.close()
+
+        return {
+            name: {'count': count, 'total_spent': spent, 'orders': orders, 'recent': recent_count}
+            for name, count, spent, orders, recent_count in rows
+        }
+
+
+if __name__ == "__main__":
+    customers = CustomerStatsService.rebuild()
+    print(f"Rebuilt purchase stats for {customers} customer(s)")
@@ -0,0 +1,169 @@
+import csv
+import gzip
+import json
+import os
+from datetime import datetime
+from sqlalchemy import select, func
+from lib.models.base import get_session
+from lib.models.customer import Customer
+from lib.models.item import Item
+from lib.models.sale import Sale
+from lib.models.sale_item import SaleItem
+from lib.models.money import as_money, json_default
+from lib.services.tracing import traced_methods
+
+EXPORT_FORMATS = ('csv', 'jsonl')
+DEFAULT_BATCH_SIZE = 1000
+PROGRESS_EVERY = 5000
+
+
+@traced_methods()
+class ExportService:
+
+    @staticmethod
+    def _customer_name():
+        return func.coalesce(Customer.first_name + ' ' + Customer.last_name, 'Walk-in')
+
+    @staticmethod
+    def sales_query():
+        """One row per sale with the customer's name"""
+        return select(
+            Sale.id.label('sale_id'),
+            Sale.sale_date,
+            Sale.customer_id,
+            ExportService._customer_name().label('customer_name'),
+            Sale.payment_method,
+            Sale.status,
+            Sale.total_amount,
+            Sale.tax_amount,
+            Sale.discount_amount,
+            as_money(Sale.total_amount + func.coalesce(Sale.tax_amount, 0)
+                     - func.coalesce(Sale.discount_amount, 0)).label('final_total')
+        ).outerjoin(Customer, Customer.id == Sale.customer_id).order_by(Sale.id)
+
+    @staticmethod
+    def sale_lines_query():
+        """One row per sale line with sale, customer and item details"""
+        return select(
+            Sale.id.label('sale_id'),
+            Sale.sale_date,
+            ExportService._customer_name().label('customer_name'),
+            Sale.status,
+            SaleItem.item_id,
+            Item.name.label('item_name'),
+            Item.category,
+            SaleItem.quantity,
+            SaleItem.unit_price,
+            SaleItem.total_price
+        ).join(Sale, Sale.id == SaleItem.sale_id).join(
+            Item, Item.id == SaleItem.item_id
+        ).outerjoin(Customer, Customer.id == Sale.customer_id).order_by(SaleItem.sale_id, SaleItem.id)
+
+    @staticmethod
+    def inventory_query():
+        """One row per item"""
+        return select(
+            Item.id, Item.name, Item.description, Item.category, Item.price, Item.cost,
+            Item.quantity, Item.condition, Item.size, Item.brand, Item.color,
+            Item.is_sold, Item.date_added, Item.date_sold
+        ).order_by(Item.id)
+
+    @staticmethod
+    def customers_query():
+        """One row per customer"""
+        return select(
+            Customer.id, Customer.first_name, Customer.last_name, Customer.email,
+            Customer.phone, Customer.address, Customer.city, Customer.postal_code,
+            Customer.date_joined, Customer.notes
+        ).order_by(Customer.id)
+
+    @staticmethod
+    def _open(path, compress):
+        if compress:
+            return gzip.open(path, 'wt', encoding='utf-8', newline='')
+        return open(path, 'w', encoding='utf-8', newline='')
+
+    @staticmethod
+    def export_query(query, path, fmt='csv', compress=False, progress=None,
+                     batch_size=DEFAULT_BATCH_SIZE):
+        """Stream a select into a CSV or JSONL file and return the row count
+
+        Rows are fetched ``batch_size`` at a time and written immediately, so
+        memory stays flat however large the table is. ``progress`` is called
+        with the running row count every few thousand rows and at the end.
+        """
+        if fmt not in EXPORT_FORMATS:
+            raise ValueError(f"Unsupported export format '{fmt}'")
+
+        session = get_session()
+        count = 0
+        try:
+            result = session.execute(query.execution_options(yield_per=batch_size))
+            columns = list(result.keys())
+
+            with ExportService._open(path, compress) as output:
+                if fmt == 'csv':
+                    writer = csv.writer(output)
+                    writer.writerow(columns)
+                    write = writer.writerow
+                else:
+                    def write(row):
+                        output.write(json.dumps(dict(zip(columns, row)), default=json_default))
+                        output.write('\n')
+
+                for row in result:
+                    write(row)
+                    count += 1
+                    if progress and count % PROGRESS_EVERY == 0:
+                        progress(count)
+
+            if progress:
+                progress(count)
+            return count
+        finally:
+            session.close()
+
+    @staticmethod
+    def export_filename(name, fmt='csv', compress=False, directory='exports'):
+        """Build a timestamped export path, creating the directory if needed"""
+        os.makedirs(directory, exist_ok=True)
+        stamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        return os.path.join(directory, f"{name}_{stamp}.{fmt}{'.gz' if compress else ''}")
+
+    @staticmethod
+    def export_sales(path, fmt='csv', compress=False, progress=None):
+        """Export every sale line joined with customer and item names"""
+        return ExportService.export_query(ExportService.sale_lines_query(), path, fmt, compress, progress)
+
+    @staticmethod
+    def export_inventory(path, fmt='csv', compress=False, progress=None):
+        """Export every inventory item"""
+        return ExportService.export_query(ExportService.inventory_query(), path, fmt, compress, progress)
+
+    @staticmethod
+    def export_customers(path, fmt='csv', compress=False, progress=None):
+        """Export every customer"""
+        return ExportService.export_query(ExportService.customers_query(), path, fmt, compress, progress)
+
+    @staticmethod
+    def export_complete_package(directory='exports', fmt='csv', compress=False, progress=None):
+        """Export sales, sale lines, inventory and customers into one folder"""
+        directory = os.path.join(directory, f"package_{datetime.now().strftime('%Y%m%d_%H%M%S')}")
+        os.makedirs(directory, exist_ok=True)
+
+        suffix = f".{fmt}{'.gz' if compress else ''}"
+        exports = [
+            ('sales', ExportService.sales_query()),
+            ('sale_lines', ExportService.sale_lines_query()),
+            ('inventory', ExportService.inventory_query()),
+            ('customers', ExportService.customers_query())
+        ]
+
+        counts = {}
+        for name, query in exports:
+            path = os.path.join(directory, name + suffix)
+            counts[name] = ExportService.export_query(
+                query, path, fmt, compress,
+                (lambda count, name=name: progress(name, count)) if progress else None
+            )
+        return directory, counts
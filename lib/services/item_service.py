@@ -1,11 +1,42 @@
+import csv
+import os
+from decimal import Decimal, InvalidOperation
+from sqlalchemy import Integer, and_, case, func, insert, type_coerce
+from sqlalchemy.exc import OperationalError
 from sqlalchemy.orm import Session
 from lib.models.base import get_session
 from lib.models.item import Item
-from datetime import datetime
+from lib.models.money import Money, as_money
+from lib.models.search import items_fts, match_subquery
+from lib.services.read_models import ItemRow
+from lib.services.pagination import DEFAULT_PAGE_SIZE, keyset_page, iter_keyset
+from lib.services.cache import cached, invalidates
+from lib.services.tracing import traced_methods
+from datetime import datetime, timedelta
 
+LOW_STOCK_THRESHOLD = 5
+STALE_AFTER_DAYS = 90
+LOW_MARGIN_PERCENT = 20.0
+# Upper bounds (in days) of every aging bucket but the last
+AGING_BOUNDARIES = (30, 60, 90)
+
+
+def aging_labels(boundaries=AGING_BOUNDARIES):
+    """Label each aging bucket, e.g. '0-30 days' ... '91+ days'"""
+    labels = []
+    lower = 0
+    for upper in boundaries:
+        labels.append(f"{lower}-{upper} days")
+        lower = upper + 1
+    labels.append(f"{boundaries[-1] + 1}+ days")
+    return labels
+
+
+@traced_methods()
 class ItemService:
 
     @staticmethod
+    @invalidates('items')
     def create_item(name, description, category, price, cost=0.0, quantity=1,
                    condition='Good', size=None, brand=None, color=None):
         """Create a new item"""
@@ -34,46 +65,264 @@ class ItemService:
             session.close()
 
     @staticmethod
+    def _parse_import_amount(row, field, default=None):
+        """Parse a money column of a CSV row; blanks, text, NaN and infinities are rejected"""
+        value = (row.get(field) or '').strip() or default
+        try:
+            amount = Decimal(value)
+        except (InvalidOperation, TypeError):
+            raise ValueError(f"invalid {field} {row.get(field)!r}")
+        if not amount.is_finite():
+            raise ValueError(f"{field} must be a finite number, got {row.get(field)!r}")
+        return Money.of(amount)
+
+    @staticmethod
+    def _parse_import_row(row):
+        """Validate one CSV row and convert it to item column values"""
+        name = (row.get('name') or '').strip()
+        category = (row.get('category') or '').strip()
+        if not name:
+            raise ValueError("name is required")
+        if not category:
+            raise ValueError("category is required")
+
+        price = ItemService._parse_import_amount(row, 'price')
+        cost = ItemService._parse_import_amount(row, 'cost', default='0')
+        try:
+            quantity = int(row.get('quantity') or 1)
+        except ValueError:
+            raise ValueError(f"invalid quantity {row.get('quantity')!r}")
+        if price < 0 or cost < 0 or quantity < 0:
+            raise ValueError("price, cost and quantity cannot be negative")
+
+        return {
+            'name': name,
+            'description': (row.get('description') or '').strip() or None,
+            'category': category,
+            'price': price,
+            'cost': cost,
+            'quantity': quantity,
+            'condition': (row.get('condition') or '').strip() or 'Good',
+            'size': (row.get('size') or '').strip() or None,
+            'brand': (row.get('brand') or '').strip() or None,
+            'color': (row.get('color') or '').strip() or None
+        }
+
+    @staticmethod
+    @invalidates('items')
+    def bulk_import(source, batch_size=500):
+        """Import items from a CSV file path or text stream
+
+        The CSV needs name, category and price columns; description, cost,
+        quantity, condition, size, brand and color are optional. Valid rows
+        are inserted in batches within a single transaction. Returns the
+        number imported and a list of (line number, reason) for rejected rows.
+        """
+        stream = open(source, newline='', encoding='utf-8-sig') if isinstance(source, (str, os.PathLike)) else source
+        session = get_session()
+        imported = 0
+        rejected = []
+        try:
+            reader = csv.DictReader(stream)
+            if reader.fieldnames:
+                reader.fieldnames = [field.strip().lower() for field in reader.fieldnames]
+
+            insert_items = insert(Item.__table__)
+            batch = []
+            for row in reader:
+                try:
+                    batch.append(ItemService._parse_import_row(row))
+                except ValueError as e:
+                    rejected.append((reader.line_num, str(e)))
+                    continue
+
+                if len(batch) >= batch_size:
+                    session.execute(insert_items, batch)
+                    imported += len(batch)
+                    batch = []
+
+            if batch:
+                session.execute(insert_items, batch)
+                imported += len(batch)
+
+            session.commit()
+            return {'imported': imported, 'rejected': rejected}
+        except Exception as e:
+            session.rollback()
+            raise e
+        finally:
+            session.close()
+            if stream is not source:
+                stream.close()
+
+    @staticmethod
+    @cached('items')
     def get_all_items():
         """Get all items"""
         session = get_session()
         try:
-            return session.query(Item).all()
+            return [ItemRow.from_row(row) for row in session.query(*ItemRow.columns())]
         finally:
             session.close()
 
     @staticmethod
+    def get_items_page(after_id=None, before_id=None, page_size=DEFAULT_PAGE_SIZE):
+        """Get one page of items ordered by ID"""
+        session = get_session()
+        try:
+            return keyset_page(session.query(*ItemRow.columns()), Item.id, after=after_id,
+                               before=before_id, page_size=page_size, row_factory=ItemRow.from_row)
+        finally:
+            session.close()
+
+    @staticmethod
+    def iter_items(after_id=None, page_size=DEFAULT_PAGE_SIZE):
+        """Iterate over all items one page at a time"""
+        return iter_keyset(ItemService.get_items_page, after_id=after_id, page_size=page_size)
+
+    @staticmethod
+    @cached('items')
     def get_available_items():
         """Get all available (not sold) items"""
         session = get_session()
         try:
-            return session.query(Item).filter(Item.is_sold == False).all()
+            return [
+                ItemRow.from_row(row)
+                for row in session.query(*ItemRow.columns()).filter(Item.is_sold == False)
+            ]
+        finally:
+            session.close()
+
+    @staticmethod
+    def _added_since(days, today=None):
+        """Earliest date_added of an item at most ``days`` calendar days old"""
+        day = (today or datetime.now().date()) - timedelta(days=days)
+        return datetime.combine(day, datetime.min.time())
+
+    @staticmethod
+    def _today(today=None):
+        """Resolve ``today`` before a cache key is built, so results cached
+        yesterday are not served after midnight"""
+        return today or datetime.now().date()
+
+    @staticmethod
+    def get_aging_buckets(boundaries=AGING_BOUNDARIES, today=None):
+        """Unsold item count and stock value per age range, grouped in SQL
+
+        Each bucket is a date_added range, so the grouping runs off the
+        (is_sold, date_added) index rather than over every item.
+        """
+        return ItemService._aging_buckets(tuple(boundaries), ItemService._today(today))
+
+    @staticmethod
+    @cached('items')
+    def _aging_buckets(boundaries, today):
+        bucket = case(
+            (Item.date_added.is_(None), 0),
+            *[(Item.date_added >= ItemService._added_since(days, today), index)
+              for index, days in enumerate(boundaries)],
+            else_=len(boundaries)
+        ).label('bucket')
+
+        session = get_session()
+        try:
+            totals = {
+                index: (count, value) for index, count, value in session.query(
+                    bucket, func.count(Item.id), func.sum(as_money(Item.price * Item.quantity))
+                ).filter(Item.is_sold == False).group_by(bucket)
+            }
+        finally:
+            session.close()
+
+        buckets = []
+        for index, label in enumerate(aging_labels(boundaries)):
+            count, value = totals.get(index, (0, None))
+            buckets.append({'range': label, 'items': count, 'value': value or Money(0)})
+        return buckets
+
+    @staticmethod
+    def find_stale(days=STALE_AFTER_DAYS, limit=None, today=None):
+        """Get unsold items older than ``days``, oldest first"""
+        return ItemService._stale(days, limit, ItemService._today(today))
+
+    @staticmethod
+    @cached('items')
+    def _stale(days, limit, today):
+        session = get_session()
+        try:
+            query = session.query(*ItemRow.columns()).filter(
+                Item.is_sold == False,
+                Item.date_added < ItemService._added_since(days, today)
+            ).order_by(Item.date_added, Item.id)
+            return [ItemRow.from_row(row) for row in (query.limit(limit) if limit else query)]
+        finally:
+            session.close()
+
+    @staticmethod
+    def get_inventory_alerts(low_stock=LOW_STOCK_THRESHOLD, stale_days=STALE_AFTER_DAYS,
+                             low_margin=LOW_MARGIN_PERCENT, today=None):
+        """Count low stock, out of stock, stale, below cost and thin margin items in one query"""
+        return ItemService._inventory_alerts(low_stock, stale_days, low_margin, ItemService._today(today))
+
+    @staticmethod
+    @cached('items')
+    def _inventory_alerts(low_stock, stale_days, low_margin, today):
+        # Raw cents, so the margin test is integer arithmetic
+        price = type_coerce(Item.price, Integer)
+        cost = func.coalesce(type_coerce(Item.cost, Integer), 0)
+        conditions = {
+            'low_stock': Item.quantity <= low_stock,
+            'out_of_stock': Item.quantity == 0,
+            'stale': Item.date_added < ItemService._added_since(stale_days, today),
+            'below_cost': and_(price > 0, price < cost),
+            'low_margin': and_(price > 0, price >= cost, (price - cost) * 100 < price * low_margin)
+        }
+
+        session = get_session()
+        try:
+            row = session.query(
+                *[func.coalesce(func.sum(case((condition, 1), else_=0)), 0) for condition in conditions.values()]
+            ).filter(Item.is_sold == False).one()
+            return dict(zip(conditions, row))
         finally:
             session.close()
 
     @staticmethod
     def get_item_by_id(item_id):
-        """Get item by ID"""
+        """Get item by ID, from the identity map when already loaded"""
         session = get_session()
         try:
-            return session.query(Item).filter(Item.id == item_id).first()
+            return session.get(Item, item_id)
         finally:
             session.close()
 
     @staticmethod
-    def search_items(search_term):
-        """Search items by name, category, or brand"""
+    def search_items(search_term, limit=None):
+        """Search items by name, category, or brand, best matches first"""
         session = get_session()
         try:
-            return session.query(Item).filter(
+            matches = match_subquery(items_fts, search_term)
+            if matches is not None:
+                try:
+                    query = session.query(*ItemRow.columns()).join(
+                        matches, matches.c.rowid == Item.id
+                    ).order_by(matches.c.rank)
+                    return [ItemRow.from_row(row) for row in (query.limit(limit) if limit else query)]
+                except OperationalError:
+                    # Database predates the full-text index
+                    session.rollback()
+
+            query = session.query(*ItemRow.columns()).filter(
                 (Item.name.contains(search_term)) |
                 (Item.category.contains(search_term)) |
                 (Item.brand.contains(search_term))
-            ).all()
+            )
+            return [ItemRow.from_row(row) for row in (query.limit(limit) if limit else query)]
         finally:
             session.close()
 
     @staticmethod
+    @invalidates('items')
     def update_item(item_id, **kwargs):
         """Update an item"""
         session = get_session()
@@ -94,6 +343,7 @@ class ItemService:
             session.close()
 
     @staticmethod
+    @invalidates('items')
     def delete_item(item_id):
         """Delete an item"""
         session = get_session()
@@ -111,6 +361,7 @@ class ItemService:
             session.close()
 
     @staticmethod
+    @invalidates('items')
     def mark_as_sold(item_id):
         """Mark an item as sold"""
         session = get_session()
@@ -130,6 +381,7 @@ class ItemService:
             session.close()
 
     @staticmethod
+    @cached('items', ttl=300)
     def get_categories():
         """Get all unique categories"""
         session = get_session()
@@ -0,0 +1,66 @@
+DEFAULT_PAGE_SIZE = 20
+
+
+class Page:
+    """One page of results from a keyset-paginated query"""
+
+    def __init__(self, items, has_next, has_previous, key=None):
+        self.items = items
+        self.has_next = has_next
+        self.has_previous = has_previous
+        self.key = key or (lambda row: row.id)
+
+    @property
+    def first_key(self):
+        return self.key(self.items[0]) if self.items else None
+
+    @property
+    def last_key(self):
+        return self.key(self.items[-1]) if self.items else None
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __len__(self):
+        return len(self.items)
+
+
+def keyset_page(query, key_column, after=None, before=None,
+                page_size=DEFAULT_PAGE_SIZE, descending=False, row_factory=None):
+    """Fetch the page after (or before) a key without using OFFSET
+
+    ``after`` is the last key of the page being left when moving forward and
+    ``before`` the first key when moving back. ``key_column`` must be unique.
+    ``row_factory``, if given, converts each fetched row before paging.
+    """
+    backwards = before is not None and after is None
+    boundary = before if backwards else after
+
+    # Moving backwards walks the key in the opposite direction and flips the
+    # rows afterwards so the page always reads in display order
+    ascending = descending == backwards
+    if boundary is not None:
+        query = query.filter(key_column > boundary if ascending else key_column < boundary)
+    query = query.order_by(key_column.asc() if ascending else key_column.desc())
+
+    rows = query.limit(page_size + 1).all()
+    has_more = len(rows) > page_size
+    rows = rows[:page_size]
+    if row_factory is not None:
+        rows = [row_factory(row) for row in rows]
+
+    if backwards:
+        rows.reverse()
+        return Page(rows, has_next=True, has_previous=has_more)
+    return Page(rows, has_next=has_more, has_previous=boundary is not None)
+
+
+def iter_keyset(fetch_page, after_id=None, page_size=DEFAULT_PAGE_SIZE):
+    """Yield every row by walking pages returned from ``fetch_page``"""
+    while True:
+        page = fetch_page(after_id=after_id, page_size=page_size)
+        for row in page:
+            yield row
+        if not page.has_next:
+            break
+        after_id = page.last_key
@@ -0,0 +1,110 @@
+from sqlalchemy import func, literal, select
+from lib.models.customer import Customer
+from lib.models.item import Item
+from lib.models.sale import Sale
+from lib.models.sale_item import SaleItem
+from lib.models.money import Money
+
+
+class ReadRow:
+    """Read-only listing row built from selected columns
+
+    Subclasses name their attributes in ``__slots__`` and return the matching
+    columns, in the same order, from ``columns()``. Rows carry no session,
+    identity map or change tracking, so they are cheap to build and safe to
+    cache or use after the session is closed. They are also immutable, so
+    one cached row can be handed to every caller.
+    """
+
+    __slots__ = ()
+    # Keys of to_dict() in order, computed properties included; defaults to __slots__
+    fields = ()
+    # strftime format per datetime column, the same ones the models' to_dict() use
+    date_formats = {}
+
+    def __init__(self, *values):
+        for name, value in zip(self.__slots__, values):
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is read-only")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__} is read-only")
+
+    def __reduce__(self):
+        return type(self), tuple(getattr(self, name) for name in self.__slots__)
+
+    @classmethod
+    def from_row(cls, row):
+        return cls(*row)
+
+    def to_dict(self):
+        """The same dict the model's to_dict() gives for this record"""
+        data = {}
+        for name in self.fields or self.__slots__:
+            value = getattr(self, name)
+            date_format = self.date_formats.get(name)
+            data[name] = value.strftime(date_format) if date_format and value is not None else value
+        return data
+
+    def __repr__(self):
+        return f"<{type(self).__name__}(id={getattr(self, 'id', None)})>"
+
+
+class ItemRow(ReadRow):
+    __slots__ = ('id', 'name', 'description', 'category', 'price', 'cost', 'quantity', 'condition',
+                 'size', 'brand', 'color', 'is_sold', 'date_added', 'date_sold')
+    date_formats = {'date_added': '%Y-%m-%d %H:%M', 'date_sold': '%Y-%m-%d %H:%M'}
+
+    @staticmethod
+    def columns():
+        return (Item.id, Item.name, Item.description, Item.category, Item.price, Item.cost,
+                Item.quantity, Item.condition, Item.size, Item.brand, Item.color, Item.is_sold,
+                Item.date_added, Item.date_sold)
+
+
+class CustomerRow(ReadRow):
+    __slots__ = ('id', 'first_name', 'last_name', 'email', 'phone', 'address', 'city',
+                 'postal_code', 'date_joined', 'notes')
+    fields = ('id', 'first_name', 'last_name', 'full_name', 'email', 'phone', 'address', 'city',
+              'postal_code', 'date_joined', 'notes')
+    date_formats = {'date_joined': '%Y-%m-%d'}
+
+    @staticmethod
+    def columns():
+        return (Customer.id, Customer.first_name, Customer.last_name, Customer.email,
+                Customer.phone, Customer.address, Customer.city, Customer.postal_code,
+                Customer.date_joined, Customer.notes)
+
+    @property
+    def full_name(self):
+        return f"{self.first_name} {self.last_name}"
+
+
+class SaleRow(ReadRow):
+    __slots__ = ('id', 'sale_date', 'customer_id', 'customer_name', 'total_amount',
+                 'tax_amount', 'discount_amount', 'payment_method', 'status', 'notes', 'items_count')
+    fields = ('id', 'customer_id', 'customer_name', 'sale_date', 'total_amount', 'tax_amount',
+              'discount_amount', 'final_total', 'payment_method', 'status', 'notes', 'items_count')
+    date_formats = {'sale_date': '%Y-%m-%d %H:%M'}
+
+    @staticmethod
+    def columns():
+        items_count = select(func.count(SaleItem.id)).where(
+            SaleItem.sale_id == Sale.id
+        ).correlate(Sale).scalar_subquery()
+
+        # Correlated subquery keeps one row per sale without joining customers
+        customer_name = select(Customer.first_name + ' ' + Customer.last_name).where(
+            Customer.id == Sale.customer_id
+        ).correlate(Sale).scalar_subquery()
+
+        return (Sale.id, Sale.sale_date, Sale.customer_id,
+                func.coalesce(customer_name, literal('Walk-in')).label('customer_name'),
+                Sale.total_amount, Sale.tax_amount, Sale.discount_amount, Sale.payment_method,
+                Sale.status, Sale.notes, items_count.label('items_count'))
+
+    @property
+    def final_total(self):
+        return (self.total_amount or Money(0)) + (self.tax_amount or 0) - (self.discount_amount or 0)
@@ -0,0 +1,158 @@
+from datetime import datetime, timedelta
+from sqlalchemy import func, case
+from lib.models.base import get_session
+from lib.models.sale import Sale
+from lib.models.sale_item import SaleItem
+from lib.models.daily_sales_rollup import DailySalesRollup
+from lib.models.money import Money, as_money
+from lib.services.cache import invalidates
+from lib.services.tracing import traced_methods
+
+ROLLUP_FIELDS = ['sale_count', 'gross_amount', 'tax_amount', 'discount_amount',
+                 'net_amount', 'item_units', 'cost_of_goods']
+
+
+@traced_methods()
+class RollupService:
+
+    @staticmethod
+    def _daily_totals(session, sale_ids=None):
+        """Aggregate completed sales (optionally only ``sale_ids``) by day"""
+        day = func.date(Sale.sale_date)
+        tax = func.coalesce(Sale.tax_amount, 0)
+        discount = func.coalesce(Sale.discount_amount, 0)
+
+        sales = session.query(
+            day.label('day'),
+            func.count(Sale.id),
+            func.sum(Sale.total_amount),
+            func.sum(tax),
+            func.sum(discount),
+            func.sum(as_money(Sale.total_amount + tax - discount))
+        ).filter(Sale.status == 'Completed')
+
+        lines = session.query(
+            day.label('day'),
+            func.sum(SaleItem.quantity),
+            func.sum(as_money(SaleItem.quantity * func.coalesce(SaleItem.unit_cost, 0)))
+        ).join(SaleItem, SaleItem.sale_id == Sale.id).filter(Sale.status == 'Completed')
+
+        if sale_ids is not None:
+            sales = sales.filter(Sale.id.in_(sale_ids))
+            lines = lines.filter(Sale.id.in_(sale_ids))
+
+        totals = {}
+        for day_value, count, gross, tax_total, discount_total, net in sales.group_by(day):
+            totals[day_value] = {
+                'sale_count': count,
+                'gross_amount': gross or Money(0),
+                'tax_amount': tax_total or Money(0),
+                'discount_amount': discount_total or Money(0),
+                'net_amount': net or Money(0),
+                'item_units': 0,
+                'cost_of_goods': Money(0)
+            }
+        for day_value, units, cost in lines.group_by(day):
+            if day_value in totals:
+                totals[day_value]['item_units'] = units or 0
+                totals[day_value]['cost_of_goods'] = cost or Money(0)
+
+        # SQLite's date() returns text rather than a date
+        return {
+            datetime.strptime(d, '%Y-%m-%d').date() if isinstance(d, str) else d: values
+            for d, values in totals.items() if d
+        }
+
+    @staticmethod
+    def apply_sales(session, sale_ids, sign=1):
+        """Add (sign=1) or remove (sign=-1) completed sales from the rollup
+
+        Runs inside the caller's session so the rollup commits or rolls
+        back together with the sale itself.
+        """
+        totals = RollupService._daily_totals(session, sale_ids)
+        if not totals:
+            return
+
+        rows = {
+            row.sale_date: row for row in session.query(DailySalesRollup).filter(
+                DailySalesRollup.sale_date.in_(list(totals))
+            )
+        }
+        for day, delta in totals.items():
+            row = rows.get(day)
+            if row is None:
+                row = DailySalesRollup(sale_date=day, **{field: 0 for field in ROLLUP_FIELDS})
+                session.add(row)
+            for field in ROLLUP_FIELDS:
+                setattr(row, field, getattr(row, field) + sign * delta[field])
+
+    @staticmethod
+    @invalidates('sales')
+    def rebuild():
+        """Recompute the whole rollup from the sales tables"""
+        session = get_session()
+        try:
+            session.query(DailySalesRollup).delete()
+            totals = RollupService._daily_totals(session)
+            session.add_all(
+                DailySalesRollup(sale_date=day, **values) for day, values in totals.items()
+            )
+            session.commit()
+            return len(totals)
+        except Exception as e:
+            session.rollback()
+            raise e
+        finally:
+            session.close()
+
+    @staticmethod
+    def get_period_totals(start_date, end_date):
+        """Sum the rollup between two dates (inclusive)"""
+        session = get_session()
+        try:
+            row = session.query(
+                *[func.coalesce(func.sum(getattr(DailySalesRollup, field)), 0) for field in ROLLUP_FIELDS]
+            ).filter(
+                DailySalesRollup.sale_date >= start_date,
+                DailySalesRollup.sale_date <= end_date
+            ).one()
+            return dict(zip(ROLLUP_FIELDS, row))
+        finally:
+            session.close()
+
+    @staticmethod
+    def get_dashboard_totals(today=None):
+        """Get all-time, today, this week and this month figures in one query"""
+        today = today or datetime.now().date()
+        periods = {
+            'today': today,
+            'week': today - timedelta(days=today.weekday()),
+            'month': today.replace(day=1)
+        }
+
+        columns = [
+            func.coalesce(func.sum(DailySalesRollup.sale_count), 0),
+            func.coalesce(func.sum(DailySalesRollup.net_amount), 0)
+        ]
+        for start in periods.values():
+            in_period = DailySalesRollup.sale_date >= start
+            columns.append(func.coalesce(func.sum(case((in_period, DailySalesRollup.sale_count), else_=0)), 0))
+            columns.append(func.coalesce(func.sum(case((in_period, DailySalesRollup.net_amount), else_=0)), 0))
+
+        session = get_session()
+        try:
+            row = session.query(*columns).one()
+        finally:
+            session.close()
+
+        totals = {'total_sales': row[0], 'total_revenue': row[1]}
+        for index, period in enumerate(periods):
+            totals[f'{period}_sales'] = row[2 + index * 2]
+            totals[f'{period}_revenue'] = row[3 + index * 2]
+        return totals
+
+
+if __name__ == "__main__":
+    days = RollupService.rebuild()
+    print(f"Rebuilt daily sales rollup for {days} day(s)")
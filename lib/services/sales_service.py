@@ -1,13 +1,33 @@
+from sqlalchemy import bindparam, case, func, insert, select, update
+from sqlalchemy.orm import joinedload, selectinload, with_expression
+from sqlalchemy.orm.util import identity_key
 from lib.models.base import get_session
+from lib.models.customer import Customer
 from lib.models.sale import Sale
 from lib.models.sale_item import SaleItem
 from lib.models.item import Item
+from lib.models.money import Money, as_money
 from lib.services.item_service import ItemService
-from datetime import datetime
+from lib.services.read_models import SaleRow
+from lib.services.pagination import DEFAULT_PAGE_SIZE, keyset_page, iter_keyset
+from lib.services.rollup_service import RollupService
+from lib.services.customer_stats_service import CustomerStatsService
+from lib.services.cache import cached, invalidates
+from lib.services.tracing import traced_methods
+from datetime import datetime, time, timedelta
+from functools import partial
 
+@traced_methods()
 class SalesService:
 
     @staticmethod
+    def _record_sales(session, sale_ids, sign=1):
+        """Add (sign=1) or remove (sign=-1) completed sales from the aggregates"""
+        RollupService.apply_sales(session, sale_ids, sign)
+        CustomerStatsService.apply_sales(session, sale_ids, sign)
+
+    @staticmethod
+    @invalidates('sales', 'items', 'customers')
     def create_sale(customer_id=None, payment_method='Cash', tax_rate=0.0,
                    discount_amount=0.0, notes=None):
         """Create a new sale"""
@@ -18,10 +38,12 @@ class SalesService:
                 payment_method=payment_method,
                 tax_amount=0.0,
                 discount_amount=discount_amount,
+                status='Pending',
                 notes=notes
             )
             session.add(sale)
             session.commit()
+            session.refresh(sale)
             return sale
         except Exception as e:
             session.rollback()
@@ -30,6 +52,7 @@ class SalesService:
             session.close()
 
     @staticmethod
+    @invalidates('sales', 'items', 'customers')
     def add_item_to_sale(sale_id, item_id, quantity=1, custom_price=None):
         """Add an item to a sale"""
         session = get_session()
@@ -41,8 +64,13 @@ class SalesService:
             if not sale or not item:
                 return None
 
+            # Completed sales are already in the rollup; re-apply after the change
+            completed = sale.status == 'Completed'
+            if completed:
+                SalesService._record_sales(session, [sale_id], sign=-1)
+
             # Use custom price if provided, otherwise use item price
-            unit_price = custom_price if custom_price is not None else item.price
+            unit_price = Money.of(custom_price) if custom_price is not None else item.price
             total_price = unit_price * quantity
 
             # Create sale item
@@ -51,7 +79,8 @@ class SalesService:
                 item_id=item_id,
                 quantity=quantity,
                 unit_price=unit_price,
-                total_price=total_price
+                total_price=total_price,
+                unit_cost=item.cost
             )
 
             session.add(sale_item)
@@ -59,6 +88,10 @@ class SalesService:
             # Update sale total
             sale.total_amount += total_price
 
+            if completed:
+                session.flush()
+                SalesService._record_sales(session, [sale_id])
+
             session.commit()
             return sale_item
         except Exception as e:
@@ -68,6 +101,7 @@ class SalesService:
             session.close()
 
     @staticmethod
+    @invalidates('sales', 'items', 'customers')
     def remove_item_from_sale(sale_id, item_id):
         """Remove an item from a sale"""
         session = get_session()
@@ -80,10 +114,16 @@ class SalesService:
             if sale_item:
                 # Update sale total
                 sale = session.query(Sale).filter(Sale.id == sale_id).first()
+                completed = sale is not None and sale.status == 'Completed'
+                if completed:
+                    SalesService._record_sales(session, [sale_id], sign=-1)
                 if sale:
                     sale.total_amount -= sale_item.total_price
 
                 session.delete(sale_item)
+                if completed:
+                    session.flush()
+                    SalesService._record_sales(session, [sale_id])
                 session.commit()
                 return True
             return False
@@ -94,6 +134,7 @@ class SalesService:
             session.close()
 
     @staticmethod
+    @invalidates('sales', 'items', 'customers')
     def complete_sale(sale_id, tax_rate=0.0):
         """Complete a sale and mark items as sold"""
         session = get_session()
@@ -112,8 +153,122 @@ class SalesService:
                     item.is_sold = True
                     item.date_sold = datetime.utcnow()
 
+            already_completed = sale.status == 'Completed'
             sale.status = 'Completed'
+            session.flush()
+            if not already_completed:
+                SalesService._record_sales(session, [sale_id])
+
+            session.commit()
+            return sale
+        except Exception as e:
+            session.rollback()
+            raise e
+        finally:
+            session.close()
+
+    @staticmethod
+    @invalidates('sales', 'items', 'customers')
+    def checkout(basket, customer_id=None, payment_method='Cash', tax_amount=0.0,
+                 discount_amount=0.0, notes=None):
+        """Record a completed sale for a whole basket in one transaction
+
+        ``basket`` is a list of dicts with ``item_id``, ``quantity`` (default 1)
+        and an optional ``custom_price``. Raises ValueError without writing
+        anything if the customer or an item is missing, or an item does not
+        have enough stock.
+        """
+        lines = [
+            (line['item_id'], line.get('quantity', 1), line.get('custom_price'))
+            for line in basket
+        ]
+        if not lines:
+            raise ValueError("Basket is empty")
+
+        requested = {}
+        for item_id, quantity, _ in lines:
+            if quantity < 1:
+                raise ValueError(f"Invalid quantity {quantity} for item {item_id}")
+            requested[item_id] = requested.get(item_id, 0) + quantity
+
+        session = get_session()
+        try:
+            if customer_id is not None and session.get(Customer, customer_id) is None:
+                raise ValueError(f"Customer {customer_id} not found")
+
+            # Validate stock for every item in one query
+            stock = {
+                row.id: row for row in session.query(
+                    Item.id, Item.name, Item.price, Item.cost, Item.quantity, Item.is_sold
+                ).filter(Item.id.in_(requested))
+            }
+            for item_id, quantity in requested.items():
+                row = stock.get(item_id)
+                if row is None:
+                    raise ValueError(f"Item {item_id} not found")
+                available = 0 if row.is_sold else (row.quantity or 0)
+                if available < quantity:
+                    raise ValueError(f"Item '{row.name}' has only {available} available")
+
+            sale_lines = []
+            for item_id, quantity, custom_price in lines:
+                unit_price = Money.of(custom_price) if custom_price is not None else stock[item_id].price
+                sale_lines.append({
+                    'item_id': item_id,
+                    'quantity': quantity,
+                    'unit_price': unit_price,
+                    'total_price': unit_price * quantity,
+                    'unit_cost': stock[item_id].cost
+                })
+
+            now = datetime.utcnow()
+            sale = Sale(
+                customer_id=customer_id,
+                sale_date=now,
+                total_amount=sum((line['total_price'] for line in sale_lines), Money(0)),
+                tax_amount=tax_amount,
+                discount_amount=discount_amount,
+                payment_method=payment_method,
+                status='Completed',
+                notes=notes
+            )
+            session.add(sale)
+            session.flush()
+
+            for line in sale_lines:
+                line['sale_id'] = sale.id
+            session.execute(insert(SaleItem), sale_lines)
+
+            # Decrement stock in one executemany; the quantity guard makes a
+            # concurrent sale of the same item show up as a short rowcount
+            items = Item.__table__
+            remaining = items.c.quantity - bindparam('sold_quantity')
+            result = session.execute(
+                update(items).where(
+                    items.c.id == bindparam('sold_item_id'),
+                    items.c.quantity >= bindparam('sold_quantity')
+                ).values(
+                    quantity=remaining,
+                    is_sold=remaining <= 0,
+                    date_sold=case((remaining <= 0, now), else_=items.c.date_sold)
+                ),
+                [{'sold_item_id': item_id, 'sold_quantity': quantity}
+                 for item_id, quantity in requested.items()]
+            )
+            if result.rowcount != len(requested):
+                raise ValueError("Stock changed during checkout, please try again")
+
+            SalesService._record_sales(session, [sale.id])
+
             session.commit()
+            session.refresh(sale)
+
+            # A shared unit-of-work session may already hold some of these
+            # items; bring their stock in line with the UPDATE above
+            for item_id in requested:
+                item = session.identity_map.get(identity_key(Item, item_id))
+                if item is not None:
+                    session.refresh(item, ['quantity', 'is_sold', 'date_sold'])
             return sale
         except Exception as e:
             session.rollback()
@@ -126,76 +281,214 @@ class SalesService:
         """Get all sales"""
         session = get_session()
         try:
-            return session.query(Sale).order_by(Sale.sale_date.desc()).all()
+            query = session.query(*SaleRow.columns()).order_by(Sale.sale_date.desc())
+            return [SaleRow.from_row(row) for row in query]
         finally:
             session.close()
 
+    @staticmethod
+    def get_sales_page(after_id=None, before_id=None, page_size=DEFAULT_PAGE_SIZE,
+                       start_date=None, end_date=None):
+        """Get one page of sales, newest first, optionally within a period (see _in_period)"""
+        session = get_session()
+        try:
+            query = SalesService._in_period(session.query(*SaleRow.columns()), start_date, end_date)
+            return keyset_page(query, Sale.id, after=after_id, before=before_id,
+                               page_size=page_size, descending=True, row_factory=SaleRow.from_row)
+        finally:
+            session.close()
+
+    @staticmethod
+    def iter_sales(after_id=None, page_size=DEFAULT_PAGE_SIZE, start_date=None, end_date=None):
+        """Iterate over sales, newest first, one page at a time, optionally within a period"""
+        fetch_page = partial(SalesService.get_sales_page, start_date=start_date, end_date=end_date)
+        return iter_keyset(fetch_page, after_id=after_id, page_size=page_size)
+
+    @staticmethod
+    def _with_details(query):
+        """Eager-load customers, lines and line items plus the line count
+
+        Customers and lines each come from one batched IN query (items are
+        joined onto the lines), so the sales stay usable after the session
+        closes and listing N sales costs three queries rather than 2N.
+        """
+        line_count = select(func.count(SaleItem.id)).where(
+            SaleItem.sale_id == Sale.id
+        ).correlate(Sale).scalar_subquery()
+
+        return query.options(
+            selectinload(Sale.customer),
+            selectinload(Sale.sale_items).joinedload(SaleItem.item),
+            with_expression(Sale.items_count, line_count)
+        )
+
     @staticmethod
     def get_sale_by_id(sale_id):
-        """Get sale by ID with items"""
+        """Get sale by ID with its customer"""
+        session = get_session()
+        try:
+            return session.query(Sale).options(joinedload(Sale.customer)).filter(Sale.id == sale_id).first()
+        finally:
+            session.close()
+
+    @staticmethod
+    def get_sale_with_details(sale_id):
+        """Get sale by ID with its customer, lines and line items loaded"""
+        session = get_session()
+        try:
+            return SalesService._with_details(session.query(Sale)).filter(Sale.id == sale_id).first()
+        finally:
+            session.close()
+
+    @staticmethod
+    def get_sales_with_details(sale_ids):
+        """Get several sales with customers, lines and line items loaded"""
         session = get_session()
         try:
-            return session.query(Sale).filter(Sale.id == sale_id).first()
+            return SalesService._with_details(session.query(Sale)).filter(
+                Sale.id.in_(sale_ids)
+            ).order_by(Sale.id).all()
         finally:
             session.close()
 
     @staticmethod
     def get_sales_by_date_range(start_date, end_date):
-        """Get sales within a date range"""
+        """Get sales within a date range with customers and lines loaded
+
+        A bare date as ``end_date`` includes that whole day.
+        """
         session = get_session()
         try:
-            return session.query(Sale).filter(
-                Sale.sale_date >= start_date,
-                Sale.sale_date <= end_date
+            return SalesService._in_period(
+                SalesService._with_details(session.query(Sale)), start_date, end_date
             ).all()
         finally:
             session.close()
 
     @staticmethod
+    @cached('sales', ttl=10)
     def get_sales_summary():
-        """Get sales summary statistics"""
+        """Get sales summary statistics from the daily rollup"""
+        summary = RollupService.get_dashboard_totals()
+        summary['average_sale'] = (
+            summary['total_revenue'] / summary['total_sales'] if summary['total_sales'] else Money(0)
+        )
+        return summary
+
+    @staticmethod
+    def _in_period(query, start_date=None, end_date=None):
+        """Restrict a query on sales to a period
+
+        Either bound may be a datetime, compared as is, or a bare date. A
+        date end includes that whole day, so start=end=today means today.
+        """
+        if start_date is not None:
+            if not isinstance(start_date, datetime):
+                start_date = datetime.combine(start_date, time.min)
+            query = query.filter(Sale.sale_date >= start_date)
+        if end_date is not None:
+            if isinstance(end_date, datetime):
+                query = query.filter(Sale.sale_date <= end_date)
+            else:
+                query = query.filter(Sale.sale_date < datetime.combine(end_date + timedelta(days=1), time.min))
+        return query
+
+    @staticmethod
+    def _completed_lines_filter(query, start_date=None, end_date=None):
+        """Restrict a sale line query to completed sales within a date range"""
+        query = query.join(Sale, Sale.id == SaleItem.sale_id).filter(Sale.status == 'Completed')
+        return SalesService._in_period(query, start_date, end_date)
+
+    @staticmethod
+    @cached('sales')
+    def get_top_selling_items(limit=10, start_date=None, end_date=None):
+        """Get the best selling items by units sold"""
         session = get_session()
         try:
-            from sqlalchemy import func
-
-            # Total sales count and amount
-            total_sales = session.query(func.count(Sale.id)).scalar() or 0
-            total_revenue = session.query(func.sum(Sale.total_amount + Sale.tax_amount - Sale.discount_amount)).scalar() or 0
-
-            # Today's sales
-            today = datetime.now().date()
-            today_sales = session.query(func.count(Sale.id)).filter(
-                func.date(Sale.sale_date) == today
-            ).scalar() or 0
-
-            today_revenue = session.query(
-                func.sum(Sale.total_amount + Sale.tax_amount - Sale.discount_amount)
-            ).filter(func.date(Sale.sale_date) == today).scalar() or 0
-
-            return {
-                'total_sales': total_sales,
-                'total_revenue': total_revenue,
-                'today_sales': today_sales,
-                'today_revenue': today_revenue
-            }
+            units = func.sum(SaleItem.quantity)
+            revenue = func.sum(SaleItem.total_price)
+            query = session.query(
+                Item.id,
+                Item.name,
+                Item.category,
+                units.label('total_sold'),
+                revenue.label('total_revenue'),
+                func.sum(as_money(SaleItem.quantity * func.coalesce(SaleItem.unit_cost, 0))).label('total_cost')
+            ).select_from(SaleItem).join(Item, Item.id == SaleItem.item_id)
+            query = SalesService._completed_lines_filter(query, start_date, end_date)
+
+            rows = query.group_by(Item.id, Item.name, Item.category).order_by(
+                units.desc(), revenue.desc()
+            ).limit(limit)
+
+            return [{
+                'item_id': row.id,
+                'name': row.name,
+                'category': row.category,
+                'total_sold': row.total_sold,
+                'total_revenue': row.total_revenue or Money(0),
+                'total_cost': row.total_cost or Money(0)
+            } for row in rows]
         finally:
             session.close()
 
     @staticmethod
+    @cached('sales')
+    def get_category_performance(start_date=None, end_date=None):
+        """Get orders, units, revenue, cost and margin per category, best first"""
+        session = get_session()
+        try:
+            revenue = func.sum(SaleItem.total_price)
+            query = session.query(
+                Item.category,
+                func.count(func.distinct(SaleItem.sale_id)).label('orders'),
+                func.sum(SaleItem.quantity).label('units_sold'),
+                revenue.label('revenue'),
+                func.sum(as_money(SaleItem.quantity * func.coalesce(SaleItem.unit_cost, 0))).label('cost')
+            ).select_from(SaleItem).join(Item, Item.id == SaleItem.item_id)
+            query = SalesService._completed_lines_filter(query, start_date, end_date)
+
+            performance = []
+            for row in query.group_by(Item.category).order_by(revenue.desc()):
+                revenue_total = row.revenue or Money(0)
+                cost_total = row.cost or Money(0)
+                profit = revenue_total - cost_total
+                performance.append({
+                    'category': row.category,
+                    'orders': row.orders,
+                    'units_sold': row.units_sold or 0,
+                    'revenue': revenue_total,
+                    'cost': cost_total,
+                    'profit': profit,
+                    'margin': profit / revenue_total * 100 if revenue_total else 0.0
+                })
+            return performance
+        finally:
+            session.close()
+
+    @staticmethod
+    @invalidates('sales', 'items', 'customers')
     def cancel_sale(sale_id):
-        """Cancel a sale and unmark items as sold"""
+        """Cancel a sale, putting completed lines back in stock"""
         session = get_session()
         try:
             sale = session.query(Sale).filter(Sale.id == sale_id).first()
             if not sale:
                 return None
 
-            # Unmark items as sold
+            # Only completed sales took their lines out of stock
+            restock = sale.status == 'Completed'
             for sale_item in sale.sale_items:
                 item = session.query(Item).filter(Item.id == sale_item.item_id).first()
                 if item:
-                    item.is_sold = False
-                    item.date_sold = None
+                    if restock:
+                        item.quantity = (item.quantity or 0) + (sale_item.quantity or 0)
+                    item.is_sold = (item.quantity or 0) <= 0
+                    if not item.is_sold:
+                        item.date_sold = None
+
+            if sale.status == 'Completed':
+                SalesService._record_sales(session, [sale_id], sign=-1)
 
             # Delete the sale
             session.delete(sale)
@@ -0,0 +1,175 @@
+import re
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from functools import wraps
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from lib.config import get_tracing_config
+
+KINDS = ('action', 'service', 'sql')
+# Histogram bucket upper bounds: 10 microseconds to about two minutes, 10% apart
+BUCKET_BOUNDS = tuple(1e-5 * 1.1 ** i for i in range(172))
+PERCENTILES = (50, 95, 99)
+# An expanded IN list of bound parameters, e.g. IN (?, ?, ?)
+_IN_LIST = re.compile(r"\bIN \((?:\?|:\w+|%\(\w+\)s)(?:, (?:\?|:\w+|%\(\w+\)s))*\)", re.IGNORECASE)
+
+
+class LatencyHistogram:
+    """Fixed log-scale latency buckets; percentiles are accurate to about 10%"""
+
+    __slots__ = ('counts', 'count', 'total', 'max')
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKET_BOUNDS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds):
+        self.counts[bisect_left(BUCKET_BOUNDS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, percent):
+        """Upper bound of the bucket holding the given percentile, capped at the max"""
+        if not self.count:
+            return 0.0
+        rank = self.count * percent / 100
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank and count:
+                return min(BUCKET_BOUNDS[index] if index < len(BUCKET_BOUNDS) else self.max, self.max)
+        return self.max
+
+
+class Tracer:
+    """In-process latency histograms for menu actions, service calls and SQL
+
+    Disabled, a traced call costs one attribute check and no SQL listeners
+    are installed. Enabled, menu actions are timed without the time spent
+    inside ``waiting()`` blocks (the menus' prompts), so they measure the
+    till rather than the person using it.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.reset()
+
+    def reset(self):
+        """Drop every recorded timing"""
+        with self._lock:
+            self.histograms = {kind: {} for kind in KINDS}
+            self.since = time.time()
+
+    def enable(self):
+        if self.enabled:
+            return
+        event.listen(Engine, 'before_cursor_execute', self._before_cursor_execute)
+        event.listen(Engine, 'after_cursor_execute', self._after_cursor_execute)
+        self.enabled = True
+
+    def disable(self):
+        if not self.enabled:
+            return
+        self.enabled = False
+        event.remove(Engine, 'before_cursor_execute', self._before_cursor_execute)
+        event.remove(Engine, 'after_cursor_execute', self._after_cursor_execute)
+
+    def record(self, kind, name, seconds):
+        with self._lock:
+            histogram = self.histograms[kind].get(name)
+            if histogram is None:
+                histogram = self.histograms[kind][name] = LatencyHistogram()
+            histogram.record(seconds)
+
+    def call(self, kind, name, func, *args, **kwargs):
+        """Call ``func`` and record its latency under ``kind`` and ``name``"""
+        if not self.enabled:
+            return func(*args, **kwargs)
+        waited = self._waited()
+        started = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - started
+            self.record(kind, name, elapsed - (self._waited() - waited))
+
+    def _waited(self):
+        return getattr(self._local, 'waited', 0.0)
+
+    @contextmanager
+    def waiting(self):
+        """Leave the time spent in this block out of the calls around it"""
+        if not self.enabled:
+            yield
+            return
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._local.waited = self._waited() + time.perf_counter() - started
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault('tracing_started', []).append(time.perf_counter())
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        started = conn.info.get('tracing_started')
+        # Tracing may have been switched on while the statement was running
+        if started:
+            self.record('sql', sql_key(statement), time.perf_counter() - started.pop())
+
+    def report(self, kind):
+        """One row per traced name with count, p50/p95/p99, max and total, slowest total first"""
+        with self._lock:
+            rows = [
+                dict(
+                    name=name,
+                    count=histogram.count,
+                    **{f"p{percent}": histogram.percentile(percent) for percent in PERCENTILES},
+                    max=histogram.max,
+                    total=histogram.total
+                )
+                for name, histogram in self.histograms[kind].items()
+            ]
+        return sorted(rows, key=lambda row: row['total'], reverse=True)
+
+
+def sql_key(statement):
+    """Statement text with whitespace normalised and IN lists of any length collapsed"""
+    return _IN_LIST.sub('IN (...)', ' '.join(statement.split()))
+
+
+tracer = Tracer()
+if get_tracing_config()['enabled']:
+    tracer.enable()
+
+
+def traced(kind, name=None):
+    """Record every call of the decorated function in the tracer's histograms"""
+    def decorator(func):
+        label = name or func.__qualname__
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if not tracer.enabled:
+                return func(*args, **kwargs)
+            return tracer.call(kind, label, func, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def traced_methods(kind='service'):
+    """Class decorator tracing every public static method as Class.method"""
+    def decorator(cls):
+        for attr, value in list(vars(cls).items()):
+            if isinstance(value, staticmethod) and not attr.startswith('_'):
+                setattr(cls, attr, staticmethod(traced(kind, f"{cls.__name__}.{attr}")(value.__func__)))
+        return cls
+    return decorator
@@ -1,9 +1,16 @@
-from lib.cli.main_menu import MainMenu
+import sys
 
 def main():
     """Main entry point for the thrift store management system"""
+    if len(sys.argv) > 1:
+        # Arguments select the scriptable click commands instead of the menus
+        from lib.cli.commands import cli
+        cli(prog_name='thriftstore')
+        return
+
+    from lib.cli.main_menu import MainMenu
     menu = MainMenu()
     menu.run()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -9,7 +9,7 @@ config = context.config
 
 # Interpret the config file for Python logging.
 # This line sets up loggers basically.
-if config.config_file_name is not None:
+if config.config_file_name is not None and config.attributes.get('configure_logger', True):
     fileConfig(config.config_file_name)
 
 # add your model's MetaData object here
@@ -17,6 +17,10 @@ if config.config_file_name is not None:
 from lib.models import Base  # Adjusted import path
 target_metadata = Base.metadata
 
+# Migrate the same database the application is configured to use
+from lib.config import get_database_config
+config.set_main_option("sqlalchemy.url", get_database_config()["url"])
+
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
 # my_important_option = config.get_main_option("my_important_option")
@@ -50,6 +54,17 @@ def run_migrations_online() -> None:
     In this scenario we need to create an Engine
     and associate a connection with the context.
     """
+    # The application passes its own connection when it upgrades on startup
+    connection = config.attributes.get('connection')
+    if connection is not None:
+        context.configure(
+            connection=connection, target_metadata=target_metadata
+        )
+
+        with context.begin_transaction():
+            context.run_migrations()
+        return
+
     connectable = engine_from_config(
         config.get_section(config.config_ini_section, {}),
         prefix="sqlalchemy.",
@@ -0,0 +1,71 @@
+"""Add daily sales rollup
+
+Revision ID: 03d2ffe8065e
+Revises: 5fe7761992b7
+Create Date: 2026-10-17 11:26:52.731904
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '03d2ffe8065e'
+down_revision: Union[str, None] = '5fe7761992b7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Databases built with create_tables() may already have the table;
+    # it is refilled from the sales either way
+    if sa.inspect(op.get_bind()).has_table('daily_sales_rollup'):
+        op.execute("DELETE FROM daily_sales_rollup")
+    else:
+        _create_rollup_table()
+    _backfill()
+
+
+def _create_rollup_table():
+    op.create_table('daily_sales_rollup',
+    sa.Column('sale_date', sa.Date(), nullable=False),
+    sa.Column('sale_count', sa.Integer(), nullable=False),
+    sa.Column('gross_amount', sa.Float(), nullable=False),
+    sa.Column('tax_amount', sa.Float(), nullable=False),
+    sa.Column('discount_amount', sa.Float(), nullable=False),
+    sa.Column('net_amount', sa.Float(), nullable=False),
+    sa.Column('item_units', sa.Integer(), nullable=False),
+    sa.Column('cost_of_goods', sa.Float(), nullable=False),
+    sa.PrimaryKeyConstraint('sale_date')
+    )
+
+
+def _backfill():
+    """Fill the rollup from existing completed sales"""
+    op.execute("""
+        INSERT INTO daily_sales_rollup (sale_date, sale_count, gross_amount, tax_amount,
+                                        discount_amount, net_amount, item_units, cost_of_goods)
+        SELECT date(s.sale_date),
+               count(s.id),
+               sum(s.total_amount),
+               sum(coalesce(s.tax_amount, 0)),
+               sum(coalesce(s.discount_amount, 0)),
+               sum(s.total_amount + coalesce(s.tax_amount, 0) - coalesce(s.discount_amount, 0)),
+               coalesce(sum(l.units), 0),
+               coalesce(sum(l.cost), 0)
+        FROM sales s
+        LEFT JOIN (
+            SELECT si.sale_id, sum(si.quantity) AS units,
+                   sum(si.quantity * coalesce(i.cost, 0)) AS cost
+            FROM sale_items si JOIN items i ON i.id = si.item_id
+            GROUP BY si.sale_id
+        ) l ON l.sale_id = s.id
+        WHERE s.status = 'Completed' AND s.sale_date IS NOT NULL
+        GROUP BY date(s.sale_date)
+    """)
+
+
+def downgrade() -> None:
+    op.drop_table('daily_sales_rollup')
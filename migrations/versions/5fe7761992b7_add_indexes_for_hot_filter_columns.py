@@ -0,0 +1,41 @@
+"""Add indexes for hot filter columns
+
+Revision ID: 5fe7761992b7
+Revises: 77f50eefdf1d
+Create Date: 2026-10-17 10:03:18.224671
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5fe7761992b7'
+down_revision: Union[str, None] = '77f50eefdf1d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Databases built with create_tables() already have the model's indexes
+    op.create_index('ix_items_is_sold_date_added', 'items', ['is_sold', 'date_added'], unique=False, if_not_exists=True)
+    op.create_index('ix_items_category', 'items', ['category'], unique=False, if_not_exists=True)
+    op.create_index('ix_items_unsold_quantity', 'items', ['quantity'], unique=False, if_not_exists=True,
+                    sqlite_where=sa.text('is_sold = 0'))
+    op.create_index('ix_sales_sale_date', 'sales', ['sale_date'], unique=False, if_not_exists=True)
+    op.create_index('ix_sales_customer_id_sale_date', 'sales', ['customer_id', 'sale_date'], unique=False, if_not_exists=True)
+    op.create_index('ix_sale_items_sale_id_item_id', 'sale_items', ['sale_id', 'item_id'], unique=False, if_not_exists=True)
+    op.create_index('ix_sale_items_item_id', 'sale_items', ['item_id'], unique=False, if_not_exists=True)
+    op.execute('ANALYZE')
+
+
+def downgrade() -> None:
+    op.drop_index('ix_sale_items_item_id', table_name='sale_items')
+    op.drop_index('ix_sale_items_sale_id_item_id', table_name='sale_items')
+    op.drop_index('ix_sales_customer_id_sale_date', table_name='sales')
+    op.drop_index('ix_sales_sale_date', table_name='sales')
+    op.drop_index('ix_items_unsold_quantity', table_name='items')
+    op.drop_index('ix_items_category', table_name='items')
+    op.drop_index('ix_items_is_sold_date_added', table_name='items')
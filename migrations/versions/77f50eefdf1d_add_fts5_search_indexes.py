@@ -0,0 +1,90 @@
+"""Add FTS5 search indexes
+
+Revision ID: 77f50eefdf1d
+Revises: 03a5bfa5151f
+Create Date: 2026-10-17 09:12:41.508213
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '77f50eefdf1d'
+down_revision: Union[str, None] = '03a5bfa5151f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Databases built with create_tables() may already have these (lib/models/search.py)
+    op.execute("""
+        CREATE VIRTUAL TABLE IF NOT EXISTS items_fts USING fts5(
+            name, category, brand,
+            content='items', content_rowid='id', prefix='2 3'
+        )
+    """)
+    op.execute("""
+        CREATE TRIGGER IF NOT EXISTS items_fts_ai AFTER INSERT ON items BEGIN
+            INSERT INTO items_fts(rowid, name, category, brand)
+            VALUES (new.id, new.name, new.category, new.brand);
+        END
+    """)
+    op.execute("""
+        CREATE TRIGGER IF NOT EXISTS items_fts_ad AFTER DELETE ON items BEGIN
+            INSERT INTO items_fts(items_fts, rowid, name, category, brand)
+            VALUES ('delete', old.id, old.name, old.category, old.brand);
+        END
+    """)
+    op.execute("""
+        CREATE TRIGGER IF NOT EXISTS items_fts_au AFTER UPDATE OF name, category, brand ON items BEGIN
+            INSERT INTO items_fts(items_fts, rowid, name, category, brand)
+            VALUES ('delete', old.id, old.name, old.category, old.brand);
+            INSERT INTO items_fts(rowid, name, category, brand)
+            VALUES (new.id, new.name, new.category, new.brand);
+        END
+    """)
+    op.execute("INSERT INTO items_fts(items_fts, rank) VALUES ('rank', 'bm25(10.0, 2.0, 5.0)')")
+    op.execute("INSERT INTO items_fts(items_fts) VALUES ('rebuild')")
+
+    op.execute("""
+        CREATE VIRTUAL TABLE IF NOT EXISTS customers_fts USING fts5(
+            first_name, last_name, email, phone,
+            content='customers', content_rowid='id', prefix='2 3'
+        )
+    """)
+    op.execute("""
+        CREATE TRIGGER IF NOT EXISTS customers_fts_ai AFTER INSERT ON customers BEGIN
+            INSERT INTO customers_fts(rowid, first_name, last_name, email, phone)
+            VALUES (new.id, new.first_name, new.last_name, new.email, new.phone);
+        END
+    """)
+    op.execute("""
+        CREATE TRIGGER IF NOT EXISTS customers_fts_ad AFTER DELETE ON customers BEGIN
+            INSERT INTO customers_fts(customers_fts, rowid, first_name, last_name, email, phone)
+            VALUES ('delete', old.id, old.first_name, old.last_name, old.email, old.phone);
+        END
+    """)
+    op.execute("""
+        CREATE TRIGGER IF NOT EXISTS customers_fts_au AFTER UPDATE OF first_name, last_name, email, phone ON customers BEGIN
+            INSERT INTO customers_fts(customers_fts, rowid, first_name, last_name, email, phone)
+            VALUES ('delete', old.id, old.first_name, old.last_name, old.email, old.phone);
+            INSERT INTO customers_fts(rowid, first_name, last_name, email, phone)
+            VALUES (new.id, new.first_name, new.last_name, new.email, new.phone);
+        END
+    """)
+    op.execute("INSERT INTO customers_fts(customers_fts, rank) VALUES ('rank', 'bm25(5.0, 5.0, 3.0, 3.0)')")
+    op.execute("INSERT INTO customers_fts(customers_fts) VALUES ('rebuild')")
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS customers_fts_au")
+    op.execute("DROP TRIGGER IF EXISTS customers_fts_ad")
+    op.execute("DROP TRIGGER IF EXISTS customers_fts_ai")
+    op.execute("DROP TABLE IF EXISTS customers_fts")
+    op.execute("DROP TRIGGER IF EXISTS items_fts_au")
+    op.execute("DROP TRIGGER IF EXISTS items_fts_ad")
+    op.execute("DROP TRIGGER IF EXISTS items_fts_ai")
+    op.execute("DROP TABLE IF EXISTS items_fts")
@@ -0,0 +1,43 @@
+"""Snapshot sale line unit cost
+
+Revision ID: b7a1c04e9d52
+Revises: d3c9d162f0f6
+Create Date: 2026-10-17 19:12:40.518233
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7a1c04e9d52'
+down_revision: Union[str, None] = 'd3c9d162f0f6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('sale_items', sa.Column('unit_cost', sa.BigInteger(), nullable=True))
+
+    # Existing lines get the item's current cost, the best record there is
+    op.execute("""
+        UPDATE sale_items
+        SET unit_cost = (SELECT items.cost FROM items WHERE items.id = sale_items.item_id)
+    """)
+
+    # Recount the rollup's cost of goods from the snapshots so it matches a rebuild
+    op.execute("""
+        UPDATE daily_sales_rollup
+        SET cost_of_goods = coalesce((
+            SELECT sum(si.quantity * coalesce(si.unit_cost, 0))
+            FROM sale_items si JOIN sales s ON s.id = si.sale_id
+            WHERE s.status = 'Completed' AND date(s.sale_date) = daily_sales_rollup.sale_date
+        ), 0)
+    """)
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('sale_items') as batch_op:
+        batch_op.drop_column('unit_cost')
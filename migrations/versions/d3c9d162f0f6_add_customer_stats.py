@@ -0,0 +1,61 @@
+"""Add customer stats
+
+Revision ID: d3c9d162f0f6
+Revises: e1668ea2c97e
+Create Date: 2026-10-17 16:41:07.392815
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd3c9d162f0f6'
+down_revision: Union[str, None] = 'e1668ea2c97e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # A database that went through create_tables() may already have the
+    # table; it is refilled from the sales either way
+    if sa.inspect(op.get_bind()).has_table('customer_stats'):
+        op.execute("DELETE FROM customer_stats")
+    else:
+        _create_stats_table()
+    _backfill()
+
+
+def _create_stats_table():
+    op.create_table('customer_stats',
+    sa.Column('customer_id', sa.Integer(), nullable=False),
+    sa.Column('order_count', sa.Integer(), nullable=False),
+    sa.Column('total_spent', sa.BigInteger(), nullable=False),
+    sa.Column('first_purchase', sa.DateTime(), nullable=True),
+    sa.Column('last_purchase', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['customer_id'], ['customers.id'], ),
+    sa.PrimaryKeyConstraint('customer_id')
+    )
+    op.create_index('ix_customer_stats_total_spent', 'customer_stats', ['total_spent', 'customer_id'], unique=False)
+
+
+def _backfill():
+    """Fill the stats from existing completed sales"""
+    op.execute("""
+        INSERT INTO customer_stats (customer_id, order_count, total_spent, first_purchase, last_purchase)
+        SELECT customer_id,
+               count(id),
+               sum(total_amount + coalesce(tax_amount, 0) - coalesce(discount_amount, 0)),
+               min(sale_date),
+               max(sale_date)
+        FROM sales
+        WHERE status = 'Completed' AND customer_id IN (SELECT id FROM customers)
+        GROUP BY customer_id
+    """)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_customer_stats_total_spent', table_name='customer_stats')
+    op.drop_table('customer_stats')
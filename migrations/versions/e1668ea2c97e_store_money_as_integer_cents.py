@@ -0,0 +1,87 @@
+"""Store money as integer cents
+
+Revision ID: e1668ea2c97e
+Revises: 03d2ffe8065e
+Create Date: 2026-10-17 15:04:18.226519
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e1668ea2c97e'
+down_revision: Union[str, None] = '03d2ffe8065e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+MONEY_COLUMNS = {
+    'items': ['price', 'cost'],
+    'sales': ['total_amount', 'tax_amount', 'discount_amount'],
+    'sale_items': ['unit_price', 'total_price'],
+    'daily_sales_rollup': ['gross_amount', 'tax_amount', 'discount_amount', 'net_amount', 'cost_of_goods'],
+}
+
+# SQLite rebuilds a table to change a column type, which drops its triggers;
+# the items_fts ones (see add_fts5_search_indexes) are put back afterwards.
+ITEMS_FTS_TRIGGERS = {
+    'items_fts_ai': """
+        CREATE TRIGGER items_fts_ai AFTER INSERT ON items BEGIN
+            INSERT INTO items_fts(rowid, name, category, brand)
+            VALUES (new.id, new.name, new.category, new.brand);
+        END
+    """,
+    'items_fts_ad': """
+        CREATE TRIGGER items_fts_ad AFTER DELETE ON items BEGIN
+            INSERT INTO items_fts(items_fts, rowid, name, category, brand)
+            VALUES ('delete', old.id, old.name, old.category, old.brand);
+        END
+    """,
+    'items_fts_au': """
+        CREATE TRIGGER items_fts_au AFTER UPDATE OF name, category, brand ON items BEGIN
+            INSERT INTO items_fts(items_fts, rowid, name, category, brand)
+            VALUES ('delete', old.id, old.name, old.category, old.brand);
+            INSERT INTO items_fts(rowid, name, category, brand)
+            VALUES (new.id, new.name, new.category, new.brand);
+        END
+    """,
+}
+
+
+def _table_triggers(table_name):
+    """Names of the triggers on a SQLite table"""
+    bind = op.get_bind()
+    if bind.dialect.name != 'sqlite':
+        return set()
+    return set(bind.exec_driver_sql(
+        "SELECT name FROM sqlite_master WHERE type = 'trigger' AND tbl_name = ?", (table_name,)
+    ).scalars())
+
+
+def _alter_money_columns(type_, using):
+    for table_name, columns in MONEY_COLUMNS.items():
+        triggers = _table_triggers(table_name)
+        with op.batch_alter_table(table_name) as batch_op:
+            for column in columns:
+                batch_op.alter_column(column, type_=type_, postgresql_using=using.format(column=column))
+        for name in triggers - _table_triggers(table_name):
+            if name in ITEMS_FTS_TRIGGERS:
+                op.execute(ITEMS_FTS_TRIGGERS[name])
+
+
+def upgrade() -> None:
+    for table_name, columns in MONEY_COLUMNS.items():
+        op.execute(f"UPDATE {table_name} SET " + ', '.join(
+            f"{column} = ROUND({column} * 100)" for column in columns
+        ))
+    _alter_money_columns(sa.BigInteger(), "{column}::bigint")
+
+
+def downgrade() -> None:
+    _alter_money_columns(sa.Float(), "{column}::double precision")
+    for table_name, columns in MONEY_COLUMNS.items():
+        op.execute(f"UPDATE {table_name} SET " + ', '.join(
+            f"{column} = {column} / 100.0" for column in columns
+        ))
@@ -0,0 +1,20 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lib.models import base  # noqa: E402
+from lib.services.cache import cache  # noqa: E402
+
+
+@pytest.fixture
+def database(tmp_path):
+    """Point the application engine at an empty scratch SQLite file"""
+    original_url = base.engine.url
+    engine = base.configure_engine(f"sqlite:///{tmp_path / 'thrift_store.db'}")
+    cache.clear()
+    yield engine
+    cache.clear()
+    base.configure_engine(original_url.render_as_string(hide_password=False))
@@ -0,0 +1,14 @@
+from lib.models.schema import upgrade_schema
+from lib.services.analytics_service import AnalyticsService
+from lib.services.item_service import ItemService
+
+
+def test_null_quantity_counts_as_none_in_stock(database):
+    upgrade_schema()
+    ItemService.create_item('Jacket', None, 'Clothing', 1500, quantity=2)
+    legacy = ItemService.create_item('Boots', None, 'Shoes', 3000)
+    ItemService.update_item(legacy.id, quantity=None)
+
+    data = AnalyticsService.load_inventory()
+    assert sorted(data.quantity.tolist()) == [0, 2]
+    assert AnalyticsService.inventory_report()['health'] is not None
@@ -0,0 +1,72 @@
+import pytest
+
+from lib.api import server
+from lib.api.server import ApiError
+from lib.models.schema import HEAD_REVISION, get_schema_revision, upgrade_schema
+from lib.services.customer_service import CustomerService
+from lib.services.item_service import ItemService
+from lib.services.sales_service import SalesService
+
+
+@pytest.mark.parametrize('body', [
+    {'basket': [{'quantity': 1}]},
+    {'basket': [{'item_id': 1, 'quantity': '2'}]},
+    {'basket': [{'item_id': 1, 'quantity': 0}]},
+    {'basket': [{'item_id': 1, 'custom_price': 'free'}]},
+    {'basket': ['1']},
+    {'basket': [{'item_id': 1}], 'tax_amount': '16%'},
+    {'basket': [{'item_id': 1}], 'discount_amount': [5]},
+    {'basket': [{'item_id': 1}], 'customer_id': 'walk-in'},
+])
+def test_bad_checkout_bodies_are_client_errors(database, body):
+    with pytest.raises(ApiError) as error:
+        server.checkout({}, body)
+    assert error.value.status == 400
+
+
+def test_checkout(database):
+    upgrade_schema()
+    jacket = ItemService.create_item('Jacket', None, 'Clothing', 1500)
+    status, sale = server.checkout({}, {'basket': [{'item_id': jacket.id, 'custom_price': 1200}],
+                                        'tax_amount': 0})
+    assert status == 201
+    assert [line['item_id'] for line in sale['lines']] == [jacket.id]
+
+
+def test_create_item_without_description(database):
+    upgrade_schema()
+    status, item = server.create_item({}, {'name': 'Scarf', 'category': 'Accessories', 'price': 300})
+    assert status == 201
+    assert item['description'] is None
+
+
+@pytest.mark.parametrize('body', [
+    {'name': 'Scarf', 'category': 'Accessories', 'price': 300, 'is_sold': True},
+    {'name': 'Scarf', 'price': 300},
+])
+def test_create_item_rejects_unknown_and_missing_fields(database, body):
+    with pytest.raises(ApiError) as error:
+        server.create_item({}, body)
+    assert error.value.status == 400
+
+
+def test_server_migrates_the_database(database, monkeypatch):
+    monkeypatch.setattr(server, 'get_api_config',
+                        lambda: {'host': '127.0.0.1', 'port': 0, 'keep_alive_timeout': 5})
+    assert get_schema_revision() == (None, False)
+    api = server.create_server()
+    try:
+        assert get_schema_revision() == (HEAD_REVISION, True)
+    finally:
+        api.server_close()
+
+
+def test_customer_report_limit(database):
+    upgrade_schema()
+    for spend in (100, 300, 200):
+        customer = CustomerService.create_customer('Customer', str(spend))
+        item = ItemService.create_item('Jacket', None, 'Clothing', spend)
+        SalesService.checkout([{'item_id': item.id}], customer_id=customer.id)
+
+    rows = server.customer_lifetime_values({'limit': '2'}, {})
+    assert [row['total_spent'] for row in rows] == [300, 200]
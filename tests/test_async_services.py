@@ -0,0 +1,26 @@
+import asyncio
+
+from lib.models import async_base
+from lib.models.money import Money
+from lib.models.schema import upgrade_schema
+from lib.services.async_services import AsyncCustomerService, AsyncItemService, AsyncSalesService
+
+
+def test_results_are_usable_after_the_await(database):
+    upgrade_schema()
+
+    async def run():
+        await async_base.configure_async_engine(database.url.render_as_string(hide_password=False))
+        try:
+            customer = await AsyncCustomerService.create_customer('Amina', 'Otieno')
+            item = await AsyncItemService.create_item('Denim Jacket', None, 'Clothing', 1500, quantity=2)
+            sale = await AsyncSalesService.checkout([{'item_id': item['id']}], customer_id=customer['id'])
+            details = await AsyncSalesService.get_sale_with_details(sale['id'])
+            return sale, details
+        finally:
+            await async_base.configure_async_engine()
+
+    sale, details = asyncio.run(run())
+    assert sale['customer_name'] == 'Amina Otieno'
+    assert sale['final_total'] == Money.of(1500)
+    assert [line['item_name'] for line in details['lines']] == ['Denim Jacket']
@@ -0,0 +1,31 @@
+import pytest
+
+from lib.models.money import Money
+from lib.services.cache import cache, cached
+from lib.services.read_models import ItemRow
+
+
+@cached('tests')
+def _listing():
+    return [{'name': 'Denim Jacket', 'prices': [Money(1500)]}]
+
+
+def test_callers_get_their_own_containers():
+    cache.clear()
+    first = _listing()
+    first.append({'name': 'added by the first caller'})
+    first[0]['prices'].append(Money(1))
+
+    second = _listing()
+    assert second == [{'name': 'Denim Jacket', 'prices': [Money(1500)]}]
+    second[0]['name'] = 'renamed by the second caller'
+    assert _listing()[0]['name'] == 'Denim Jacket'
+    cache.clear()
+
+
+def test_shared_values_are_immutable():
+    row = ItemRow(1, 'Denim Jacket')
+    with pytest.raises(AttributeError):
+        row.name = 'Corduroy Jacket'
+    with pytest.raises(AttributeError):
+        Money(1500).cents = 1
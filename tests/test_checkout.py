@@ -0,0 +1,68 @@
+import pytest
+
+from lib.models.base import get_session
+from lib.models.customer_stats import CustomerStats
+from lib.models.schema import upgrade_schema
+from lib.services.customer_service import CustomerService
+from lib.services.customer_stats_service import CustomerStatsService
+from lib.services.item_service import ItemService
+from lib.services.sales_service import SalesService
+
+
+def _stats():
+    session = get_session()
+    try:
+        return {row.customer_id: row.order_count for row in session.query(CustomerStats)}
+    finally:
+        session.close()
+
+
+def test_cancelled_items_can_be_sold_again(database):
+    upgrade_schema()
+    jacket = ItemService.create_item('Jacket', None, 'Clothing', 1500, quantity=1)
+
+    sale = SalesService.checkout([{'item_id': jacket.id}])
+    sold = ItemService.get_item_by_id(jacket.id)
+    assert (sold.quantity, sold.is_sold) == (0, True)
+
+    assert SalesService.cancel_sale(sale.id)
+    restocked = ItemService.get_item_by_id(jacket.id)
+    assert (restocked.quantity, restocked.is_sold, restocked.date_sold) == (1, False, None)
+
+    SalesService.checkout([{'item_id': jacket.id}])
+    sold = ItemService.get_item_by_id(jacket.id)
+    assert (sold.quantity, sold.is_sold) == (0, True)
+
+
+def test_cancelling_part_of_the_stock_keeps_the_rest(database):
+    upgrade_schema()
+    scarf = ItemService.create_item('Scarf', None, 'Accessories', 300, quantity=3)
+    first = SalesService.checkout([{'item_id': scarf.id, 'quantity': 2}])
+    SalesService.checkout([{'item_id': scarf.id}])
+
+    SalesService.cancel_sale(first.id)
+    item = ItemService.get_item_by_id(scarf.id)
+    assert (item.quantity, item.is_sold) == (2, False)
+
+
+def test_checkout_rejects_an_unknown_customer(database):
+    upgrade_schema()
+    jacket = ItemService.create_item('Jacket', None, 'Clothing', 1500)
+    with pytest.raises(ValueError, match='Customer 999 not found'):
+        SalesService.checkout([{'item_id': jacket.id}], customer_id=999)
+    assert ItemService.get_item_by_id(jacket.id).quantity == 1
+
+
+def test_stats_ignore_sales_of_missing_customers(database):
+    upgrade_schema()
+    customer = CustomerService.create_customer('Amina', 'Otieno')
+    jacket = ItemService.create_item('Jacket', None, 'Clothing', 1500)
+    sale = SalesService.create_sale(customer_id=999)
+    SalesService.add_item_to_sale(sale.id, jacket.id)
+    SalesService.complete_sale(sale.id)
+    SalesService.checkout([{'item_id': ItemService.create_item('Boots', None, 'Shoes', 3000).id}],
+                          customer_id=customer.id)
+
+    incremental = _stats()
+    CustomerStatsService.rebuild()
+    assert _stats() == incremental == {customer.id: 1}
@@ -0,0 +1,27 @@
+from datetime import datetime, timedelta
+
+from lib.models.schema import upgrade_schema
+from lib.services import item_service
+from lib.services.item_service import ItemService
+
+
+def test_stale_counts_follow_the_calendar(database, monkeypatch):
+    upgrade_schema()
+    today = datetime.now()
+    jacket = ItemService.create_item('Denim Jacket', None, 'Clothing', 1500)
+    ItemService.update_item(jacket.id, date_added=today - timedelta(days=90))
+
+    assert ItemService.find_stale(days=90) == []
+    assert ItemService.get_inventory_alerts(stale_days=90)['stale'] == 0
+    assert ItemService.get_aging_buckets()[-1]['items'] == 0
+
+    class Tomorrow(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return today + timedelta(days=1)
+
+    # No item is written, so only the date can tell the cached results apart
+    monkeypatch.setattr(item_service, 'datetime', Tomorrow)
+    assert [row.id for row in ItemService.find_stale(days=90)] == [jacket.id]
+    assert ItemService.get_inventory_alerts(stale_days=90)['stale'] == 1
+    assert ItemService.get_aging_buckets()[-1]['items'] == 1
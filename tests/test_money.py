@@ -0,0 +1,62 @@
+import json
+from decimal import Decimal
+
+import pytest
+
+from lib.models.money import Money, json_default
+
+
+def test_of_rounds_half_up_to_the_cent():
+    assert Money.of('12.345').cents == 1235
+    assert Money.of('12.344').cents == 1234
+    assert Money.of(-0.005).cents == -1
+    # 2.675 is 2.67499... as a binary float; its shortest repr rounds up
+    assert Money.of(2.675).cents == 268
+    assert Money.of(Decimal('0.1') * 3).cents == 30
+
+
+@pytest.mark.parametrize('amount', [None, '', 'abc', float('nan'), float('inf'), '-Infinity'])
+def test_of_rejects_invalid_amounts(amount):
+    with pytest.raises(ValueError):
+        Money.of(amount)
+
+
+def test_constructor_takes_integer_cents_only():
+    assert Money(1250).amount == Decimal('12.50')
+    with pytest.raises(TypeError):
+        Money(12.5)
+
+
+def test_arithmetic_is_exact():
+    total = sum([Money.of(0.1)] * 10, Money(0))
+    assert total == Money(100)
+    assert Money.of('19.99') * 3 == Money(5997)
+    assert Money(1000) - 2.5 == Money(750)
+    assert Money(1000) / 3 == Money(333)
+    assert Money(500) / Money(1000) == 0.5
+
+
+def test_comparison_with_money_and_numbers():
+    assert Money(1250) == Money.of('12.50')
+    assert Money(1250) == 12.5
+    assert Money(1250) == Decimal('12.5')
+    assert Money(1250) != 12.51
+    assert Money(1) < Money(2) <= 0.02 < Money(3)
+    assert Money(300) > 2 >= Money(200)
+    assert Money(1250) != 'x'
+    with pytest.raises(TypeError):
+        Money(1) < 'x'
+
+
+def test_hash_agrees_with_equality():
+    assert hash(Money(1250)) == hash(Money.of('12.50'))
+    assert hash(Money(1250)) == hash(12.5)
+    assert len({Money(100), Money.of(1), 1.0}) == 1
+
+
+def test_formatting_and_json():
+    price = Money.of(1234.5)
+    assert str(price) == '1234.50'
+    assert f"{price:,.2f}" == '1,234.50'
+    assert repr(price) == "Money('1234.50')"
+    assert json.dumps({'price': price}, default=json_default) == '{"price": 1234.5}'
@@ -0,0 +1,124 @@
+from alembic import command
+
+from lib.models import base
+from lib.models.money import Money
+from lib.models.schema import (
+    BASELINE_REVISION, HEAD_REVISION, ensure_schema, get_alembic_config, get_head_revision, upgrade_schema
+)
+from lib.services.customer_service import CustomerService
+from lib.services.sales_service import SalesService
+
+BEFORE_ROLLUP_REVISION = '5fe7761992b7'
+FLOAT_MONEY_REVISION = '03d2ffe8065e'
+CENTS_REVISION = 'e1668ea2c97e'
+ITEM_TRIGGERS = {'items_fts_ai', 'items_fts_ad', 'items_fts_au'}
+
+
+def _execute(sql, *params):
+    with base.engine.begin() as connection:
+        connection.exec_driver_sql(sql, params)
+
+
+def _rows(sql, *params):
+    with base.engine.connect() as connection:
+        return connection.exec_driver_sql(sql, params).all()
+
+
+def _float_store():
+    """A database at the last float revision, its rollup backfilled from one sale"""
+    upgrade_schema(BEFORE_ROLLUP_REVISION)
+    _add_float_sale()
+    upgrade_schema(FLOAT_MONEY_REVISION)
+
+
+def _add_float_sale():
+    """One completed sale of 3 x 19.99 with 0.50 tax, stored as floats"""
+    _execute("INSERT INTO customers (id, first_name, last_name) VALUES (1, 'Amina', 'Otieno')")
+    _execute("INSERT INTO items (id, name, category, price, cost, quantity, is_sold, date_added) "
+             "VALUES (1, 'Denim Jacket', 'Clothing', 19.99, 7.125, 2, 0, '2026-01-05 10:00:00')")
+    _execute("INSERT INTO sales (id, customer_id, sale_date, total_amount, tax_amount, discount_amount, status) "
+             "VALUES (1, 1, '2026-01-06 12:00:00', 59.97, 0.5, 0.0, 'Completed')")
+    _execute("INSERT INTO sale_items (id, sale_id, item_id, quantity, unit_price, total_price) "
+             "VALUES (1, 1, 1, 3, 19.99, 59.97)")
+
+
+def _triggers(table_name):
+    return {row[0] for row in _rows(
+        "SELECT name FROM sqlite_master WHERE type = 'trigger' AND tbl_name = ?", table_name)}
+
+
+def _index_sql(name):
+    rows = _rows("SELECT sql FROM sqlite_master WHERE type = 'index' AND name = ?", name)
+    return rows[0][0] if rows else None
+
+
+def _search_items(term):
+    return [row[0] for row in _rows("SELECT rowid FROM items_fts WHERE items_fts MATCH ?", term)]
+
+
+def _downgrade(revision):
+    config = get_alembic_config()
+    with base.engine.begin() as connection:
+        config.attributes['connection'] = connection
+        command.downgrade(config, revision)
+
+
+def test_head_revision_matches_migrations():
+    assert HEAD_REVISION == get_head_revision()
+
+
+def test_upgrade_converts_money_to_cents(database):
+    _float_store()
+    upgrade_schema(CENTS_REVISION)
+
+    assert _rows("SELECT price, cost FROM items") == [(1999, 713)]
+    assert _rows("SELECT total_amount, tax_amount, discount_amount FROM sales") == [(5997, 50, 0)]
+    assert _rows("SELECT unit_price, total_price FROM sale_items") == [(1999, 5997)]
+    assert _rows("SELECT gross_amount, tax_amount, net_amount FROM daily_sales_rollup") == [(5997, 50, 6047)]
+
+
+def test_upgrade_keeps_search_triggers_and_partial_index(database):
+    _float_store()
+    upgrade_schema(CENTS_REVISION)
+
+    assert _triggers('items') == ITEM_TRIGGERS
+    assert 'WHERE' in _index_sql('ix_items_unsold_quantity')
+    assert _index_sql('ix_items_is_sold_date_added') is not None
+
+    # The restored triggers keep the search index in step with new rows and renames
+    _execute("INSERT INTO items (id, name, category, price, quantity, is_sold) "
+             "VALUES (2, 'Leather Boots', 'Shoes', 4500, 1, 0)")
+    _execute("UPDATE items SET name = 'Corduroy Jacket' WHERE id = 1")
+    assert _search_items('boots') == [2]
+    assert _search_items('corduroy') == [1]
+    assert _search_items('denim') == []
+
+
+def test_downgrade_restores_float_shillings(database):
+    _float_store()
+    upgrade_schema()
+    _downgrade(FLOAT_MONEY_REVISION)
+
+    assert _rows("SELECT price, cost FROM items") == [(19.99, 7.13)]
+    assert _rows("SELECT total_amount, tax_amount FROM sales") == [(59.97, 0.5)]
+    assert _rows("SELECT type FROM pragma_table_info('items') WHERE name = 'price'") == [('FLOAT',)]
+    assert _triggers('items') == ITEM_TRIGGERS
+    assert 'WHERE' in _index_sql('ix_items_unsold_quantity')
+    assert _search_items('jacket') == [1]
+
+
+def test_unversioned_float_database_is_upgraded_from_baseline(database):
+    upgrade_schema(BASELINE_REVISION)
+    _execute("DROP TABLE alembic_version")
+    _add_float_sale()
+
+    assert ensure_schema() == 'upgraded'
+    assert ensure_schema() == 'current'
+
+    assert _rows("SELECT price FROM items") == [(1999,)]
+    assert _triggers('items') == ITEM_TRIGGERS
+    assert _search_items('denim') == [1]
+    totals = _rows("SELECT sale_count, net_amount FROM daily_sales_rollup")
+    assert totals == [(1, 6047)]
+    assert CustomerService.get_customer_segments()['Occasional']['total_spent'] == Money(6047)
+    assert SalesService.get_top_selling_items(limit=1)[0]['total_revenue'] == Money(5997)
@@ -0,0 +1,36 @@
+from lib.models.daily_sales_rollup import DailySalesRollup
+from lib.models.base import get_session
+from lib.models.money import Money
+from lib.models.schema import upgrade_schema
+from lib.services.item_service import ItemService
+from lib.services.rollup_service import ROLLUP_FIELDS, RollupService
+from lib.services.sales_service import SalesService
+
+
+def _rollup():
+    session = get_session()
+    try:
+        return {
+            row.sale_date: {field: getattr(row, field) for field in ROLLUP_FIELDS}
+            for row in session.query(DailySalesRollup)
+        }
+    finally:
+        session.close()
+
+
+def test_cost_edits_do_not_move_old_sales(database):
+    upgrade_schema()
+    jacket = ItemService.create_item('Denim Jacket', None, 'Clothing', 1500, cost=400, quantity=2)
+    boots = ItemService.create_item('Leather Boots', None, 'Shoes', 3000, cost=900, quantity=1)
+    first = SalesService.checkout([{'item_id': jacket.id}, {'item_id': boots.id}])
+    SalesService.checkout([{'item_id': jacket.id}])
+
+    ItemService.update_item(jacket.id, cost=650)
+    SalesService.cancel_sale(first.id)
+
+    incremental = _rollup()
+    (day_totals,) = incremental.values()
+    assert day_totals['cost_of_goods'] == Money.of(400)
+
+    RollupService.rebuild()
+    assert _rollup() == incremental
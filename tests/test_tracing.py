@@ -0,0 +1,28 @@
+import builtins
+import time
+
+from lib.services.tracing import Tracer, sql_key
+
+
+def test_in_lists_share_one_key():
+    one = sql_key("SELECT items.id FROM items\n WHERE items.id IN (?)")
+    three = sql_key("SELECT items.id FROM items WHERE items.id IN (?, ?, ?)")
+    assert one == three == "SELECT items.id FROM items WHERE items.id IN (...)"
+    assert sql_key("SELECT 1 WHERE a IN (:a_1, :a_2) AND b = ?") == "SELECT 1 WHERE a IN (...) AND b = ?"
+
+
+def test_prompt_waits_are_not_counted():
+    tracer = Tracer()
+    original_input = builtins.input
+    tracer.enable()
+    try:
+        assert builtins.input is original_input
+
+        def action():
+            with tracer.waiting():
+                time.sleep(0.05)
+
+        tracer.call('action', 'action', action)
+    finally:
+        tracer.disable()
+    assert tracer.report('action')[0]['total'] < 0.05
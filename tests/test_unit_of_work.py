@@ -0,0 +1,72 @@
+import pytest
+
+from lib.models import base
+from lib.models.base import get_session, unit_of_work
+from lib.models.item import Item
+from lib.models.schema import upgrade_schema
+from lib.services.item_service import ItemService
+
+
+def _item_names():
+    session = get_session()
+    try:
+        return [name for (name,) in session.query(Item.name).order_by(Item.id)]
+    finally:
+        session.close()
+
+
+def _committed_names():
+    """Item names as another connection sees them, i.e. only committed rows"""
+    with base.engine.connect() as connection:
+        return [name for (name,) in connection.exec_driver_sql("SELECT name FROM items ORDER BY id")]
+
+
+def test_atomic_unit_shares_its_session_and_owns_the_commit(database):
+    upgrade_schema()
+    with pytest.raises(ValueError):
+        with unit_of_work('checkout', atomic=True):
+            jacket = ItemService.create_item('Denim Jacket', None, 'Clothing', 1500)
+            # A later service call in the same unit sees the write...
+            assert ItemService.get_item_by_id(jacket.id).name == 'Denim Jacket'
+            assert _item_names() == ['Denim Jacket']
+            # ...which the service did not commit on its own
+            assert _committed_names() == []
+            raise ValueError("card declined")
+    assert _committed_names() == []
+
+    with unit_of_work('checkout', atomic=True):
+        ItemService.create_item('Leather Boots', None, 'Shoes', 3000)
+    assert _committed_names() == ['Leather Boots']
+
+
+def test_non_atomic_unit_keeps_earlier_commits(database):
+    upgrade_schema()
+    with pytest.raises(ValueError):
+        with unit_of_work('ItemMenu.add_item'):
+            ItemService.create_item('Denim Jacket', None, 'Clothing', 1500)
+            assert _committed_names() == ['Denim Jacket']
+            raise ValueError("later step failed")
+    assert _committed_names() == ['Denim Jacket']
+
+
+def test_atomic_unit_nested_in_non_atomic_unit_raises(database):
+    upgrade_schema()
+    with pytest.raises(RuntimeError, match='atomic'):
+        with unit_of_work('CLI items add'):
+            ItemService.create_item('Denim Jacket', None, 'Clothing', 1500)
+            with unit_of_work('checkout', atomic=True):
+                ItemService.create_item('Leather Boots', None, 'Shoes', 3000)
+    # The nested block never ran; the outer unit's commit stands
+    assert _committed_names() == ['Denim Jacket']
+
+
+def test_atomic_units_nest_inside_atomic_units(database):
+    upgrade_schema()
+    with pytest.raises(ValueError):
+        with unit_of_work('import', atomic=True):
+            ItemService.create_item('Denim Jacket', None, 'Clothing', 1500)
+            with unit_of_work('checkout', atomic=True):
+                ItemService.create_item('Leather Boots', None, 'Shoes', 3000)
+            assert _item_names() == ['Denim Jacket', 'Leather Boots']
+            raise ValueError("abort the whole import")
+    assert _committed_names() == []